@@ -5,16 +5,17 @@ Tracking con Google Sheets (gratis e ilimitado)
 """
 
 import os
+import sys
 import json
 from datetime import datetime
 from typing import Dict, List, Optional
 
-try:
-    import gspread
-    from google.oauth2.service_account import Credentials
-    HAS_GSPREAD = True
-except ImportError:
-    HAS_GSPREAD = False
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraper.optional_deps import module_available
+
+# gspread + google-auth tardan en importarse: solo se cargan al conectar con Sheets
+HAS_GSPREAD = module_available('gspread')
+if not HAS_GSPREAD:
     print("⚠️ gspread no instalado. Analytics deshabilitado.")
 
 
@@ -38,6 +39,9 @@ class FreeDashboard:
     
     def _setup_google_sheets(self):
         """Configura conexión a Google Sheets"""
+        import gspread
+        from google.oauth2.service_account import Credentials
+
         scopes = [
             'https://www.googleapis.com/auth/spreadsheets',
             'https://www.googleapis.com/auth/drive'
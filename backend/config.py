@@ -13,8 +13,17 @@ class VideoConfig:
     AWS_REGION: str = os.getenv("TIKTOK_REGION", "ap-singapore-1")
     UPLOAD_TIMEOUT: int = int(os.getenv("UPLOAD_TIMEOUT", "300"))
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
-    REMOTION_CONCURRENCY: int = int(os.getenv("REMOTION_CONCURRENCY", "2"))
+    REMOTION_CONCURRENCY: int = int(os.getenv("REMOTION_CONCURRENCY", "0"))  # 0 = según núcleos
+    REMOTION_BATCH_PARALLEL: int = int(os.getenv("REMOTION_BATCH_PARALLEL", "2"))  # renders simultáneos por lote
     REMOTION_TIMEOUT: int = int(os.getenv("REMOTION_TIMEOUT", "300"))
+    # Worker Node persistente (bundle + navegador una vez por ciclo); false = npx por video
+    REMOTION_SERVER: bool = os.getenv("REMOTION_SERVER", "true").lower() == "true"
+    REMOTION_ENTRY: str = os.getenv("REMOTION_ENTRY", "")
+    # Modo hedged: lanzar varios generadores en paralelo y quedarse con el primer MP4 válido
+    HEDGE_ENABLED: bool = os.getenv("VIDEO_HEDGE_ENABLED", "false").lower() == "true"
+    HEDGE_TOP_K: int = int(os.getenv("VIDEO_HEDGE_TOP_K", "2"))
+    HEDGE_STAGGER: float = float(os.getenv("VIDEO_HEDGE_STAGGER", "20"))  # segundos entre lanzamientos
+    PROVIDER_DEADLINE: float = float(os.getenv("VIDEO_PROVIDER_DEADLINE", "360"))
 
 
 @dataclass(frozen=True)
@@ -24,6 +33,31 @@ class ScheduleConfig:
     PRODUCTS_PER_RUN: int = int(os.getenv("PRODUCTS_PER_RUN", "2"))
 
 
+@dataclass(frozen=True)
+class PipelineConfig:
+    """Concurrencia por etapa del pipeline de ofertas (mejora → DB → voz → render → subida)."""
+    ENHANCE_WORKERS: int = int(os.getenv("PIPELINE_ENHANCE_WORKERS", "2"))
+    PERSIST_WORKERS: int = int(os.getenv("PIPELINE_PERSIST_WORKERS", "1"))
+    # Cada render usa su propio JobWorkspace, así que puede subirse sin colisiones de ficheros
+    RENDER_WORKERS: int = int(os.getenv("PIPELINE_RENDER_WORKERS", "1"))
+    # >1: la etapa de render agrupa ofertas y las que caen a Remotion se renderizan en un lote
+    RENDER_BATCH_SIZE: int = int(os.getenv("PIPELINE_RENDER_BATCH_SIZE", "1"))
+    # Ofertas por lote en la etapa de voz (TTS en paralelo antes del render)
+    AUDIO_BATCH_SIZE: int = int(os.getenv("PIPELINE_AUDIO_BATCH_SIZE", "4"))
+    UPLOAD_WORKERS: int = int(os.getenv("PIPELINE_UPLOAD_WORKERS", "1"))
+    QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "2"))
+
+
+@dataclass(frozen=True)
+class DatabaseConfig:
+    """Configuración de escritura en Supabase (REST)."""
+    WRITE_BATCH_SIZE: int = int(os.getenv("SUPABASE_WRITE_BATCH_SIZE", "20"))
+    FLUSH_INTERVAL: float = float(os.getenv("SUPABASE_FLUSH_INTERVAL", "5"))
+    CONNECT_TIMEOUT: float = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+    READ_TIMEOUT: float = float(os.getenv("SUPABASE_READ_TIMEOUT", "20"))
+    POOL_SIZE: int = int(os.getenv("SUPABASE_POOL_SIZE", "4"))
+
+
 @dataclass(frozen=True)
 class AmazonConfig:
     """Configuración de Amazon affiliates."""
@@ -51,6 +85,8 @@ class AIConfig:
 # Instancias singleton para importar directamente
 video_config = VideoConfig()
 schedule_config = ScheduleConfig()
+pipeline_config = PipelineConfig()
+db_config = DatabaseConfig()
 amazon_config = AmazonConfig()
 ai_config = AIConfig()
 
@@ -0,0 +1,116 @@
+"""
+Caché persistente de contenido generado por LLM (textos de marketing, diálogos, señales).
+
+Las mismas ofertas vuelven ciclo tras ciclo: si el producto no ha cambiado
+(título, categoría, precio aproximado) y la plantilla/modelo tampoco, se
+reutiliza el resultado guardado y no se llama a la red.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+
+def price_bucket(price: Any) -> str:
+    """Redondea el precio a 2 cifras significativas (14.99 -> 15, 1299 -> 1300)."""
+    try:
+        value = float(price)
+    except (TypeError, ValueError):
+        return "na"
+    if value <= 0:
+        return "0"
+    digits = len(str(int(value)))
+    return str(int(round(value, -max(0, digits - 2)))) if digits >= 2 else str(round(value))
+
+
+def make_key(namespace: str, template_version: str, model: str, title: str,
+             price: Any, category: str, *extra: Any) -> str:
+    """Clave direccionada por contenido: hash de todo lo que influye en la salida."""
+    parts = [namespace, template_version, model, (title or "").strip().lower(),
+             price_bucket(price), (category or "").strip().lower()]
+    parts.extend(str(e) for e in extra)
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ContentCache:
+    """SQLite con TTL, desalojo LRU por número de entradas y contadores hit/miss."""
+
+    def __init__(self, path: str = None, ttl_hours: float = None, max_entries: int = None):
+        self.path = path or os.getenv("CONTENT_CACHE_PATH", "data/content_cache.sqlite3")
+        self.ttl_seconds = float(ttl_hours if ttl_hours is not None else os.getenv("CONTENT_CACHE_TTL_HOURS", "168")) * 3600
+        self.max_entries = int(max_entries if max_entries is not None else os.getenv("CONTENT_CACHE_MAX_ENTRIES", "5000"))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS content_cache (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_content_cache_accessed ON content_cache(accessed_at)")
+        self._conn.execute("DELETE FROM content_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM content_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if not row or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE content_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, namespace: str = ""):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO content_cache (key, namespace, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, namespace, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            # LRU: conservar solo las max_entries más recientes
+            self._conn.execute(
+                """DELETE FROM content_cache WHERE key IN (
+                       SELECT key FROM content_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM content_cache").fetchone()[0]
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+
+_cache: Optional[ContentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_content_cache() -> Optional[ContentCache]:
+    """Instancia compartida (None si CONTENT_CACHE_DISABLED=true o no se puede abrir)."""
+    global _cache
+    if os.getenv("CONTENT_CACHE_DISABLED", "false").lower() == "true":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = ContentCache()
+            except sqlite3.Error as e:
+                print(f"⚠️ Caché de contenido no disponible: {e}")
+                return None
+        return _cache
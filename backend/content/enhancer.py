@@ -4,14 +4,45 @@ import requests
 import json
 from dotenv import load_dotenv
 
+from content.cache import get_content_cache, make_key
+
 load_dotenv()
 
+# Subir al cambiar los prompts: invalida el contenido cacheado con la versión anterior
+PROMPT_VERSION = "enhance-v1"
+GEMINI_MODEL = "gemini-2.0-flash"
+
 class ContentEnhancer:
     def __init__(self):
         self.google_api_key = os.environ.get("GOOGLE_AI_API_KEY")
         self.hf_api_key = os.environ.get("HUGGINGFACE_API_KEY")
         self.hf_model = os.environ.get("HUGGINGFACE_MODEL", "HuggingFaceH4/zephyr-7b-beta")
         self.hf_api_url = f"https://router.huggingface.co/models/{self.hf_model}"
+        # Productos por petición en modo batch (un solo prompt con N productos)
+        self.batch_size = max(1, int(os.environ.get("ENHANCE_BATCH_SIZE", "8")))
+        self.cache = get_content_cache()
+
+    def _cache_key(self, product_data: dict, model: str) -> str:
+        return make_key("enhance", PROMPT_VERSION, model, product_data.get('title', ''),
+                        product_data.get('price'), product_data.get('category', ''))
+
+    def _from_cache(self, product_data: dict, model: str) -> bool:
+        """Aplica el contenido cacheado al producto si existe. Devuelve si hubo hit."""
+        if not self.cache:
+            return False
+        cached = self.cache.get(self._cache_key(product_data, model))
+        if not cached:
+            return False
+        product_data['marketing_title'] = cached['marketing_title']
+        product_data['marketing_description'] = cached['marketing_description']
+        return True
+
+    def _to_cache(self, product_data: dict, model: str):
+        if self.cache:
+            self.cache.set(self._cache_key(product_data, model), {
+                'marketing_title': product_data['marketing_title'],
+                'marketing_description': product_data['marketing_description'],
+            }, namespace="enhance")
 
     def enhance_product(self, product_data: dict) -> dict:
         """Enriquece los datos del producto usando IA."""
@@ -19,13 +50,121 @@ class ContentEnhancer:
         print(f"🧠 Mejorando contenido para: {product_data.get('title')}...")
 
         if self.google_api_key:
+            if self._from_cache(product_data, GEMINI_MODEL):
+                print("♻️ Contenido recuperado de caché.")
+                return product_data
             return self._enhance_with_google_ai(product_data)
         elif self.hf_api_key and not self.hf_api_key.startswith("hf_placeholder"):
+            if self._from_cache(product_data, self.hf_model):
+                print("♻️ Contenido recuperado de caché.")
+                return product_data
             return self._enhance_with_huggingface(product_data)
         else:
             print("⚠️ No AI API key found. Using templates.")
             return self._enhance_with_templates(product_data)
 
+    def enhance_products(self, products: list) -> list:
+        """
+        Enriquece varios productos. Con Gemini empaqueta hasta batch_size productos
+        por petición con un esquema JSON de array; solo los que fallan la validación
+        caen a templates. Sin Gemini, equivale a enhance_product uno a uno.
+        """
+        if not self.google_api_key:
+            return [self.enhance_product(p) for p in products]
+
+        # Los productos sin cambios salen de la caché; solo el resto va al LLM
+        pending = [p for p in products if not self._from_cache(p, GEMINI_MODEL)]
+        if len(pending) < len(products):
+            print(f"♻️ {len(products) - len(pending)}/{len(products)} productos recuperados de caché.")
+
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            print(f"🧠 Mejorando contenido en lote ({len(chunk)} productos)...")
+            generated = self._enhance_batch_with_google_ai(chunk)
+
+            fallback = 0
+            for product_data, data in zip(chunk, generated):
+                if data:
+                    product_data['marketing_title'] = data['marketing_title']
+                    product_data['marketing_description'] = data['marketing_description']
+                    self._to_cache(product_data, GEMINI_MODEL)
+                else:
+                    fallback += 1
+                    self._enhance_with_templates(product_data)
+
+            print(f"✨ IA (Google Gemini) lote: {len(chunk) - fallback}/{len(chunk)} productos generados.")
+        return products
+
+    def _enhance_batch_with_google_ai(self, products: list) -> list:
+        """Una petición Gemini para varios productos. Devuelve un dict validado o None por producto."""
+        lines = [
+            f'{i}. "{p["title"]}" ({p.get("category", "camping")}) - {p.get("price", "N/A")}€'
+            for i, p in enumerate(products)
+        ]
+        prompt = f"""Actúa como un experto en marketing de aventuras y camping.
+Para CADA producto de la lista escribe:
+- marketing_title: Título corto y emocionante (max 50 letras).
+- marketing_description: Una frase persuasiva que destaque beneficios.
+- tags: Lista de 5 hashtags relevantes.
+
+Responde con un array JSON con un objeto por producto, usando "id" = número del producto.
+
+Productos:
+{chr(10).join(lines)}"""
+
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent?key={self.google_api_key}"
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "temperature": 0.7,
+                "maxOutputTokens": 150 + 250 * len(products),
+                "responseMimeType": "application/json",
+                "responseSchema": {
+                    "type": "ARRAY",
+                    "items": {
+                        "type": "OBJECT",
+                        "properties": {
+                            "id": {"type": "INTEGER"},
+                            "marketing_title": {"type": "STRING"},
+                            "marketing_description": {"type": "STRING"},
+                            "tags": {"type": "ARRAY", "items": {"type": "STRING"}},
+                        },
+                        "required": ["id", "marketing_title", "marketing_description"],
+                    },
+                },
+            },
+        }
+
+        validated = [None] * len(products)
+        try:
+            response = requests.post(url, json=payload, timeout=15 + 5 * len(products))
+            if response.status_code != 200:
+                print(f"⚠️ Error Google AI API ({response.status_code}): {response.text[:200]}")
+                return validated
+
+            text = response.json()['candidates'][0]['content']['parts'][0]['text']
+            items = json.loads(text)
+        except Exception as e:
+            print(f"⚠️ Error lote Google AI: {e}. Usando template fallback.")
+            return validated
+
+        if not isinstance(items, list):
+            return validated
+
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            idx = item.get('id')
+            title = item.get('marketing_title')
+            description = item.get('marketing_description')
+            if (not isinstance(idx, int) or not 0 <= idx < len(products) or validated[idx] is not None
+                    or not isinstance(title, str) or not title.strip()
+                    or not isinstance(description, str) or not description.strip()):
+                continue
+            validated[idx] = {'marketing_title': title.strip(), 'marketing_description': description.strip()}
+
+        return validated
+
     def _enhance_with_google_ai(self, product_data):
         """Usa Google AI Studio (Gemini) API."""
         try:
@@ -40,7 +179,7 @@ Escribe un JSON con estos campos:
 
 Solo responde con el JSON, sin texto adicional."""
 
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={self.google_api_key}"
+            url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent?key={self.google_api_key}"
             payload = {
                 "contents": [{"parts": [{"text": prompt}]}],
                 "generationConfig": {"temperature": 0.7, "maxOutputTokens": 300}
@@ -64,6 +203,7 @@ Solo responde con el JSON, sin texto adicional."""
                     data = json.loads(clean_text)
                     product_data['marketing_title'] = data.get('marketing_title', product_data['title'])
                     product_data['marketing_description'] = data.get('marketing_description', "")
+                    self._to_cache(product_data, GEMINI_MODEL)
                     print("✨ IA (Google Gemini) ha generado contenido.")
                 except json.JSONDecodeError:
                     product_data['marketing_title'] = f"¡OFERTA! {product_data['title'][:30]}..."
@@ -117,6 +257,7 @@ Solo responde con el JSON, sin texto adicional."""
                     data = json.loads(clean_text)
                     product_data['marketing_title'] = data.get('marketing_title', product_data['title'])
                     product_data['marketing_description'] = data.get('marketing_description', "")
+                    self._to_cache(product_data, self.hf_model)
                 except:
                     # Fallback si el JSON no es válido, usamos el texto crudo con cuidado
                     product_data['marketing_title'] = f"¡OFERTA! {product_data['title'][:30]}..."
@@ -6,6 +6,11 @@ try:
 except ImportError:
     lx = None
 
+from content.cache import get_content_cache, make_key
+
+# Subir al cambiar PROMPT_DESCRIPTION o el ejemplo: invalida las señales cacheadas
+PROMPT_VERSION = "signals-v1"
+
 
 PROMPT_DESCRIPTION = (
     """
@@ -118,6 +123,13 @@ def extract_product_signals(
     if not content:
         return None
 
+    cache = get_content_cache()
+    cache_key = make_key("signals", PROMPT_VERSION, model_id, title, product_data.get("price"), category, description)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached:
+            return cached
+
     examples = [_build_example()]
     examples = [example for example in examples if example is not None]
 
@@ -160,8 +172,11 @@ def extract_product_signals(
 
     summary_data = _build_summary(entities)
 
-    return {
+    signals = {
         "entities": entities,
         "summary": summary_data["summary"],
         "keywords": summary_data["keywords"],
     }
+    if cache:
+        cache.set(cache_key, signals, namespace="signals")
+    return signals
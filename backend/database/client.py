@@ -1,24 +1,39 @@
 import os
+import sys
 import requests
-import json
+import threading
+from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+# Añadir backend al path para importar config
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import db_config
+
 # Cargar variables de entorno
 load_dotenv()
 
 class SupabaseManager:
     _instance = None
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(SupabaseManager, cls).__new__(cls)
             cls._instance._init_client()
         return cls._instance
-    
+
     def _init_client(self):
         self.url = os.environ.get("SUPABASE_URL")
         self.key = os.environ.get("SUPABASE_KEY")
-        
+
+        # Cola de escritura: se vacía por número de filas o por tiempo
+        self._buffer: List[Dict] = []
+        self._results: List[Dict] = []
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self.timeout = (db_config.CONNECT_TIMEOUT, db_config.READ_TIMEOUT)
+
         if not self.url or not self.key:
             print("⚠️ ADVERTENCIA: Credenciales Supabase no encontradas.")
             print("   -> Modo SIMULACIÓN activado.")
@@ -31,24 +46,112 @@ class SupabaseManager:
                 "Content-Type": "application/json",
                 "Prefer": "return=minimal"
             }
+            # Sesión con keep-alive: un solo handshake TLS para todo el ciclo
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=db_config.POOL_SIZE)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
             print("✅ Cliente Supabase (REST) configurado.")
 
     def save_deal(self, deal_data: dict):
-        """Guarda oferta vía REST API."""
-        if self.enabled:
-            try:
-                endpoint = f"{self.url}/rest/v1/deals"
-                # Remove 'id' and 'asin' fields not in schema; let Supabase auto-generate id
-                clean_data = {k: v for k, v in deal_data.items() if k not in ("id", "asin")}
-                response = requests.post(endpoint, headers=self.headers, json=clean_data)
-                
-                if response.status_code in [200, 201, 204]:
-                    print(f"💾 Oferta guardada en DB: {deal_data.get('title')}")
-                else:
-                    print(f"❌ Error Supabase {response.status_code}: {response.text}")
-                    
-            except Exception as e:
-                print(f"❌ Error conexión Supabase: {e}")
-        else:
+        """
+        Encola la oferta para guardarla vía REST API.
+        Se envía en lote al llegar a WRITE_BATCH_SIZE filas o tras FLUSH_INTERVAL segundos;
+        llamar a flush() al final del ciclo para vaciar la cola y obtener el resultado por fila.
+        """
+        if not self.enabled:
             print(f"🔧 [SIMULACIÓN DB] Guardando oferta: {deal_data.get('title')}")
             return deal_data
+
+        # Remove 'id' and 'asin' fields not in schema; let Supabase auto-generate id
+        clean_data = {k: v for k, v in deal_data.items() if k not in ("id", "asin")}
+
+        with self._lock:
+            self._buffer.append(clean_data)
+            batch_full = len(self._buffer) >= db_config.WRITE_BATCH_SIZE
+            if not batch_full and self._timer is None:
+                self._timer = threading.Timer(db_config.FLUSH_INTERVAL, self._flush_pending)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if batch_full:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        """Envía lo que haya en la cola y acumula los resultados hasta el próximo flush()"""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not rows:
+            return
+
+        with self._send_lock:
+            results = self._send_rows(rows)
+            # Dentro de _send_lock: flush() no puede recoger resultados entre el envío y este extend
+            with self._lock:
+                self._results.extend(results)
+
+    def flush(self) -> List[Dict]:
+        """
+        Vacía la cola (bloqueante) y devuelve el resultado por fila de todo lo
+        enviado desde el último flush(): [{'title', 'ok', 'status', 'error'}].
+        """
+        if not self.enabled:
+            return []
+
+        self._flush_pending()
+        # Esperar a un envío en curso (p. ej. del Timer, que ya vació _buffer) antes de recoger
+        with self._send_lock, self._lock:
+            results, self._results = self._results, []
+
+        saved = sum(1 for r in results if r['ok'])
+        if results:
+            print(f"💾 Supabase: {saved}/{len(results)} ofertas guardadas")
+        return results
+
+    def _send_rows(self, rows: List[Dict]) -> List[Dict]:
+        """
+        POST de las filas como array JSON. Si el servidor rechaza el lote o falla el
+        transporte (timeout...), se reintenta fila a fila. Tras un timeout el resultado
+        del lote es desconocido: pudo haberse guardado, así que el reintento puede
+        duplicar alguna oferta (la tabla no tiene clave natural con la que deduplicar).
+        """
+        endpoint = f"{self.url}/rest/v1/deals"
+
+        # PostgREST exige las mismas claves en todos los objetos de un insert masivo
+        groups: Dict[tuple, List[Dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        results = []
+        for group in groups.values():
+            try:
+                response = self.session.post(endpoint, json=group, timeout=self.timeout)
+                if response.status_code in [200, 201, 204]:
+                    for row in group:
+                        print(f"💾 Oferta guardada en DB: {row.get('title')}")
+                        results.append({'title': row.get('title'), 'ok': True, 'status': response.status_code, 'error': None})
+                    continue
+                print(f"⚠️ Lote de {len(group)} rechazado ({response.status_code}), reintentando fila a fila...")
+            except requests.RequestException as e:
+                print(f"⚠️ Error enviando lote de {len(group)}: {e}. Resultado desconocido, reintentando fila a fila...")
+
+            results.extend(self._send_row(endpoint, row) for row in group)
+
+        return results
+
+    def _send_row(self, endpoint: str, row: Dict) -> Dict:
+        try:
+            response = self.session.post(endpoint, json=row, timeout=self.timeout)
+            if response.status_code in [200, 201, 204]:
+                print(f"💾 Oferta guardada en DB: {row.get('title')}")
+                return {'title': row.get('title'), 'ok': True, 'status': response.status_code, 'error': None}
+            print(f"❌ Error Supabase {response.status_code}: {response.text}")
+            return {'title': row.get('title'), 'ok': False, 'status': response.status_code, 'error': response.text}
+        except requests.RequestException as e:
+            print(f"❌ Error conexión Supabase: {e}")
+            return {'title': row.get('title'), 'ok': False, 'status': None, 'error': str(e)}
@@ -5,7 +5,10 @@ from functools import wraps
 from scraper.amazon import AmazonScraper
 from database.client import SupabaseManager
 from content.enhancer import ContentEnhancer
+from content.cache import get_content_cache
 from social.manager import SocialManager
+from pipeline import DealPipeline, Stage
+from config import pipeline_config
 
 # Configure logging
 logging.basicConfig(
@@ -52,44 +55,109 @@ def job():
 
     print(f"💰 Procesando {len(deals)} ofertas encontradas...")
 
-    # 3. Guardar y Publicar (with per-deal error handling)
-    successful = 0
-    failed_deals = []
-
-    for deal in deals:
-        deal_id = deal.get('id', 'unknown')
-        deal_title = deal.get('title', 'Sin título')[:50]
-
+    # Los generadores AI conectan en segundo plano mientras se mejoran y guardan las
+    # ofertas (solo ahora: un ciclo sin ofertas no paga esas conexiones)
+    social.warm_up()
+
+    # 3. Pipeline por etapas: mejora → DB → voz → render → subida
+    #    (la mejora va en lotes de varias ofertas por petición al LLM, la voz
+    #     sintetiza el TTS del lote en paralelo, y ambas se solapan con el render
+    #     de las ofertas anteriores)
+    def persist(deal):
+        db.save_deal(deal)
+        return deal
+
+    # Solo se reintentan excepciones reales: sin video ya se probó toda la cadena de generadores
+    @retry_with_backoff(max_retries=2)
+    def render_video(deal):
+        return social.render_deal(deal)
+
+    def render(deal):
+        video_path = render_video(deal)
+        if not video_path:
+            return Exception("Ningún generador produjo video")
+        return {'deal': deal, 'video_path': video_path}
+
+    def render_one(deal):
         try:
-            # Mejora con IA
-            enhanced_deal = enhancer.enhance_product(deal)
-
-            # Guardar en DB
-            saved_deal = db.save_deal(enhanced_deal)
-
-            # Publicar en Redes (with retry)
-            @retry_with_backoff(max_retries=2)
-            def publish_deal():
-                social.process_deal(enhanced_deal)
+            return render(deal)
+        except Exception as e:
+            return e
 
-            publish_deal()
+    def render_batch(batch):
+        # Las ofertas sin video AI comparten un único lote Remotion (bundle + navegador)
+        try:
+            paths = social.render_deals(batch)
+        except Exception as e:
+            # Misma política que el render individual: cada oferta se reintenta por separado
+            print(f"⚠️ Falló el render en lote ({e}), se reintenta oferta a oferta")
+            return [render_one(deal) for deal in batch]
+        return [
+            {'deal': deal, 'video_path': path} if path else Exception("Ningún generador produjo video")
+            for deal, path in zip(batch, paths)
+        ]
+
+    def upload(rendered):
+        if not social.upload_to_tiktok(rendered['video_path'], rendered['deal']):
+            raise Exception("Falló la subida a TikTok")
+        return rendered['deal']
+
+    def describe(item):
+        deal = item.get('deal', item) if isinstance(item, dict) else {}
+        return deal.get('title', 'Sin título')[:50]
+
+    pipeline = DealPipeline(
+        [
+            Stage("mejora", enhancer.enhance_products, pipeline_config.ENHANCE_WORKERS,
+                  batch_size=enhancer.batch_size),
+            Stage("db", persist, pipeline_config.PERSIST_WORKERS),
+            Stage("voz", social.prepare_audio, batch_size=pipeline_config.AUDIO_BATCH_SIZE),
+            Stage("render", render_batch if pipeline_config.RENDER_BATCH_SIZE > 1 else render,
+                  pipeline_config.RENDER_WORKERS, batch_size=pipeline_config.RENDER_BATCH_SIZE),
+            Stage("subida", upload, pipeline_config.UPLOAD_WORKERS),
+        ],
+        queue_size=pipeline_config.QUEUE_SIZE,
+        describe=describe,
+    )
+    outcome = pipeline.run(deals)
+
+    successful = len(outcome['completed'])
+    for deal in outcome['completed']:
+        logger.info(f"✅ Procesado exitosamente: {describe(deal)}")
 
-            successful += 1
-            logger.info(f"✅ Procesado exitosamente: {deal_title}")
+    failed_deals = []
+    for failure in outcome['failed']:
+        logger.error(f"❌ Error procesando deal '{describe(failure['item'])}' ({failure['stage']}): {failure['error']}")
+        failed_deals.append({'title': describe(failure['item']), 'error': f"[{failure['stage']}] {failure['error']}"})
 
-        except Exception as e:
-            logger.error(f"❌ Error procesando deal '{deal_title}': {e}")
-            failed_deals.append({'id': deal_id, 'title': deal_title, 'error': str(e)})
-            # Continue with next deal instead of crashing
-            continue
+    # Vaciar la cola de escritura de la DB (bloquea hasta el último lote)
+    db_results = db.flush()
+    db_failed = [r for r in db_results if not r['ok']]
 
     # Summary
     print(f"\n📊 Resumen: {successful}/{len(deals)} ofertas procesadas exitosamente")
+    if db_failed:
+        print(f"⚠️  {len(db_failed)} ofertas no se guardaron en DB:")
+        for r in db_failed:
+            print(f"   - {r['title']}: {str(r['error'])[:100]}")
     if failed_deals:
         print(f"⚠️  {len(failed_deals)} ofertas fallaron:")
         for fd in failed_deals:
             print(f"   - {fd['title']}: {fd['error'][:100]}")
 
+    cache = get_content_cache()
+    if cache:
+        stats = cache.stats()
+        print(f"♻️  Caché de contenido: {stats['hits']} hits / {stats['misses']} misses ({stats['entries']} entradas)")
+
+    video_stats = social.video_cache.stats()
+    if video_stats['hits'] or video_stats['misses']:
+        print(f"♻️  Caché de videos: {video_stats['hits']} reutilizados / {video_stats['misses']} renderizados")
+
+    startup = social.startup_times()
+    if startup:
+        print("⏱️  Arranque de generadores: " + ", ".join(f"{name} {secs:.1f}s" for name, secs in startup.items()))
+
     # Close social manager resources
     try:
         social.close()
@@ -0,0 +1,126 @@
+"""
+Pipeline por etapas para procesar ofertas.
+
+Cada etapa tiene su propio pool de hilos y una cola acotada de entrada,
+de forma que la mejora con IA de la oferta N+1 se solapa con el render
+de la oferta N, y una etapa lenta frena a las anteriores (backpressure)
+en vez de acumular trabajo en memoria.
+"""
+import queue
+import threading
+from typing import Any, Callable, Dict, List
+
+_STOP = object()
+
+
+class Stage:
+    """
+    Etapa del pipeline: func(item) -> item para la siguiente etapa (o excepción).
+    Con batch_size > 1 la etapa agrupa hasta batch_size elementos ya disponibles
+    y func recibe/devuelve una lista del mismo tamaño; una excepción en la posición
+    de un elemento marca como fallido solo ese elemento.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1, batch_size: int = 1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+
+
+class DealPipeline:
+    """
+    Ejecuta una lista de etapas sobre los elementos de entrada.
+    Los elementos que fallan en una etapa se registran y no pasan a la siguiente.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 2, describe: Callable[[Any], str] = str):
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.describe = describe
+
+    def run(self, items: List[Any]) -> Dict[str, List]:
+        """Procesa todos los elementos y espera a que terminen. Devuelve completed/failed."""
+        queues = [queue.Queue(maxsize=max(self.queue_size, stage.batch_size)) for stage in self.stages]
+        completed: List[Any] = []
+        failed: List[Dict] = []
+        results_lock = threading.Lock()
+        threads = []
+
+        for index, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            remaining_lock = threading.Lock()
+
+            def worker(index=index, stage=stage, remaining=remaining, remaining_lock=remaining_lock):
+                inbox = queues[index]
+                outbox = queues[index + 1] if index + 1 < len(queues) else None
+
+                stopping = False
+                while not stopping:
+                    item = inbox.get()
+                    if item is _STOP:
+                        break
+
+                    batch = [item]
+                    while len(batch) < stage.batch_size:
+                        try:
+                            item = inbox.get(timeout=0.1)
+                        except queue.Empty:
+                            break
+                        if item is _STOP:
+                            stopping = True
+                            break
+                        batch.append(item)
+
+                    try:
+                        results = stage.func(batch) if stage.batch_size > 1 else [stage.func(batch[0])]
+                    except Exception as e:
+                        with results_lock:
+                            for failed_item in batch:
+                                print(f"   ❌ [{stage.name}] {self.describe(failed_item)}: {e}")
+                                failed.append({'item': failed_item, 'stage': stage.name, 'error': str(e)})
+                        continue
+
+                    if len(results) != len(batch):
+                        # Sin correspondencia 1:1 no se sabe qué elemento falló: falla el lote entero
+                        error = f"la etapa devolvió {len(results)} resultados para {len(batch)} elementos"
+                        with results_lock:
+                            for failed_item in batch:
+                                print(f"   ❌ [{stage.name}] {self.describe(failed_item)}: {error}")
+                                failed.append({'item': failed_item, 'stage': stage.name, 'error': error})
+                        continue
+
+                    for source, result in zip(batch, results):
+                        if isinstance(result, Exception):
+                            with results_lock:
+                                print(f"   ❌ [{stage.name}] {self.describe(source)}: {result}")
+                                failed.append({'item': source, 'stage': stage.name, 'error': str(result)})
+                            continue
+                        if outbox is not None:
+                            outbox.put(result)
+                        else:
+                            with results_lock:
+                                completed.append(result)
+
+                # El último worker de la etapa propaga el cierre a la siguiente
+                with remaining_lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last and outbox is not None:
+                    for _ in range(self.stages[index + 1].workers):
+                        outbox.put(_STOP)
+
+            for n in range(stage.workers):
+                thread = threading.Thread(target=worker, name=f"{stage.name}-{n}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        for item in items:
+            queues[0].put(item)  # bloquea si la primera etapa va llena
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_STOP)
+
+        for thread in threads:
+            thread.join()
+
+        return {'completed': completed, 'failed': failed}
@@ -14,8 +14,6 @@ import sys
 import time
 import base64
 import tempfile
-import subprocess
-import requests
 from typing import Optional, Dict
 from io import BytesIO
 
@@ -27,16 +25,14 @@ except ImportError:
     HAS_GRADIO_CLIENT = False
     print("   ⚠️ gradio_client no instalado. Instalar con: pip install gradio_client")
 
-# Intentar importar PIL para procesamiento de imágenes
-try:
-    from PIL import Image
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
-
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from .media_info import media_duration
+from .media_tools import mux_audio
+from .downloader import download_file
+from .image_store import get_image_store, VERTICAL_SIZE
+
 
 class AIVideoGenerator:
     """
@@ -121,75 +117,6 @@ class AIVideoGenerator:
 
         return random.choice(self.DIALOGUE_TEMPLATES["default"])
 
-    def _download_image(self, image_url: str, output_path: str) -> bool:
-        """Descarga una imagen y la guarda localmente."""
-        try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-            }
-            response = requests.get(image_url, headers=headers, timeout=30)
-            response.raise_for_status()
-
-            with open(output_path, "wb") as f:
-                f.write(response.content)
-
-            return True
-        except Exception as e:
-            print(f"   ❌ Error descargando imagen: {e}")
-            return False
-
-    def _prepare_image(self, image_path: str, target_size: tuple = (1024, 576)) -> str:
-        """
-        Prepara la imagen para SVD (redimensiona y ajusta aspect ratio).
-        SVD funciona mejor con 1024x576 (16:9) o 576x1024 (9:16).
-        """
-        if not HAS_PIL:
-            return image_path  # Sin PIL, usar imagen original
-
-        try:
-            img = Image.open(image_path)
-
-            # Convertir a RGB si es necesario
-            if img.mode in ('RGBA', 'P'):
-                img = img.convert('RGB')
-
-            # Calcular nuevo tamaño manteniendo aspect ratio
-            original_ratio = img.width / img.height
-            target_ratio = target_size[0] / target_size[1]
-
-            if original_ratio > target_ratio:
-                # Imagen más ancha - ajustar por altura
-                new_height = target_size[1]
-                new_width = int(new_height * original_ratio)
-            else:
-                # Imagen más alta - ajustar por ancho
-                new_width = target_size[0]
-                new_height = int(new_width / original_ratio)
-
-            # Redimensionar
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-            # Recortar al centro para obtener tamaño exacto
-            left = (new_width - target_size[0]) // 2
-            top = (new_height - target_size[1]) // 2
-            right = left + target_size[0]
-            bottom = top + target_size[1]
-            img = img.crop((left, top, right, bottom))
-
-            # Guardar imagen preparada
-            prepared_path = image_path.replace(".jpg", "_prepared.jpg").replace(".png", "_prepared.png")
-            if prepared_path == image_path:
-                prepared_path = image_path + "_prepared.jpg"
-
-            img.save(prepared_path, "JPEG", quality=95)
-            print(f"   📐 Imagen preparada: {target_size[0]}x{target_size[1]}")
-
-            return prepared_path
-
-        except Exception as e:
-            print(f"   ⚠️ Error preparando imagen: {e}")
-            return image_path
-
     def _generate_video_svd(self, image_path: str, output_path: str, motion: int = 127) -> bool:
         """
         Genera video usando Stable Video Diffusion via HuggingFace Spaces.
@@ -241,9 +168,7 @@ class AIVideoGenerator:
                 video_url = video_result['video']
                 if video_url.startswith('http'):
                     # Descargar video
-                    response = requests.get(video_url, timeout=120)
-                    with open(output_path, 'wb') as f:
-                        f.write(response.content)
+                    download_file(video_url, output_path)
                     return True
 
             print(f"   ⚠️ Resultado inesperado: {type(video_result)}")
@@ -271,96 +196,15 @@ class AIVideoGenerator:
             return False
 
     def _get_media_duration(self, file_path: str) -> float:
-        """Obtiene la duración de un archivo de audio/video usando ffprobe."""
-        try:
-            cmd = [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                file_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            return float(result.stdout.strip())
-        except Exception as e:
-            print(f"   ⚠️ Error obteniendo duración: {e}")
-            return 0.0
-
-    def _combine_video_audio(
-        self,
-        video_path: str,
-        audio_path: str,
-        output_path: str,
-        target_duration: float = None
-    ) -> bool:
-        """
-        Combina video y audio usando FFmpeg.
-        Si el audio es más largo que el video, hace loop del video.
-        """
-        try:
-            video_duration = self._get_media_duration(video_path)
-            audio_duration = self._get_media_duration(audio_path)
-
-            print(f"   📹 Video: {video_duration:.1f}s, Audio: {audio_duration:.1f}s")
-
-            # Determinar duración objetivo
-            if target_duration:
-                final_duration = target_duration
-            else:
-                final_duration = max(audio_duration, 5.0)  # Mínimo 5 segundos
-
-            # Construir comando FFmpeg
-            if video_duration < final_duration:
-                # Loop del video para alcanzar duración del audio
-                loops = int(final_duration / video_duration) + 1
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-stream_loop", str(loops),
-                    "-i", video_path,
-                    "-i", audio_path,
-                    "-c:v", "libx264",
-                    "-c:a", "aac",
-                    "-b:a", "192k",
-                    "-shortest",
-                    "-t", str(final_duration),
-                    "-pix_fmt", "yuv420p",
-                    "-preset", "fast",
-                    output_path
-                ]
-            else:
-                # Video suficientemente largo
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-i", video_path,
-                    "-i", audio_path,
-                    "-c:v", "libx264",
-                    "-c:a", "aac",
-                    "-b:a", "192k",
-                    "-shortest",
-                    "-pix_fmt", "yuv420p",
-                    "-preset", "fast",
-                    output_path
-                ]
-
-            print(f"   🔧 Combinando video + audio...")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-
-            if result.returncode != 0:
-                print(f"   ❌ FFmpeg error: {result.stderr[-500:]}")
-                return False
-
-            final_size = os.path.getsize(output_path)
-            print(f"   ✅ Video final: {output_path} ({final_size // 1024}KB)")
-            return True
-
-        except Exception as e:
-            print(f"   ❌ Error combinando video/audio: {e}")
-            return False
+        """Obtiene la duración de un archivo de audio/video leyendo sus cabeceras."""
+        return media_duration(file_path)
 
     def generate_product_video(
         self,
         deal_data: dict,
         output_path: str,
         custom_dialogue: str = None,
+        audio_path: str = None,
     ) -> Optional[Dict]:
         """
         Genera un video profesional donde el producto cobra vida y habla.
@@ -369,6 +213,7 @@ class AIVideoGenerator:
             deal_data: Datos del producto (title, category, price, image_url, etc.)
             output_path: Ruta donde guardar el video final
             custom_dialogue: Diálogo personalizado (opcional)
+            audio_path: Audio TTS ya generado (opcional, evita sintetizar otro)
 
         Returns:
             Dict con información del video si exitoso, None si falla
@@ -387,14 +232,9 @@ class AIVideoGenerator:
         temp_dir = tempfile.mkdtemp(prefix="ai_video_")
 
         try:
-            # 1. Descargar imagen
-            image_path = os.path.join(temp_dir, "product.jpg")
-            print(f"   📷 Descargando imagen...")
-            if not self._download_image(image_url, image_path):
-                raise Exception("No se pudo descargar la imagen")
-
-            # 2. Preparar imagen (redimensionar para SVD)
-            prepared_image = self._prepare_image(image_path, target_size=(576, 1024))  # 9:16 para TikTok
+            # 1-2. Imagen recortada para SVD (9:16 para TikTok), desde la caché compartida
+            print(f"   📷 Preparando imagen...")
+            prepared_image = get_image_store().crop(image_url, VERTICAL_SIZE)
 
             # 3. Generar video con SVD
             svd_video_path = os.path.join(temp_dir, "svd_video.mp4")
@@ -404,13 +244,14 @@ class AIVideoGenerator:
             # 4. Generar diálogo
             dialogue = custom_dialogue or self._get_dialogue_for_category(category)
 
-            # 5. Generar audio TTS
-            audio_path = os.path.join(temp_dir, "dialogue.mp3")
-            if not self._generate_tts_audio(dialogue, audio_path):
-                raise Exception("No se pudo generar audio TTS")
+            # 5. Generar audio TTS (salvo que ya venga el audio compartido de la oferta)
+            if not audio_path:
+                audio_path = os.path.join(temp_dir, "dialogue.mp3")
+                if not self._generate_tts_audio(dialogue, audio_path):
+                    raise Exception("No se pudo generar audio TTS")
 
             # 6. Combinar video + audio
-            if not self._combine_video_audio(svd_video_path, audio_path, output_path):
+            if not mux_audio(svd_video_path, audio_path, output_path):
                 raise Exception("No se pudo combinar video y audio")
 
             return {
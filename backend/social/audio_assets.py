@@ -0,0 +1,201 @@
+"""
+Audio compartido por oferta: diálogo + TTS se generan UNA vez y se reparten a
+todos los generadores de video (SadTalker, Wan, Replicate, SVD, Remotion).
+
+El MP3 queda en una caché en disco direccionada por contenido (texto del guion +
+voz/velocidad/tono), así que el mismo guion no se vuelve a sintetizar entre ciclos.
+La duración se lee de los frames del MP3 y los segmentos del diálogo se re-sincronizan
+con los límites de palabra de edge-tts (dialogueSegments exactos para Remotion).
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .media_info import media_duration
+
+# Subir al cambiar cómo se miden/alinean los audios: invalida la caché de audio
+AUDIO_CACHE_VERSION = "audio-v2"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class DealAudio:
+    """Audio TTS listo para usar: ruta del MP3, duración medida y segmentos del diálogo."""
+    path: str
+    duration: float
+    script: str
+    segments: List[Dict] = field(default_factory=list)
+    voice: str = ""
+    backend: str = ""
+
+
+def align_segments(segments: List[Dict], word_boundaries: List[Dict], duration: float) -> List[Dict]:
+    """
+    Ajusta start/end de cada segmento al audio real. Con límites de palabra (edge-tts)
+    cada segmento va de su primera a su última palabra pronunciada; sin ellos (gTTS)
+    o si el recuento de palabras no cuadra, se reescalan los tiempos a la duración medida.
+    """
+    if not segments:
+        return segments
+
+    counts = [len(_WORD_RE.findall(seg.get('text', ''))) for seg in segments]
+    spoken = [b for b in word_boundaries if _WORD_RE.search(b.get('text', ''))]
+    if spoken and sum(counts) == len(spoken):
+        aligned, index = [], 0
+        for seg, count in zip(segments, counts):
+            if count == 0:
+                at = spoken[min(index, len(spoken) - 1)]['start']
+                aligned.append({**seg, "start": at, "end": at})
+                continue
+            words = spoken[index:index + count]
+            aligned.append({**seg, "start": words[0]['start'], "end": words[-1]['end']})
+            index += count
+        return aligned
+
+    planned = max((seg.get('end', 0) for seg in segments), default=0)
+    if not duration or not planned:
+        return segments
+    scale = duration / planned
+    return [{**seg, "start": round(seg.get('start', 0) * scale, 3), "end": round(seg.get('end', 0) * scale, 3)}
+            for seg in segments]
+
+
+class AudioAssetStore:
+    """Genera (o recupera de caché) el DealAudio de cada oferta."""
+
+    def __init__(self, tts_service, dialogue_generator, cache_dir: str = None, ttl_hours: float = None):
+        self.tts_service = tts_service
+        self.dialogue_generator = dialogue_generator
+        self.cache_dir = cache_dir or os.getenv("AUDIO_CACHE_DIR", "data/audio_cache")
+        self.ttl_seconds = float(ttl_hours if ttl_hours is not None else os.getenv("AUDIO_CACHE_TTL_HOURS", "168")) * 3600
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._prune()
+
+    def _prune(self):
+        """Borra los audios cacheados que superan el TTL."""
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _key(self, script: str) -> str:
+        tts = self.tts_service
+        parts = [AUDIO_CACHE_VERSION, script.strip(), tts.voice, tts.rate or "", tts.pitch or "", tts.backend]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:32]
+
+    def _script_for(self, deal_data: dict):
+        segments = self.dialogue_generator.generate_product_dialogue(deal_data) or []
+        if segments:
+            return self.dialogue_generator.get_full_script(segments), segments
+        # Sin diálogo: frase genérica para que los generadores sigan teniendo voz
+        title = deal_data.get('marketing_title') or deal_data.get('title') or 'Producto camping'
+        return f"¡Mira esta oferta increíble! {title} por solo {deal_data.get('price', '')} euros.", []
+
+    def _paths(self, script: str):
+        key = self._key(script)
+        return os.path.join(self.cache_dir, f"{key}.mp3"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def _lookup(self, script: str, segments: List[Dict]) -> Optional[DealAudio]:
+        audio_path, meta_path = self._paths(script)
+        if not (os.path.exists(audio_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            # Refrescar mtime: el TTL cuenta desde el último uso
+            os.utime(audio_path)
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None  # metadatos corruptos: se regenera
+        print(f"   ♻️ Audio TTS recuperado de caché ({meta.get('duration', 0.0):.1f}s)")
+        return DealAudio(path=audio_path, duration=meta.get('duration', 0.0), script=script,
+                         segments=meta.get('segments') or segments,
+                         voice=meta.get('voice', ''), backend=meta.get('backend', ''))
+
+    def _preferred_backend(self) -> str:
+        """Motor que debería producir el audio según la configuración ("auto" => edge-tts)."""
+        return "gtts" if self.tts_service.backend == "gtts" else "edge-tts"
+
+    def _store(self, script: str, segments: List[Dict], tmp_path: str, info: dict, index: int = 0) -> DealAudio:
+        """Mueve el MP3 recién sintetizado a la caché y escribe sus metadatos."""
+        audio_path, meta_path = self._paths(script)
+        backend = info.get('backend', '')
+        cacheable = not backend or backend == self._preferred_backend()
+        if not cacheable:
+            # Fallback (p. ej. gTTS durante una caída de Edge): se usa en este ciclo pero
+            # no se cachea, o los siguientes reutilizarían la voz peor hasta el TTL.
+            # Nombre único fuera de las claves de caché; lo borra _prune al vencer el TTL.
+            audio_path = os.path.join(self.cache_dir, f"fallback_{uuid.uuid4().hex}.mp3")
+            os.replace(tmp_path, audio_path)
+        else:
+            # Escritura atómica: otro worker puede estar leyendo el mismo guion
+            os.replace(tmp_path, audio_path)
+
+        duration = media_duration(audio_path) or info.get('duration_seconds', 0.0)
+        segments = align_segments(segments, info.get('word_boundaries') or [], duration)
+        audio = DealAudio(path=audio_path, duration=duration, script=script, segments=segments,
+                          voice=info.get('voice', ''), backend=info.get('backend', ''))
+        if not cacheable:
+            print(f"   🔊 Audio TTS con {backend} (fallback, sin caché): '{script[:50]}...' ({duration:.1f}s)")
+            return audio
+
+        meta = {"duration": duration, "segments": segments, "voice": audio.voice,
+                "backend": audio.backend, "script": script}
+        # Temporal propio (pid/hilo/posición), como el del MP3: dos workers pueden guardar el mismo guion
+        meta_tmp = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.{index}.tmp"
+        with open(meta_tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(meta_tmp, meta_path)
+
+        print(f"   🔊 Audio TTS compartido: '{script[:50]}...' ({duration:.1f}s)")
+        return audio
+
+    def _tmp_path(self, script: str, index: int) -> str:
+        # Único por proceso/hilo/posición: dos ofertas del lote pueden compartir guion
+        audio_path, _ = self._paths(script)
+        return f"{audio_path}.{os.getpid()}.{threading.get_ident()}.{index}.tmp.mp3"
+
+    def get_or_create(self, deal_data: dict) -> Optional[DealAudio]:
+        """Devuelve el DealAudio de la oferta, sintetizando solo si el guion no está en caché."""
+        return self.get_or_create_many([deal_data])[0]
+
+    def get_or_create_many(self, deals: List[dict]) -> List[Optional[DealAudio]]:
+        """
+        DealAudio de varias ofertas (mismo orden, None si falló). Los guiones que no
+        están en caché se sintetizan en paralelo con TTSService.synthesize_batch.
+        """
+        results: List[Optional[DealAudio]] = [None] * len(deals)
+        missing = []  # (índice, guion, segmentos, ruta temporal)
+        for i, deal_data in enumerate(deals):
+            script, segments = self._script_for(deal_data)
+            results[i] = self._lookup(script, segments)
+            if results[i] is None:
+                missing.append((i, script, segments, self._tmp_path(script, i)))
+
+        if not missing:
+            return results
+
+        try:
+            outputs = self.tts_service.synthesize_batch([(script, tmp) for _, script, _, tmp in missing])
+        except Exception as e:
+            outputs = [e] * len(missing)
+
+        for (i, script, segments, tmp_path), info in zip(missing, outputs):
+            if isinstance(info, Exception):
+                print(f"   ⚠️ Error generando TTS: {info}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                continue
+            results[i] = self._store(script, segments, tmp_path, info, i)
+        return results
@@ -4,11 +4,19 @@ Crea scripts donde el producto "habla" al espectador invitándole a comprar.
 Estilo: viral TikTok con personalidad emocional.
 """
 import os
+import sys
 import json
 import random
 import requests
 from typing import List, Dict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from content.cache import get_content_cache, make_key
+
+# Subir al cambiar el prompt: invalida los diálogos cacheados
+DIALOGUE_PROMPT_VERSION = "dialogue-v1"
+GEMINI_MODEL = "gemini-2.0-flash"
+
 
 # Plantillas de personalidad para diferentes categorías
 PERSONALITY_TEMPLATES = {
@@ -108,7 +116,8 @@ class DialogueGenerator:
 
     def __init__(self):
         self.api_key = os.environ.get("GOOGLE_AI_API_KEY")
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
+        self.cache = get_content_cache()
 
     def generate_product_dialogue(self, deal_data: dict) -> List[Dict]:
         """
@@ -129,6 +138,16 @@ class DialogueGenerator:
                                discount: int, category: str) -> List[Dict]:
         """Genera diálogo emocional usando Gemini AI."""
 
+        # Precio exacto, precio original y descuento aparecen literalmente en el guion:
+        # el tramo de price_bucket no basta (14.99 -> 14.49 cae en el mismo tramo)
+        cache_key = make_key("dialogue", DIALOGUE_PROMPT_VERSION, GEMINI_MODEL, title, price, category,
+                             discount, original_price)
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached:
+                print(f"   ♻️ Diálogo recuperado de caché: {len(cached)} segmentos")
+                return cached
+
         # Obtener personalidad según categoría
         personality = PERSONALITY_TEMPLATES.get(category, PERSONALITY_TEMPLATES['camping'])
 
@@ -192,6 +211,8 @@ FORMATO JSON (solo JSON, nada más):
                 print(f"   🗣️ Diálogo generado por Gemini: {len(segments)} segmentos")
                 for seg in segments:
                     print(f"      [{seg['start']:.1f}s] {seg['text']}")
+                if self.cache and segments:
+                    self.cache.set(cache_key, segments, namespace="dialogue")
                 return segments
 
             else:
@@ -0,0 +1,134 @@
+"""
+Descarga en streaming de los videos generados (Runway, Veo, SVD, Replicate, Wan).
+
+El MP4 nunca pasa entero por memoria: se escribe por trozos en un .part propio de
+cada llamada (pid + hilo) y se renombra de forma atómica al terminar, así nadie lee
+un video a medias y dos hilos que descargan al mismo destino (la caché de gestos de
+Wan es compartida) no se pisan: además se serializan con un lock por destino. Si la
+conexión se corta, se reanuda con una cabecera Range desde los bytes ya escritos
+(si el servidor no admite rangos, se empieza de cero). Al final se comprueba que el
+tamaño coincide con el Content-Length anunciado.
+"""
+import os
+import re
+import time
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CHUNK_SIZE = 256 * 1024
+
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_path_locks: Dict[str, threading.Lock] = {}
+_path_locks_guard = threading.Lock()
+
+
+class DownloadError(Exception):
+    """La descarga no se completó (o el tamaño no coincide) tras agotar los reintentos."""
+
+
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def _path_lock(output_path: str) -> threading.Lock:
+    with _path_locks_guard:
+        return _path_locks.setdefault(os.path.abspath(output_path), threading.Lock())
+
+
+def _expected_total(response: requests.Response, offset: int) -> Optional[int]:
+    """Tamaño total del fichero según Content-Range (206) o Content-Length (200)."""
+    if response.status_code == 206:
+        match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+        if match and match.group(3) != "*":
+            return int(match.group(3))
+        length = response.headers.get("Content-Length")
+        return offset + int(length) if length else None
+    length = response.headers.get("Content-Length")
+    # Con Content-Encoding (gzip) el Content-Length no es el tamaño en disco
+    if length and not response.headers.get("Content-Encoding"):
+        return int(length)
+    return None
+
+
+def download_file(url: str, output_path: str, timeout: float = 120, max_retries: int = 3,
+                  headers: dict = None, params: dict = None) -> int:
+    """
+    Descarga url en output_path por trozos, reanudando con Range si se corta.
+    Devuelve los bytes escritos o lanza DownloadError.
+    """
+    with _path_lock(output_path):
+        return _download(url, output_path, timeout, max_retries, headers, params)
+
+
+def _download(url: str, output_path: str, timeout: float, max_retries: int,
+              headers: Optional[dict], params: Optional[dict]) -> int:
+    # .part propio de esta llamada: solo se borra el nuestro, nunca el de otro hilo
+    part_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.part"
+    if os.path.exists(part_path):
+        os.remove(part_path)  # restos de un intento anterior de este mismo hilo
+    session = _get_session()
+    expected = None
+    attempt = 0
+
+    while True:
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        request_headers = dict(headers or {})
+        if offset:
+            request_headers["Range"] = f"bytes={offset}-"
+
+        try:
+            with session.get(url, headers=request_headers, params=params, stream=True, timeout=timeout) as response:
+                if response.status_code == 416 and expected and offset == expected:
+                    break  # ya estaba todo descargado
+                response.raise_for_status()
+
+                if offset and response.status_code != 206:
+                    offset = 0  # el servidor ignoró el Range: se empieza de cero
+                elif offset:
+                    match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+                    if match and int(match.group(1)) != offset:
+                        offset = 0
+                expected = _expected_total(response, offset) or expected
+
+                with open(part_path, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if chunk:
+                            f.write(chunk)
+
+            size = os.path.getsize(part_path)
+            if expected is None or size == expected:
+                break
+            if size > expected:
+                os.remove(part_path)  # algo no cuadra: descartar y repetir entera
+            raise DownloadError(f"incompleta ({size}/{expected} bytes)")
+
+        except (requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError, DownloadError) as e:
+            attempt += 1
+            if attempt > max_retries:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise DownloadError(f"No se pudo descargar {url[:80]}: {e}")
+            have = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            print(f"   ⚠️ Descarga cortada ({e}); reanudando desde {have // 1024}KB ({attempt}/{max_retries})")
+            time.sleep(2 ** (attempt - 1))
+        except requests.HTTPError as e:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise DownloadError(f"No se pudo descargar {url[:80]}: {e}")
+
+    os.replace(part_path, output_path)
+    return os.path.getsize(output_path)
@@ -0,0 +1,258 @@
+"""
+Caché compartida de imágenes de producto, direccionada por URL.
+
+Todos los generadores (Remotion, SVD, Runway, Veo, SadTalker, Wan) piden la imagen
+de la oferta a este almacén en lugar de descargarla cada uno: la primera petición la
+descarga (sesión HTTP con pool de conexiones), valida los magic bytes una vez y la
+guarda como <sha256(url)>.<ext>; las siguientes la leen del disco. Las variantes
+derivadas (recortes para SVD/9:16, data URI en base64) se calculan una vez y se
+guardan junto al original. El tamaño total se limita con expulsión LRU (mtime).
+
+Las URLs de imagen de Amazon son inmutables (el nombre del fichero es su hash), por
+eso basta la URL como clave y no hace falta TTL.
+"""
+import os
+import time
+import base64
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+SVD_SIZE = (1024, 576)       # 16:9, el tamaño nativo de Stable Video Diffusion
+VERTICAL_SIZE = (576, 1024)  # 9:16 para TikTok/Reels
+
+_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
+        'AppleWebKit/537.36 (KHTML, like Gecko) '
+        'Chrome/120.0.0.0 Safari/537.36'
+    ),
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+}
+
+_MIME = {".jpg": "image/jpeg", ".png": "image/png", ".webp": "image/webp"}
+
+
+def image_extension(content: bytes) -> Optional[str]:
+    """Extensión según los magic bytes, o None si no es JPEG/PNG/WebP."""
+    if content[:2] == b'\xff\xd8':
+        return ".jpg"
+    if content[:8] == b'\x89PNG\r\n\x1a\n':
+        return ".png"
+    if content[:4] == b'RIFF' and content[8:12] == b'WEBP':
+        return ".webp"
+    return None
+
+
+def crop_to_fill(image_path: str, output_path: str, target_size: Tuple[int, int]) -> bool:
+    """
+    Redimensiona manteniendo el aspect ratio y recorta al centro hasta target_size.
+    SVD funciona mejor con 1024x576 (16:9) o 576x1024 (9:16).
+    """
+    if not HAS_PIL:
+        return False
+
+    img = Image.open(image_path)
+    if img.mode in ('RGBA', 'P', 'LA'):
+        img = img.convert('RGB')
+
+    original_ratio = img.width / img.height
+    target_ratio = target_size[0] / target_size[1]
+    if original_ratio > target_ratio:
+        # Imagen más ancha - ajustar por altura
+        new_height = target_size[1]
+        new_width = int(new_height * original_ratio)
+    else:
+        # Imagen más alta - ajustar por ancho
+        new_width = target_size[0]
+        new_height = int(new_width / original_ratio)
+
+    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    left = (new_width - target_size[0]) // 2
+    top = (new_height - target_size[1]) // 2
+    img = img.crop((left, top, left + target_size[0], top + target_size[1]))
+
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    img.save(tmp_path, "JPEG", quality=95)
+    os.replace(tmp_path, output_path)
+    return True
+
+
+class ImageStore:
+    """Descarga cada imagen una vez y sirve el original y sus variantes desde disco."""
+
+    def __init__(self, cache_dir: str = None, max_mb: float = None, timeout: float = 20):
+        self.cache_dir = cache_dir or os.getenv("IMAGE_CACHE_DIR", "data/image_cache")
+        self.max_bytes = int(float(max_mb if max_mb is not None else os.getenv("IMAGE_CACHE_MAX_MB", "200")) * 1024 * 1024)
+        self.timeout = timeout
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.session = requests.Session()
+        self.session.headers.update(_HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Un lock por URL: la carrera de proveedores pide la misma imagen a la vez
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._prune()
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _find(self, key: str) -> Optional[str]:
+        for ext in _MIME:
+            path = os.path.join(self.cache_dir, f"{key}{ext}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    @staticmethod
+    def _touch(path: str) -> str:
+        # El mtime marca el último uso para la expulsión LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def _write(self, path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _download(self, url: str, retries: int) -> Tuple[bytes, str]:
+        last_error = None
+        for attempt in range(1, retries + 1):
+            try:
+                resp = self.session.get(url, timeout=self.timeout)
+                if resp.status_code != 200:
+                    raise Exception(f"HTTP {resp.status_code}")
+                content = resp.content
+                # Validar tamaño mínimo (evitar 404 HTML pages disfrazadas)
+                if len(content) < 1000:
+                    raise Exception(f"Muy pequeña ({len(content)} bytes)")
+                ext = image_extension(content)
+                if not ext:
+                    raise Exception("No es una imagen válida (magic bytes incorrectos)")
+                return content, ext
+            except Exception as e:
+                last_error = e
+                if attempt < retries:
+                    print(f"   ⚠️ Intento {attempt}/{retries} falló: {e}")
+                    time.sleep(2 ** attempt)  # Exponential backoff: 2s, 4s, 8s
+        raise Exception(f"No se pudo descargar la imagen: {last_error}")
+
+    def fetch(self, url: str, retries: int = 1) -> str:
+        """Ruta local de la imagen original; la descarga solo si no está en caché."""
+        key = self.key(url)
+        path = self._find(key)
+        if path:
+            return self._touch(path)
+
+        with self._lock_for(key):
+            path = self._find(key)  # otro hilo pudo descargarla mientras esperábamos
+            if path:
+                return self._touch(path)
+            content, ext = self._download(url, retries)
+            path = os.path.join(self.cache_dir, f"{key}{ext}")
+            self._write(path, content)
+            print(f"   📷 Imagen descargada: {len(content) // 1024}KB (caché {key[:8]})")
+
+        self._prune()
+        return path
+
+    def crop(self, url: str, target_size: Tuple[int, int] = SVD_SIZE, retries: int = 1) -> str:
+        """Variante recortada a target_size (JPEG). Sin PIL devuelve el original."""
+        source = self.fetch(url, retries)
+        key = self.key(url)
+        path = os.path.join(self.cache_dir, f"{key}_{target_size[0]}x{target_size[1]}.jpg")
+        if os.path.exists(path):
+            return self._touch(path)
+
+        with self._lock_for(key):
+            if os.path.exists(path):
+                return self._touch(path)
+            try:
+                if not crop_to_fill(source, path, target_size):
+                    return source  # Sin PIL, usar imagen original
+            except Exception as e:
+                print(f"   ⚠️ Error preparando imagen: {e}")
+                return source
+            print(f"   📐 Imagen preparada: {target_size[0]}x{target_size[1]}")
+
+        self._prune()
+        return path
+
+    def data_uri(self, url: str, retries: int = 1) -> str:
+        """Imagen como data URI en base64 (para APIs que no aceptan URLs externas)."""
+        source = self.fetch(url, retries)
+        key = self.key(url)
+        path = os.path.join(self.cache_dir, f"{key}.b64")
+        if os.path.exists(path):
+            with open(self._touch(path), "r", encoding="ascii") as f:
+                return f.read()
+
+        with open(source, "rb") as f:
+            mime = _MIME[os.path.splitext(source)[1]]
+            uri = f"data:{mime};base64,{base64.b64encode(f.read()).decode('ascii')}"
+        self._write(path, uri.encode("ascii"))
+        self._prune()
+        return uri
+
+    def _prune(self):
+        """Expulsa los ficheros usados hace más tiempo hasta quedar bajo max_bytes."""
+        entries, total = [], 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        self.session.close()
+
+
+_store: Optional[ImageStore] = None
+_store_lock = threading.Lock()
+
+
+def get_image_store() -> ImageStore:
+    """Almacén compartido por todo el proceso (una sesión y una caché para todos los generadores)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ImageStore()
+        return _store
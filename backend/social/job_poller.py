@@ -0,0 +1,162 @@
+"""
+Seguimiento asíncrono de trabajos remotos (Runway, Veo, Replicate).
+
+Las APIs de video devuelven un id de tarea y hay que consultar su estado hasta que
+termina. En lugar de bloquear un hilo con time.sleep() por cada video, los trabajos
+se registran aquí y un único event loop (hilo daemon) los consulta todos:
+
+- cada trabajo tiene su propio intervalo, que crece (backoff adaptativo) mientras
+  el estado no cambia y vuelve al mínimo cuando cambia;
+- un THROTTLED/429 de un proveedor pausa las consultas de TODOS sus trabajos;
+- track() devuelve un concurrent.futures.Future que se resuelve al terminar.
+
+Así un lote de N ofertas tarda lo que el trabajo más lento, no la suma.
+"""
+import time
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+THROTTLED = "throttled"
+
+
+class JobFailed(Exception):
+    """El trabajo remoto terminó con error."""
+
+
+class JobTimeout(JobFailed):
+    """El trabajo remoto no terminó dentro de su plazo."""
+
+
+@dataclass
+class PollStatus:
+    """Resultado de una consulta de estado (lo devuelve la función check del proveedor)."""
+    state: str
+    value: Any = None
+    label: str = ""
+    retry_after: Optional[float] = None
+
+    @classmethod
+    def pending(cls, label: str = "") -> "PollStatus":
+        return cls(PENDING, label=label)
+
+    @classmethod
+    def done(cls, value: Any = None) -> "PollStatus":
+        return cls(DONE, value=value)
+
+    @classmethod
+    def failed(cls, error: str) -> "PollStatus":
+        return cls(FAILED, label=str(error))
+
+    @classmethod
+    def throttled(cls, retry_after: float = None) -> "PollStatus":
+        return cls(THROTTLED, retry_after=retry_after)
+
+
+class JobPoller:
+    """Consulta muchos trabajos remotos desde un solo event loop."""
+
+    def __init__(self, min_interval: float = 5, max_interval: float = 30,
+                 backoff: float = 1.5, throttle_pause: float = 20):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.throttle_pause = throttle_pause
+        # Hasta cuándo está pausado cada proveedor (monotonic)
+        self._throttled_until: Dict[str, float] = {}
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop persistente en un hilo daemon (se crea en el primer uso)."""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="job-poller", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def track(self, provider: str, job_id: str, check: Callable[[], PollStatus],
+              timeout: float = 300, interval: float = None) -> Future:
+        """
+        Registra un trabajo. check() hace UNA consulta (bloqueante, se ejecuta en el
+        pool de hilos del loop) y devuelve un PollStatus. El Future devuelve el value
+        del PollStatus.done o lanza JobFailed/JobTimeout.
+        """
+        coro = self._watch(provider, job_id, check, timeout, interval or self.min_interval)
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    def throttle(self, provider: str, seconds: float = None):
+        """Pausa todas las consultas del proveedor durante `seconds`."""
+        until = time.monotonic() + (seconds or self.throttle_pause)
+        self._throttled_until[provider] = max(self._throttled_until.get(provider, 0), until)
+
+    async def _wait_throttle(self, provider: str):
+        while True:
+            remaining = self._throttled_until.get(provider, 0) - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(remaining)
+
+    async def _watch(self, provider: str, job_id: str, check, timeout: float, interval: float):
+        start = time.monotonic()
+        deadline = start + timeout
+        delay, last_label = interval, None
+
+        while time.monotonic() < deadline:
+            await self._wait_throttle(provider)
+            try:
+                status = await asyncio.to_thread(check)
+            except Exception as e:
+                print(f"   ⚠️ {provider} {job_id}: error consultando estado: {e}")
+                status = PollStatus.pending("error")
+
+            if status.state == DONE:
+                return status.value
+            if status.state == FAILED:
+                raise JobFailed(f"{provider} {job_id}: {status.label}")
+            if status.state == THROTTLED:
+                print(f"   ⚠️ {provider} throttled, pausando consultas...")
+                self.throttle(provider, status.retry_after)
+                continue
+
+            # Backoff adaptativo: más rápido cuando el estado avanza, más lento si no cambia
+            if status.label != last_label:
+                delay, last_label = interval, status.label
+                elapsed = int(time.monotonic() - start)
+                print(f"   ⏳ {provider} {status.label or 'pendiente'}... ({elapsed}s)")
+            else:
+                delay = min(delay * self.backoff, self.max_interval)
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+
+        raise JobTimeout(f"{provider} {job_id}: timeout ({timeout:.0f}s)")
+
+    def close(self):
+        """Detiene el loop (se recrea solo si se vuelve a usar)."""
+        with self._loop_lock:
+            if self._loop and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop_thread.join(timeout=5)
+                self._loop.close()
+            self._loop = None
+
+
+_poller: Optional[JobPoller] = None
+_poller_lock = threading.Lock()
+
+
+def get_job_poller() -> JobPoller:
+    """Poller compartido por el proceso: el throttling de cada proveedor es global."""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = JobPoller()
+        return _poller
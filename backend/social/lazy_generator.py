@@ -0,0 +1,94 @@
+"""
+Generadores de video perezosos.
+
+Construir un generador puede costar decenas de segundos (gradio_client.Client se
+conecta a cada Space de HuggingFace). LazyGenerator guarda solo la fábrica: el
+generador se crea la primera vez que se pide con get(), o antes en un hilo de fondo
+con warm_up() mientras el resto del ciclo avanza. Un ciclo sin ofertas nunca conecta.
+El propio módulo del generador (gradio_client, replicate...) también se importa en
+ese momento: lazy_class() da una fábrica que no toca el import hasta construir.
+"""
+import time
+import importlib
+import importlib.util
+import threading
+from typing import Callable, Optional
+
+
+# Mismo helper que scraper/optional_deps.py: backend/ se despliega solo (checkout
+# parcial en daily_bot.yml) y no puede importar del árbol raíz.
+def module_available(name: str) -> bool:
+    """¿Está instalado el paquete? Sin importarlo (solo busca el spec)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_class(module: str, attr: str) -> Callable:
+    """Fábrica que importa social.<module> y construye <attr> solo cuando se llama."""
+    def factory(*args, **kwargs):
+        return getattr(importlib.import_module(f".{module}", __package__), attr)(*args, **kwargs)
+    return factory
+
+
+class LazyGenerator:
+    def __init__(self, name: str, factory: Callable, description: str = "",
+                 on_failure: Callable[[str, str], None] = None):
+        self.name = name
+        self.description = description
+        self._factory = factory
+        self._on_failure = on_failure
+        self._instance = None
+        self._started = False
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self.error: Optional[str] = None
+        self.startup_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def failed(self) -> bool:
+        return self.ready and self._instance is None
+
+    def _claim(self) -> bool:
+        with self._lock:
+            if self._started:
+                return False
+            self._started = True
+            return True
+
+    def _build(self):
+        started = time.monotonic()
+        try:
+            instance = self._factory()
+            available = getattr(instance, "is_available", None)
+            if available and not available():
+                raise RuntimeError("no conectado")
+            self._instance = instance
+        except Exception as e:
+            self.error = str(e)
+        self.startup_seconds = time.monotonic() - started
+
+        if self._instance is not None:
+            print(f"   ⏱️ {self.name} listo en {self.startup_seconds:.1f}s{self.description}")
+        else:
+            print(f"   ℹ️ {self.name} no disponible ({self.error}) tras {self.startup_seconds:.1f}s")
+            if self._on_failure:
+                self._on_failure(self.name, self.error)
+        self._done.set()
+
+    def warm_up(self):
+        """Empieza a construir el generador en segundo plano (no bloquea)."""
+        if self._claim():
+            threading.Thread(target=self._build, name=f"warmup-{self.name}", daemon=True).start()
+
+    def get(self, timeout: float = None):
+        """El generador listo para usar, o None si no está disponible. Lo construye si hace falta."""
+        if self._claim():
+            self._build()
+        self._done.wait(timeout)
+        return self._instance
@@ -4,8 +4,9 @@ import json
 import subprocess
 import time
 import uuid
+import queue
 import shutil
-import requests
+import threading
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import video_config, is_runway_enabled, is_sadtalker_enabled, is_wan_animate_enabled
@@ -13,41 +14,21 @@ from config import video_config, is_runway_enabled, is_sadtalker_enabled, is_wan
 from .uploader import TikTokUploader
 from .dialogue_generator import DialogueGenerator
 from .tts_service import TTSService
-
-# Importar generadores de video AI (opcionales)
+from .provider_health import ProviderHealth
+from .audio_assets import AudioAssetStore
+from .remotion_server import RemotionRenderServer, RemotionServerError
+from .workspace import JobWorkspace
+from .image_store import get_image_store
+from .video_cache import VideoCache
+from .lazy_generator import LazyGenerator, lazy_class, module_available
+
+# Generadores de video AI (opcionales). Sus módulos arrastran gradio_client/replicate,
+# así que no se importan aquí: lazy_class los carga al construir cada generador.
 # Prioridad: SadTalker (gratis) > Wan Animate (gratis) > Replicate (pago) > SVD (gratis) > Runway (pago) > Remotion
 
-try:
-    from .sadtalker_generator import SadTalkerGenerator
-    HAS_SADTALKER = True
-except ImportError:
-    HAS_SADTALKER = False
-
-try:
-    from .wan_animate_generator import WanAnimateGenerator
-    HAS_WAN_ANIMATE = True
-except ImportError:
-    HAS_WAN_ANIMATE = False
-
-try:
-    from .replicate_generator import ReplicateVideoGenerator, is_replicate_enabled
-    HAS_REPLICATE = True
-except ImportError:
-    HAS_REPLICATE = False
-    is_replicate_enabled = lambda: False
-
-try:
-    from .ai_video_generator import AIVideoGenerator, is_ai_video_enabled
-    HAS_AI_VIDEO = True
-except ImportError:
-    HAS_AI_VIDEO = False
-    is_ai_video_enabled = lambda: False
-
-try:
-    from .runway_generator import RunwayVideoGenerator, generate_product_dialogue_for_runway
-    HAS_RUNWAY = True
-except ImportError:
-    HAS_RUNWAY = False
+
+# Generadores que no pueden funcionar sin el audio TTS de la oferta
+AUDIO_REQUIRED = ("SadTalker",)
 
 
 class SocialManager:
@@ -59,184 +40,389 @@ class SocialManager:
         # Remotion project lives in video/ at repo root
         self.video_dir = os.path.join(os.getcwd(), "video")
         self.max_retries = video_config.MAX_RETRIES
+        # 0 = automático según núcleos (ver _remotion_concurrency)
         self.remotion_concurrency = video_config.REMOTION_CONCURRENCY
+        self.remotion_batch_parallel = max(1, video_config.REMOTION_BATCH_PARALLEL)
         self.remotion_timeout = video_config.REMOTION_TIMEOUT
+        # Worker de render persistente: se arranca con el primer video Remotion del ciclo
+        self.remotion_server = None
+        self.use_remotion_server = video_config.REMOTION_SERVER
+        self.hedge_enabled = video_config.HEDGE_ENABLED
+        self.hedge_top_k = max(1, video_config.HEDGE_TOP_K)
+        self.hedge_stagger = max(0.0, video_config.HEDGE_STAGGER)
+        self.provider_deadline = video_config.PROVIDER_DEADLINE
+        # Marcador persistente de salud: reordena/salta generadores según su historial
+        self.health = ProviderHealth()
+        # Imágenes de producto: una descarga por URL compartida por todos los generadores
+        self.image_store = get_image_store()
+        # Videos ya renderizados: si la oferta y el diálogo no cambian, se reutilizan
+        self.video_cache = VideoCache()
 
         # Servicios de voz
         self.enable_tts = enable_tts
         if enable_tts:
             self.dialogue_generator = DialogueGenerator()
             self.tts_service = TTSService(voice="es-ES-ElviraNeural")
+            # Diálogo + TTS una sola vez por oferta, compartido por todos los generadores
+            self.audio_assets = AudioAssetStore(self.tts_service, self.dialogue_generator)
             print("   🗣️ TTS habilitado (voz: Elvira)")
+        # Audio ya preparado en lote (prepare_audio), pendiente de consumir en render_deal
+        self._prepared_audio = {}
+        self._prepared_lock = threading.Lock()
 
-        # === NUEVO: SadTalker (GRATIS - producto que habla) ===
-        self.enable_sadtalker = is_sadtalker_enabled() and HAS_SADTALKER
-        self.sadtalker_generator = None
-        if self.enable_sadtalker:
-            try:
-                self.sadtalker_generator = SadTalkerGenerator()
-                if self.sadtalker_generator.is_available():
-                    print("   🎭 SadTalker habilitado (producto que HABLA - GRATIS)")
-                else:
-                    self.enable_sadtalker = False
-                    print("   ℹ️ SadTalker no disponible (Space no conectado)")
-            except Exception as e:
-                self.enable_sadtalker = False
-                print(f"   ℹ️ SadTalker no disponible: {e}")
-
-        # === NUEVO: Wan Animate (GRATIS - producto gesticulando) ===
-        self.enable_wan_animate = is_wan_animate_enabled() and HAS_WAN_ANIMATE
-        self.wan_animate_generator = None
-        if self.enable_wan_animate:
-            try:
-                self.wan_animate_generator = WanAnimateGenerator()
-                if self.wan_animate_generator.is_available():
-                    print("   🎬 Wan Animate habilitado (producto GESTICULANDO - GRATIS)")
-                else:
-                    self.enable_wan_animate = False
-                    print("   ℹ️ Wan Animate no disponible (Space no conectado)")
-            except Exception as e:
-                self.enable_wan_animate = False
-                print(f"   ℹ️ Wan Animate no disponible: {e}")
+        # Generadores AI: handles perezosos, se conectan en el primer uso o en warm_up()
+        # (conectar a los Spaces de HuggingFace tarda; un ciclo sin ofertas no lo paga)
+        def lazy(name, factory, description):
+            return LazyGenerator(name, factory, description, on_failure=self._generator_failed)
 
+        self._generators = {}
+        # === OPCIÓN 1: SadTalker (GRATIS - producto que habla) ===
+        if is_sadtalker_enabled() and module_available("gradio_client"):
+            self._generators["SadTalker"] = lazy("SadTalker", lazy_class("sadtalker_generator", "SadTalkerGenerator"), " (producto que HABLA - GRATIS)")
+        # === OPCIÓN 2: Wan Animate (GRATIS - producto gesticulando) ===
+        if is_wan_animate_enabled() and module_available("gradio_client"):
+            self._generators["Wan"] = lazy("Wan", lazy_class("wan_animate_generator", "WanAnimateGenerator"), " (producto GESTICULANDO - GRATIS)")
         # Opción 3: Replicate (mejor calidad, bajo costo)
-        self.enable_replicate = enable_replicate if enable_replicate is not None else is_replicate_enabled()
-        self.replicate_generator = None
-        if self.enable_replicate and HAS_REPLICATE:
-            try:
-                self.replicate_generator = ReplicateVideoGenerator()
-                if self.replicate_generator.is_available():
-                    print("   🎬 Replicate habilitado (video AI profesional)")
-                else:
-                    self.enable_replicate = False
-                    print("   ℹ️ Replicate no disponible")
-            except Exception as e:
-                self.enable_replicate = False
-                print(f"   ℹ️ Replicate no disponible: {e}")
-
+        if enable_replicate is None:
+            enable_replicate = bool(os.getenv("REPLICATE_API_TOKEN"))
+        if enable_replicate and module_available("replicate"):
+            self._generators["Replicate"] = lazy("Replicate", lazy_class("replicate_generator", "ReplicateVideoGenerator"), " (video AI profesional)")
         # Opción 4: AI Video Generator (gratis - HuggingFace SVD + TTS)
-        self.enable_ai_video = enable_ai_video and HAS_AI_VIDEO and is_ai_video_enabled()
-        self.ai_video_generator = None
-        if self.enable_ai_video:
-            try:
-                self.ai_video_generator = AIVideoGenerator()
-                if self.ai_video_generator.is_available():
-                    print("   🎬 AI Video (SVD + TTS) habilitado (GRATIS)")
-                else:
-                    self.enable_ai_video = False
-                    print("   ℹ️ AI Video no disponible (HuggingFace no conectado)")
-            except Exception as e:
-                self.enable_ai_video = False
-                print(f"   ℹ️ AI Video no disponible: {e}")
-
+        if enable_ai_video and module_available("gradio_client"):
+            self._generators["SVD"] = lazy("SVD", lazy_class("ai_video_generator", "AIVideoGenerator"), " (SVD + TTS, GRATIS)")
         # Opción 5: Runway ML (alternativa de pago)
-        self.enable_runway = enable_runway if enable_runway is not None else is_runway_enabled()
-        self.runway_generator = None
-        if self.enable_runway and HAS_RUNWAY:
-            self.runway_generator = RunwayVideoGenerator()
-            print("   🎬 Runway ML habilitado (Gen-4 Turbo)")
-
-        # Resumen de generadores disponibles
-        generators = []
-        if self.enable_sadtalker: generators.append("SadTalker")
-        if self.enable_wan_animate: generators.append("Wan")
-        if self.enable_replicate: generators.append("Replicate")
-        if self.enable_ai_video: generators.append("SVD")
-        if self.enable_runway: generators.append("Runway")
-        generators.append("Remotion")  # Siempre disponible
+        enable_runway = enable_runway if enable_runway is not None else is_runway_enabled()
+        if enable_runway:
+            self._generators["Runway"] = lazy("Runway", lazy_class("runway_generator", "RunwayVideoGenerator"), " (Gen-4 Turbo)")
+
+        # Resumen de generadores configurados (la disponibilidad se sabe al conectar)
+        generators = list(self._generators) + ["Remotion"]  # Remotion siempre disponible
         print(f"   📋 Prioridad: {' → '.join(generators)}")
+        if self.hedge_enabled:
+            print(f"   🏁 Modo hedged: top-{self.hedge_top_k}, escalonado {self.hedge_stagger:.0f}s, deadline {self.provider_deadline:.0f}s")
+
+    def _generator_failed(self, name: str, error: str):
+        # Un generador que no conecta cuenta como fallo en el marcador de salud
+        self.health.record(name, False, error=error)
+
+    def _generator(self, name: str):
+        """Instancia del generador AI (la crea si hace falta) o None si no está disponible."""
+        handle = self._generators.get(name)
+        return handle.get() if handle else None
+
+    def warm_up(self):
+        """Conecta los generadores AI en hilos de fondo (no bloquea). Los que están en cooldown no."""
+        pending = [self._generators[name] for name in self.health.order(list(self._generators))
+                   if not self._generators[name].ready]
+        if pending:
+            print(f"🔥 Calentando generadores en segundo plano: {', '.join(h.name for h in pending)}")
+        for handle in pending:
+            handle.warm_up()
+
+    def startup_times(self) -> dict:
+        """Segundos que tardó en arrancar cada generador ya construido."""
+        return {name: handle.startup_seconds for name, handle in self._generators.items() if handle.ready}
 
     def process_deal(self, deal_data: dict):
         """Toma una oferta y gestiona su publicación en redes."""
-        print(f"🎬 Creando contenido para: {deal_data.get('title')}")
+        video_path = self.render_deal(deal_data)
 
-        video_path = None
+        if video_path:
+            self.upload_to_tiktok(video_path, deal_data)
 
-        # === OPCIÓN 1: SadTalker (GRATIS - producto que habla) ===
-        if not video_path and self.enable_sadtalker and self.sadtalker_generator:
-            try:
-                video_path = self._generate_sadtalker_video(deal_data)
-            except Exception as e:
-                print(f"   ⚠️ SadTalker falló: {e}")
-                video_path = None
+    @staticmethod
+    def _deal_key(deal_data: dict) -> str:
+        return str(deal_data.get('id') or deal_data.get('asin') or deal_data.get('title'))
 
-        # === OPCIÓN 2: Wan Animate (GRATIS - producto gesticulando) ===
-        if not video_path and self.enable_wan_animate and self.wan_animate_generator:
-            try:
-                video_path = self._generate_wan_animate_video(deal_data)
-            except Exception as e:
-                print(f"   ⚠️ Wan Animate falló: {e}")
-                video_path = None
+    def prepare_audio(self, deals: list) -> list:
+        """
+        Etapa de voz en lote: genera el audio de varias ofertas a la vez (TTS en
+        paralelo) y lo deja listo para render_deal. Devuelve las mismas ofertas.
+        """
+        if not self.enable_tts or not deals:
+            return deals
+        print(f"🔊 Preparando audio de {len(deals)} ofertas en paralelo...")
+        try:
+            audios = self.audio_assets.get_or_create_many(deals)
+        except Exception as e:
+            print(f"   ⚠️ Error preparando audio en lote: {e}")
+            return deals
+        with self._prepared_lock:
+            for deal_data, audio in zip(deals, audios):
+                if audio:
+                    self._prepared_audio[self._deal_key(deal_data)] = audio
+        return deals
+
+    def _take_audio(self, deal_data: dict):
+        """Audio de la oferta (diálogo + TTS): el preparado en lote o uno nuevo."""
+        if not self.enable_tts:
+            return None
+        with self._prepared_lock:
+            audio = self._prepared_audio.pop(self._deal_key(deal_data), None)
+        try:
+            return audio or self.audio_assets.get_or_create(deal_data)
+        except Exception as e:
+            print(f"   ⚠️ Error preparando audio: {e}")
+            return None
 
-        # Opción 3: Replicate (mejor calidad, bajo costo)
-        if not video_path and self.enable_replicate and self.replicate_generator:
-            try:
-                video_path = self._generate_replicate_video(deal_data)
-            except Exception as e:
-                print(f"   ⚠️ Replicate falló: {e}")
-                video_path = None
+    def _render_with_ai(self, deal_data: dict, audio, exclude=()):
+        """Opciones 1-5: generadores AI, en serie o en carrera (modo hedged). Devuelve (nombre, ruta)."""
+        providers = [(name, func) for name, func in self._video_providers() if name not in exclude]
+        if not audio or not os.path.exists(audio.path):
+            # Sin audio (TTS desactivado o fallido) se saltan sin lanzarlos: no es un fallo
+            # del proveedor y no debe contar en su marcador de salud
+            skipped = [name for name, _ in providers if name in AUDIO_REQUIRED]
+            if skipped:
+                print(f"   🔇 Sin audio para la oferta, se saltan: {', '.join(skipped)}")
+            providers = [(name, func) for name, func in providers if name not in AUDIO_REQUIRED]
+        top_k = self.hedge_top_k if self.hedge_enabled else 1
+        return self._render_race(deal_data, providers, top_k, audio) if providers else (None, None)
+
+    def _cached_video(self, deal_data: dict, audio):
+        """Video ya renderizado para esta misma oferta y diálogo (cualquier generador), o None."""
+        script, voice = (audio.script, audio.voice) if audio else ("", "")
+        hit = self.video_cache.lookup(deal_data, list(self._generators) + ["Remotion"], script, voice)
+        if not hit:
+            return None
+        generator, path = hit
+        print(f"   ♻️ Video en caché ({generator}): la oferta no ha cambiado, se reutiliza")
+        return path
 
-        # Opción 4: Video AI gratis (HuggingFace SVD + TTS)
-        if not video_path and self.enable_ai_video and self.ai_video_generator:
-            try:
-                video_path = self._generate_ai_video(deal_data)
-            except Exception as e:
-                print(f"   ⚠️ AI Video falló: {e}")
-                video_path = None
+    def _store_video(self, deal_data: dict, audio, generator: str, video_path: str):
+        if generator and video_path and os.path.exists(video_path):
+            script, voice = (audio.script, audio.voice) if audio else ("", "")
+            self.video_cache.put(deal_data, generator, video_path, script, voice)
 
-        # Opción 5: Runway ML (de pago)
-        if not video_path and self.enable_runway and self.runway_generator:
-            try:
-                video_path = self._generate_runway_video(deal_data)
-            except Exception as e:
-                print(f"   ⚠️ Runway falló: {e}")
-                video_path = None
+    def render_deals(self, deals: list) -> list:
+        """
+        Versión en lote de render_deal. Si el primer generador AI es remoto (Replicate,
+        Runway), todas las ofertas se le envían a la vez y se esperan juntas con el
+        poller compartido: el lote tarda lo que el trabajo más lento. Las que fallan
+        prueban el resto de generadores una a una, y las que se quedan sin video se
+        renderizan juntas en un único lote Remotion.
+        Devuelve la ruta (o None) de cada oferta, en orden.
+        """
+        audios = [self._take_audio(deal_data) for deal_data in deals]
+        paths = []
+        for deal_data, audio in zip(deals, audios):
+            print(f"🎬 Creando contenido para: {deal_data.get('title')}")
+            paths.append(self._cached_video(deal_data, audio))
+
+        todo = [i for i, path in enumerate(paths) if not path]
+        batched = ()
+        if len(todo) > 1:
+            providers = self._video_providers()
+            name = providers[0][0] if providers else None
+            if name in self._batch_generators():
+                batched = (name,)
+                results = self._render_remote_batch(name, [deals[i] for i in todo], [audios[i] for i in todo])
+                for i, path in zip(todo, results):
+                    self._store_video(deals[i], audios[i], name, path)
+                    paths[i] = path
+
+        for i in todo:
+            if paths[i]:
+                continue
+            generator, path = self._render_with_ai(deals[i], audios[i], exclude=batched)
+            self._store_video(deals[i], audios[i], generator, path)
+            paths[i] = path
+
+        missing = [i for i, path in enumerate(paths) if not path]
+        if missing:
+            remotion_paths = self.render_remotion_batch([deals[i] for i in missing], [audios[i] for i in missing])
+            for i, path in zip(missing, remotion_paths):
+                self._store_video(deals[i], audios[i], "Remotion", path)
+                paths[i] = path
+
+        return [path if path and os.path.exists(path) else None for path in paths]
+
+    def render_deal(self, deal_data: dict):
+        """Genera el video de la oferta (primer generador que funcione). Devuelve la ruta o None."""
+        print(f"🎬 Creando contenido para: {deal_data.get('title')}")
+
+        # Audio de la oferta (diálogo + TTS), generado una vez y compartido
+        audio = self._take_audio(deal_data)
+
+        # Misma oferta y mismo diálogo que un ciclo anterior: directo a subir
+        cached = self._cached_video(deal_data, audio)
+        if cached:
+            return cached
+
+        generator, video_path = self._render_with_ai(deal_data, audio)
 
-        # Opción 6: Fallback a Remotion (siempre funciona)
+        # Opción 6: Fallback a Remotion (siempre funciona; se registra pero nunca se salta)
         if not video_path:
+            started = time.monotonic()
             try:
-                video_path = self.generate_remotion_video(deal_data)
+                generator, video_path = "Remotion", self.generate_remotion_video(deal_data, audio)
+                self.health.record("Remotion", True, time.monotonic() - started)
             except Exception as e:
                 print(f"   ⚠️ Falló Remotion: {e}")
+                self.health.record("Remotion", False, error=str(e))
                 video_path = None
 
         if video_path and os.path.exists(video_path):
-            self.upload_to_tiktok(video_path, deal_data)
+            self._store_video(deal_data, audio, generator, video_path)
+            return video_path
+        return None
 
-    def _generate_sadtalker_video(self, deal_data: dict) -> str:
+    def _video_providers(self) -> list:
         """
-        Genera video con SadTalker donde el producto "habla".
-        GRATIS via HuggingFace Spaces.
+        Generadores AI habilitados: [(nombre, función)]. Parte de la prioridad configurada
+        y el marcador de salud quita los que están en cooldown y reordena el resto.
         """
-        deal_id = deal_data.get('id') or str(uuid.uuid4())[:8]
-        output_path = os.path.join(self.temp_dir, f"sadtalker_{deal_id}.mp4")
+        funcs = {
+            "SadTalker": self._generate_sadtalker_video,
+            "Wan": self._generate_wan_animate_video,
+            "Replicate": self._generate_replicate_video,
+            "SVD": self._generate_ai_video,
+            "Runway": self._generate_runway_video,
+        }
+        configured = list(self._generators)
+        ordered = self.health.order(configured)
+        skipped = [name for name in configured if name not in ordered]
+        if skipped:
+            print(f"   🔌 En cooldown (se saltan): {', '.join(skipped)}")
+        if ordered != [n for n in configured if n in ordered]:
+            print(f"   📋 Orden por salud: {' → '.join(ordered)}")
+
+        # Arranca en paralelo los que nadie calentó, espera y descarta los que no conectaron
+        self.warm_up()
+        return [(name, funcs[name]) for name in ordered if self._generator(name)]
+
+    def _batch_generators(self) -> dict:
+        """Generadores remotos con API de lote (crean todos los trabajos y los esperan a la vez)."""
+        return {
+            "Replicate": self._generate_replicate_videos,
+            "Runway": self._generate_runway_videos,
+        }
 
-        # Generar audio TTS primero
-        audio_path = os.path.join(self.temp_dir, f"tts_{deal_id}.mp3")
+    def _render_remote_batch(self, name: str, deals: list, audios: list) -> list:
+        """Envía todas las ofertas a un generador remoto de una vez. Devuelve la ruta (o None) de cada una."""
+        print(f"   📦 {name}: {len(deals)} ofertas en un solo lote")
+        started = time.monotonic()
         try:
-            segments = self.dialogue_generator.generate_product_dialogue(deal_data)
-            if segments:
-                full_script = self.dialogue_generator.get_full_script(segments)
-                self.tts_service.synthesize(full_script, audio_path)
-                print(f"   🔊 Audio generado: '{full_script[:50]}...'")
-            else:
-                # Fallback a texto simple
-                fallback_text = f"¡Mira esta oferta increíble! {deal_data.get('title', 'Producto camping')} por solo {deal_data.get('price', '')} euros."
-                self.tts_service.synthesize(fallback_text, audio_path)
+            outcome = self._batch_generators()[name](deals, audios)
         except Exception as e:
-            print(f"   ⚠️ Error generando TTS: {e}")
-            return None
+            outcome = [e] * len(deals)
+        elapsed = time.monotonic() - started
+
+        paths = []
+        for deal_data, result in zip(deals, outcome):
+            if not isinstance(result, Exception) and self._is_valid_mp4(result):
+                self.health.record(name, True, elapsed)
+                paths.append(result)
+                continue
+            error = str(result) if isinstance(result, Exception) else "sin MP4 válido"
+            print(f"   ⚠️ {name} falló para {deal_data.get('title', '')[:40]}: {error}")
+            self.health.record(name, False, error=error)
+            paths.append(None)
+        print(f"   ✅ Lote {name}: {sum(1 for p in paths if p)}/{len(deals)} videos en {elapsed:.0f}s")
+        return paths
+
+    @staticmethod
+    def _is_valid_mp4(path) -> bool:
+        """Comprueba que el fichero existe, no está vacío y tiene cabecera ISO BMFF ('ftyp')."""
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(12)
+            return len(header) == 12 and header[4:8] == b'ftyp'
+        except (OSError, TypeError):
+            return False
+
+    def _render_race(self, deal_data: dict, providers: list, top_k: int, audio=None):
+        """
+        Ejecuta los generadores con hasta top_k a la vez. Se lanza el siguiente cuando
+        pasa hedge_stagger desde el último lanzamiento o cuando uno falla/expira.
+        Gana el primer MP4 válido; el resto se ignora (sus hilos terminan solos).
+        Con top_k=1 equivale al orden secuencial clásico, pero con deadline por proveedor.
+        Todos reciben el mismo DealAudio (solo lectura). Devuelve (ganador, ruta) o (None, None).
+        """
+        pending = list(providers)
+        running = {}  # nombre -> (instante de inicio, deadline propio)
+        finished = queue.Queue()
+        last_launch = 0.0
+
+        deal_id = deal_data.get('id') or str(uuid.uuid4())[:8]
+
+        def launch(name, func):
+            def run():
+                # Directorio propio por proveedor: en carrera nadie pisa los temporales de otro
+                try:
+                    with JobWorkspace(self.temp_dir, job_id=f"{name.replace(' ', '')}-{deal_id}") as workspace:
+                        finished.put((name, func(deal_data, audio, workspace), None))
+                except Exception as e:
+                    finished.put((name, None, e))
+
+            # Hilos daemon: un Space colgado no debe bloquear la salida del proceso
+            threading.Thread(target=run, name=f"video-{name}", daemon=True).start()
+            running[name] = (time.monotonic(), self.health.deadline_for(name, self.provider_deadline))
+
+        while pending or running:
+            now = time.monotonic()
+
+            can_launch = pending and len(running) < top_k
+            if can_launch and (not running or now - last_launch >= self.hedge_stagger):
+                name, func = pending.pop(0)
+                if top_k > 1:
+                    print(f"   🏁 Lanzando {name} ({len(running) + 1}/{top_k} en paralelo)")
+                launch(name, func)
+                last_launch = now
+                continue
+
+            for name, (started, deadline) in list(running.items()):
+                if now - started > deadline:
+                    print(f"   ⏱️ {name} superó el deadline ({deadline:.0f}s), se ignora")
+                    self.health.record(name, False, error=f"deadline {deadline:.0f}s superado")
+                    del running[name]
+            if not running:
+                continue
+
+            waits = [started + deadline - now for started, deadline in running.values()]
+            if can_launch:
+                waits.append(last_launch + self.hedge_stagger - now)
+            try:
+                name, result, error = finished.get(timeout=max(0.05, min(waits)))
+            except queue.Empty:
+                continue
+
+            if name not in running:
+                continue  # llegó después del deadline
+            started, _ = running.pop(name)
+            elapsed = time.monotonic() - started
+
+            if error:
+                print(f"   ⚠️ {name} falló: {error}")
+                self.health.record(name, False, error=str(error))
+            elif result and self._is_valid_mp4(result):
+                self.health.record(name, True, elapsed)
+                if top_k > 1:
+                    print(f"   🏆 {name} ganó la carrera")
+                return name, result
+            else:
+                print(f"   ⚠️ {name} no produjo un MP4 válido")
+                self.health.record(name, False, elapsed, error="sin MP4 válido")
 
-        if not os.path.exists(audio_path):
-            print("   ❌ No se pudo generar audio para SadTalker")
+        return None, None
+
+    def _generate_sadtalker_video(self, deal_data: dict, audio=None, workspace=None) -> str:
+        """
+        Genera video con SadTalker donde el producto "habla".
+        GRATIS via HuggingFace Spaces. Necesita el audio compartido de la oferta.
+        """
+        deal_id = deal_data.get('id') or str(uuid.uuid4())[:8]
+        output_path = os.path.join(self.temp_dir, f"sadtalker_{deal_id}.mp4")
+
+        if not audio or not os.path.exists(audio.path):
+            print("   ❌ No hay audio para SadTalker")
             return None
 
         print(f"   🎭 Generando video SadTalker...")
-        result = self.sadtalker_generator.generate_from_deal(
+        result = self._generator("SadTalker").generate_from_deal(
             deal_data=deal_data,
-            audio_path=audio_path,
+            audio_path=audio.path,
             output_path=output_path,
-            temp_dir=self.temp_dir,
+            temp_dir=workspace.dir if workspace else self.temp_dir,
         )
 
         if result and os.path.exists(output_path):
@@ -246,35 +432,20 @@ class SocialManager:
 
         return None
 
-    def _generate_wan_animate_video(self, deal_data: dict) -> str:
+    def _generate_wan_animate_video(self, deal_data: dict, audio=None, workspace=None) -> str:
         """
         Genera video con Wan Animate donde el producto gesticula.
-        GRATIS via HuggingFace Spaces.
+        GRATIS via HuggingFace Spaces. El audio compartido es opcional.
         """
         deal_id = deal_data.get('id') or str(uuid.uuid4())[:8]
         output_path = os.path.join(self.temp_dir, f"wan_{deal_id}.mp4")
 
-        # Generar audio TTS primero
-        audio_path = os.path.join(self.temp_dir, f"tts_{deal_id}.mp3")
-        try:
-            segments = self.dialogue_generator.generate_product_dialogue(deal_data)
-            if segments:
-                full_script = self.dialogue_generator.get_full_script(segments)
-                self.tts_service.synthesize(full_script, audio_path)
-                print(f"   🔊 Audio generado: '{full_script[:50]}...'")
-            else:
-                fallback_text = f"¡Oferta imperdible! {deal_data.get('title', 'Producto')} con descuento."
-                self.tts_service.synthesize(fallback_text, audio_path)
-        except Exception as e:
-            print(f"   ⚠️ Error generando TTS: {e}")
-            audio_path = None
-
         print(f"   🎬 Generando video Wan Animate...")
-        result = self.wan_animate_generator.generate_from_deal(
+        result = self._generator("Wan").generate_from_deal(
             deal_data=deal_data,
             output_path=output_path,
-            audio_path=audio_path,
-            temp_dir=self.temp_dir,
+            audio_path=audio.path if audio else None,
+            temp_dir=workspace.dir if workspace else self.temp_dir,
         )
 
         if result and os.path.exists(output_path):
@@ -284,7 +455,7 @@ class SocialManager:
 
         return None
 
-    def _generate_replicate_video(self, deal_data: dict) -> str:
+    def _generate_replicate_video(self, deal_data: dict, audio=None, workspace=None) -> str:
         """
         Genera video con Replicate (Wan Video / SVD).
         Producto animado con movimiento fluido + audio TTS.
@@ -293,10 +464,11 @@ class SocialManager:
         output_path = os.path.join(self.temp_dir, f"replicate_{deal_id}.mp4")
 
         print(f"   🎬 Generando video con Replicate...")
-        result = self.replicate_generator.generate_video(
+        result = self._generator("Replicate").generate_video(
             deal_data=deal_data,
             output_path=output_path,
             add_audio=True,
+            audio_path=audio.path if audio else None,
         )
 
         if result and os.path.exists(output_path):
@@ -306,20 +478,32 @@ class SocialManager:
 
         return None
 
-    def _generate_ai_video(self, deal_data: dict) -> str:
+    def _generate_replicate_videos(self, deals: list, audios: list) -> list:
+        """Lote de Replicate: todas las predicciones a la vez. Ruta o excepción por oferta."""
+        jobs = [{
+            "deal_data": deal_data,
+            "output_path": os.path.join(self.temp_dir, f"replicate_{deal_data.get('id') or str(uuid.uuid4())[:8]}.mp4"),
+            "audio_path": audio.path if audio else None,
+        } for deal_data, audio in zip(deals, audios)]
+        results = self._generator("Replicate").generate_videos(
+            jobs, add_audio=True, timeout=self.health.deadline_for("Replicate", self.provider_deadline))
+        return [job["output_path"] if isinstance(result, dict) else result for job, result in zip(jobs, results)]
+
+    def _generate_ai_video(self, deal_data: dict, audio=None, workspace=None) -> str:
         """
         Genera video con AI Video Generator (gratis):
         - Stable Video Diffusion para animar el producto
-        - gTTS para el audio del diálogo
+        - Audio compartido de la oferta (o gTTS propio si no lo hay)
         - FFmpeg para combinar
         """
         deal_id = deal_data.get('id') or str(uuid.uuid4())[:8]
         output_path = os.path.join(self.temp_dir, f"ai_video_{deal_id}.mp4")
 
         print(f"   🤖 Generando video AI (SVD + TTS)...")
-        result = self.ai_video_generator.generate_product_video(
+        result = self._generator("SVD").generate_product_video(
             deal_data=deal_data,
             output_path=output_path,
+            audio_path=audio.path if audio else None,
         )
 
         if result and os.path.exists(output_path):
@@ -329,7 +513,7 @@ class SocialManager:
 
         return None
 
-    def _generate_runway_video(self, deal_data: dict) -> str:
+    def _generate_runway_video(self, deal_data: dict, audio=None, workspace=None) -> str:
         """
         Genera video con Runway ML donde el producto cobra vida como personaje 3D.
         """
@@ -340,12 +524,13 @@ class SocialManager:
             raise Exception("No hay imagen del producto")
 
         # Generar diálogo específico para actuación 3D
+        from .runway_generator import generate_product_dialogue_for_runway
         dialogue = generate_product_dialogue_for_runway(deal_data)
         print(f"   🎭 Diálogo para Runway: {dialogue[:60]}...")
 
         # Generar video
         output_path = os.path.join(self.temp_dir, f"runway_{deal_id}.mp4")
-        result = self.runway_generator.generate_video(
+        result = self._generator("Runway").generate_video(
             deal_data=deal_data,
             dialogue=dialogue,
             image_url=image_url,
@@ -361,9 +546,22 @@ class SocialManager:
 
         return None
 
-    def _generate_talking_product_audio(self, deal_data: dict) -> dict:
+    def _generate_runway_videos(self, deals: list, audios: list) -> list:
+        """Lote de Runway: todas las tareas a la vez. Ruta o excepción por oferta."""
+        from .runway_generator import generate_product_dialogue_for_runway
+        jobs = [{
+            "deal_data": deal_data,
+            "dialogue": generate_product_dialogue_for_runway(deal_data),
+            "image_url": deal_data.get('image_url'),
+            "output_path": os.path.join(self.temp_dir, f"runway_{deal_data.get('id') or str(uuid.uuid4())[:8]}.mp4"),
+        } for deal_data in deals]
+        results = self._generator("Runway").generate_videos(
+            jobs, duration=5, timeout=self.health.deadline_for("Runway", self.provider_deadline))
+        return [job["output_path"] if isinstance(result, dict) else result for job, result in zip(jobs, results)]
+
+    def _generate_talking_product_audio(self, deal_data: dict, audio=None, workspace: JobWorkspace = None) -> dict:
         """
-        Genera diálogo y audio TTS para video de 'producto que habla'.
+        Prepara el audio compartido de la oferta para Remotion (copia en el public/ del trabajo).
 
         Returns:
             dict con:
@@ -371,78 +569,34 @@ class SocialManager:
             - dialogue_segments: lista de segmentos con timing
             - full_script: texto completo del diálogo
         """
-        deal_id = deal_data.get('id') or str(uuid.uuid4())[:8]
-
-        # 1. Generar diálogo persuasivo con Gemini
-        print("   🧠 Generando diálogo con IA...")
-        segments = self.dialogue_generator.generate_product_dialogue(deal_data)
-
-        if not segments:
+        if audio is None:
+            audio = self.audio_assets.get_or_create(deal_data)
+        if not audio or not audio.segments:
             return None
 
-        # 2. Generar audio TTS
-        full_script = self.dialogue_generator.get_full_script(segments)
-        audio_filename = f"tts_{deal_id}.mp3"
-        audio_path = os.path.join(self.video_dir, "public", audio_filename)
-
-        print(f"   🔊 Generando audio TTS: '{full_script[:50]}...'")
-        try:
-            audio_info = self.tts_service.synthesize(full_script, audio_path)
-        except Exception as e:
-            print(f"   ⚠️ Error generando TTS: {e}")
-            return None
+        # Remotion solo sirve ficheros de public/: se copia, el original sigue en caché
+        audio_filename = workspace.add_public_file(audio.path, "tts")
 
         return {
             "audio_file": audio_filename,
-            "dialogue_segments": segments,
-            "full_script": full_script,
-            "duration_seconds": audio_info.get('duration_seconds', 12),
+            "dialogue_segments": audio.segments,
+            "full_script": audio.script,
+            "duration_seconds": audio.duration or 12,
         }
 
-    def _download_product_image(self, image_url, deal_id):
-        """Descarga la imagen del producto con retry y validación."""
-        dest = os.path.join(self.video_dir, "public", "product.jpg")
-        headers = {
-            'User-Agent': (
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) '
-                'Chrome/120.0.0.0 Safari/537.36'
-            ),
-            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-        }
-
-        last_error = None
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                resp = requests.get(image_url, headers=headers, timeout=20)
-
-                if resp.status_code != 200:
-                    raise Exception(f"HTTP {resp.status_code}")
-
-                content = resp.content
-                content_len = len(content)
-
-                # Validar tamaño mínimo (evitar 404 HTML pages disfrazadas)
-                if content_len < 1000:
-                    raise Exception(f"Muy pequeña ({content_len} bytes)")
-
-                # Validar que es una imagen real (JPEG magic bytes)
-                if not (content[:2] == b'\xff\xd8' or  # JPEG
-                        content[:8] == b'\x89PNG\r\n\x1a\n' or  # PNG
-                        content[:4] == b'RIFF'):  # WebP
-                    raise Exception("No es una imagen válida (magic bytes incorrectos)")
-
-                with open(dest, 'wb') as f:
-                    f.write(content)
-
-                print(f"   📷 Imagen descargada: {content_len} bytes -> {dest}")
-                return "product.jpg"
-
-            except Exception as e:
-                last_error = e
-                print(f"   ⚠️ Intento {attempt}/{self.max_retries} falló: {e}")
-                if attempt < self.max_retries:
-                    time.sleep(2 ** attempt)  # Exponential backoff: 2s, 4s, 8s
+    def _download_product_image(self, image_url, deal_id, workspace: JobWorkspace):
+        """
+        Descarga la imagen del producto con retry y validación al public/ del trabajo.
+        Devuelve la ruta relativa a public/ (para las props de Remotion).
+        """
+        try:
+            # Caché compartida por URL: el resto de generadores reutiliza esta descarga
+            image_path = self.image_store.fetch(image_url, retries=self.max_retries)
+            filename = workspace.add_public_file(image_path, "product")
+            print(f"   📷 Imagen lista -> {filename}")
+            return filename
+        except Exception as e:
+            print(f"   ⚠️ {e}")
 
         # Fallback: usar placeholder si todos los intentos fallan
         print(f"   ⚠️ Usando imagen placeholder para deal {deal_id}")
@@ -453,6 +607,8 @@ class SocialManager:
         placeholder_path = os.path.join(self.video_dir, "public", "placeholder.jpg")
 
         if not os.path.exists(placeholder_path):
+            # Escritura atómica: varios renders simultáneos pueden crearlo a la vez
+            tmp_path = f"{placeholder_path}.{uuid.uuid4().hex[:8]}.tmp"
             try:
                 from PIL import Image, ImageDraw, ImageFont
                 # Crear imagen con gradiente de marca
@@ -481,7 +637,8 @@ class SocialManager:
                 y = (700 - text_height) // 2
                 draw.text((x, y), text, fill='#facc15', font=font)
 
-                img.save(placeholder_path, 'JPEG', quality=85)
+                img.save(tmp_path, 'JPEG', quality=85)
+                os.replace(tmp_path, placeholder_path)
                 print(f"   📷 Placeholder creado: {placeholder_path}")
 
             except ImportError:
@@ -516,8 +673,9 @@ class SocialManager:
                     0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0xFA, 0xFF, 0xDA, 0x00, 0x08, 0x01, 0x01,
                     0x00, 0x00, 0x3F, 0x00, 0xFB, 0xD5, 0x00, 0x00, 0x00, 0x00, 0xFF, 0xD9
                 ])
-                with open(placeholder_path, 'wb') as f:
+                with open(tmp_path, 'wb') as f:
                     f.write(minimal_jpeg)
+                os.replace(tmp_path, placeholder_path)
                 print(f"   📷 Placeholder mínimo creado: {placeholder_path}")
 
         return "placeholder.jpg"
@@ -542,26 +700,42 @@ class SocialManager:
             return 'hidratacion'
         return 'camping'
 
-    def generate_remotion_video(self, deal_data):
-        """Genera un video profesional con Remotion (React) + voz AI opcional."""
+    def _remotion_concurrency(self, parallel: int = 1) -> int:
+        """Frames en paralelo por render: el configurado o los núcleos repartidos entre renders."""
+        if self.remotion_concurrency > 0:
+            return self.remotion_concurrency
+        return max(1, (os.cpu_count() or 2) // max(1, parallel))
+
+    def _prepare_remotion_job(self, deal_data, audio=None) -> dict:
+        """
+        Crea el workspace del render (temporal + subcarpeta de public/), deja en él la
+        imagen y el audio de la oferta con nombres por contenido y construye sus props:
+        renders simultáneos (lote o varios workers) nunca comparten ficheros.
+        """
         image_url = deal_data.get('image_url')
         if not image_url:
             raise Exception("No hay URL de imagen")
 
+        deal_id = deal_data.get('id') or str(uuid.uuid4())[:8]
         title = deal_data.get('marketing_title') or deal_data.get('title') or 'Oferta Camping'
         price = deal_data.get('price')
         original_price = deal_data.get('original_price')
         discount = deal_data.get('discount')
+        workspace = JobWorkspace(self.temp_dir, os.path.join(self.video_dir, "public"), job_id=deal_id)
 
         # 1. Descargar imagen al public/ de Remotion
-        print(f"   🔨 Renderizando video Remotion para: {title}")
-        image_filename = self._download_product_image(image_url, deal_data.get('id'))
+        print(f"   🔨 Preparando video Remotion para: {title}")
+        try:
+            image_filename = self._download_product_image(image_url, deal_id, workspace)
+        except Exception:
+            workspace.cleanup()
+            raise
 
-        # 2. Generar audio TTS (si está habilitado)
+        # 2. Audio TTS compartido (si está habilitado)
         audio_data = None
         if self.enable_tts:
             try:
-                audio_data = self._generate_talking_product_audio(deal_data)
+                audio_data = self._generate_talking_product_audio(deal_data, audio, workspace)
             except Exception as e:
                 print(f"   ⚠️ Error generando audio TTS: {e}")
                 audio_data = None
@@ -587,22 +761,153 @@ class SocialManager:
             props["dialogueSegments"] = audio_data["dialogue_segments"]
             print(f"   🎤 Video con voz: '{audio_data['full_script'][:50]}...'")
 
-        # Escribir props a archivo temporal (evita problemas de shell escaping)
-        props_path = os.path.join(self.temp_dir, "remotion_props.json")
+        return {
+            "deal_id": deal_id,
+            "props": props,
+            # La salida queda fuera del workspace: sobrevive a la limpieza para la subida
+            "output": os.path.join(self.temp_dir, f"video_{deal_id}.mp4"),
+            "workspace": workspace,
+        }
+
+    def _cleanup_remotion_job(self, job: dict):
+        """Borra el workspace del render (temporales y su carpeta de public/)."""
+        job["workspace"].cleanup()
+
+    def generate_remotion_video(self, deal_data, audio=None):
+        """Genera un video profesional con Remotion (React) + voz AI opcional."""
+        job = self._prepare_remotion_job(deal_data, audio)
+        try:
+            # Renderizar: worker persistente si está disponible, si no Remotion CLI
+            if not self._render_with_server(job["props"], job["output"], job["workspace"]):
+                self._render_with_cli(job["props"], job["output"], job["workspace"])
+        finally:
+            self._cleanup_remotion_job(job)
+
+        file_size = os.path.getsize(job["output"])
+        print(f"   ✅ Video Remotion generado: {job['output']} ({file_size // 1024}KB)")
+        return job["output"]
+
+    def render_remotion_batch(self, deals: list, audios: list = None) -> list:
+        """
+        Renderiza las DealVideo de varias ofertas en un solo trabajo: mismo bundle y
+        mismo navegador, hasta remotion_batch_parallel renders a la vez con los núcleos
+        repartidos entre ellos. Devuelve la ruta (o None) de cada oferta, en orden.
+        """
+        audios = audios or [None] * len(deals)
+        jobs, results = [], [None] * len(deals)
+        for index, (deal_data, audio) in enumerate(zip(deals, audios)):
+            try:
+                jobs.append((index, self._prepare_remotion_job(deal_data, audio)))
+            except Exception as e:
+                print(f"   ⚠️ Falló Remotion ({deal_data.get('title', '')[:40]}): {e}")
+
+        if not jobs:
+            return results
+
+        started = time.monotonic()
+        pending = jobs
+        try:
+            if self.use_remotion_server:
+                print(f"   ▶️  Lote Remotion: {len(jobs)} videos en el worker")
+                outcome = self._render_batch_with_server([job for _, job in jobs])
+                pending = []
+                for (index, job), result in zip(jobs, outcome):
+                    if isinstance(result, Exception):
+                        print(f"   ⚠️ Worker Remotion falló para {job['deal_id']}: {result}")
+                        pending.append((index, job))
+                    else:
+                        results[index] = result
+
+            # Lo que el worker no pudo (o sin worker): CLI uno a uno con todos los núcleos
+            for index, job in pending:
+                try:
+                    self._render_with_cli(job["props"], job["output"], job["workspace"])
+                    results[index] = job["output"]
+                except Exception as e:
+                    print(f"   ⚠️ Falló Remotion para {job['deal_id']}: {e}")
+        finally:
+            for _, job in jobs:
+                self._cleanup_remotion_job(job)
+
+        elapsed = (time.monotonic() - started) / len(jobs)
+        for index, _ in jobs:
+            ok = bool(results[index]) and self._is_valid_mp4(results[index])
+            self.health.record("Remotion", ok, elapsed if ok else None, None if ok else "render en lote falló")
+            if not ok:
+                results[index] = None
+        print(f"   ✅ Lote Remotion: {sum(1 for r in results if r)}/{len(deals)} videos")
+        return results
+
+    def _get_remotion_server(self) -> RemotionRenderServer:
+        if self.remotion_server is None:
+            self.remotion_server = RemotionRenderServer(
+                self.video_dir,
+                entry=video_config.REMOTION_ENTRY or None,
+                concurrency=self._remotion_concurrency(),
+                parallel=self.remotion_batch_parallel,
+                startup_timeout=self.remotion_timeout,
+            )
+        return self.remotion_server
+
+    def _render_batch_with_server(self, jobs: list) -> list:
+        """Lote en el worker. Si el worker no arranca o muere, todo el lote vuelve como error."""
+        parallel = min(self.remotion_batch_parallel, len(jobs))
+        concurrency = self._remotion_concurrency(parallel)
+        try:
+            return self._get_remotion_server().render_many(
+                [{"props": job["props"], "output": job["output"], "concurrency": concurrency,
+                  "assets": self._worker_assets(job["workspace"])} for job in jobs],
+                timeout=self.remotion_timeout,
+            )
+        except RemotionServerError as e:
+            if not self.remotion_server.running:
+                # No arrancó o murió: no reintentar el worker en este ciclo
+                self.use_remotion_server = False
+            return [e] * len(jobs)
+
+    @staticmethod
+    def _worker_assets(workspace: JobWorkspace) -> tuple:
+        """Carpeta public/ del trabajo que el worker copia a su bundle (creado antes que ella)."""
+        return workspace.public_dir, workspace.public_path
+
+    def _render_with_server(self, props: dict, output_path: str, workspace: JobWorkspace) -> bool:
+        """Renderiza con el worker persistente. False si no se puede usar (se cae a npx)."""
+        if not self.use_remotion_server:
+            return False
+
+        reported = set()
+
+        def on_progress(progress):
+            quarter = int(progress * 4)
+            if quarter not in reported and 0 < quarter < 4:
+                reported.add(quarter)
+                print(f"   ⏳ Render Remotion: {quarter * 25}%")
+
+        try:
+            print(f"   ▶️  Render en worker Remotion: {os.path.basename(output_path)}")
+            self._get_remotion_server().render(props, output_path, timeout=self.remotion_timeout,
+                                               on_progress=on_progress, assets=self._worker_assets(workspace))
+            return True
+        except RemotionServerError as e:
+            print(f"   ⚠️ Worker Remotion falló ({e}), usando npx")
+            if not self.remotion_server.running:
+                # No arrancó o murió: no reintentar el worker en este ciclo
+                self.use_remotion_server = False
+            return False
+
+    def _render_with_cli(self, props: dict, output_path: str, workspace: JobWorkspace):
+        """Render clásico: un proceso `npx remotion render` por video."""
+        # Props en el workspace del render (evita problemas de shell escaping y colisiones)
+        props_path = workspace.path("remotion_props.json")
         with open(props_path, 'w') as f:
             json.dump(props, f, ensure_ascii=False)
 
-        # 4. Renderizar con Remotion CLI
-        deal_id = deal_data.get('id') or str(uuid.uuid4())[:8]
-        output_filename = f"video_{deal_id}.mp4"
-        output_path = os.path.join(self.temp_dir, output_filename)
-
         cmd = [
             "npx", "remotion", "render",
             "DealVideo",
             output_path,
             f"--props={props_path}",
-            f"--concurrency={self.remotion_concurrency}",
+            f"--concurrency={self._remotion_concurrency()}",
         ]
 
         print(f"   ▶️  Ejecutando: {' '.join(cmd)}")
@@ -618,17 +923,6 @@ class SocialManager:
             print(f"   ❌ Remotion stderr: {result.stderr[-500:]}")
             raise Exception(f"Remotion render falló (exit {result.returncode})")
 
-        file_size = os.path.getsize(output_path)
-        print(f"   ✅ Video Remotion generado: {output_path} ({file_size // 1024}KB)")
-
-        # Limpiar archivo de audio temporal
-        if audio_data:
-            audio_path = os.path.join(self.video_dir, "public", audio_data["audio_file"])
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-
-        return output_path
-
     def upload_to_tiktok(self, video_path, deal_data):
         """Sube a TikTok via API."""
         title = deal_data.get('marketing_title') or deal_data.get('title') or ''
@@ -649,9 +943,19 @@ class SocialManager:
             print("   ✅ Publicado exitosamente.")
         else:
             print("   ❌ Falló la subida.")
+        return success
 
     def close(self):
+        # Audio preparado de ofertas que fallaron o se descartaron antes del render
+        with self._prepared_lock:
+            if self._prepared_audio:
+                print(f"   🧹 Descartando audio preparado sin usar: {len(self._prepared_audio)} ofertas")
+            self._prepared_audio.clear()
         self.uploader.close()
+        if self.remotion_server:
+            self.remotion_server.close()
+        if self.enable_tts:
+            self.tts_service.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+"""
+Duración de MP3 y MP4 leyendo las cabeceras en Python puro (sin lanzar ffprobe).
+
+- MP3: salta ID3v2, usa la cabecera Xing/Info/VBRI si existe y si no recorre
+  los frames sumando muestras (los TTS pesan ~100-300KB, se lee entero).
+- MP4: lee timescale/duration del átomo moov/mvhd.
+"""
+import os
+import struct
+from typing import Optional
+
+# Bitrates (kbps) por índice: [MPEG1 L1, L2, L3], [MPEG2/2.5 L1, L2/L3]
+_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_BITRATES[(2, 3)] = _BITRATES[(2, 2)]
+
+_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG1
+    2: [22050, 24000, 16000],  # MPEG2
+    0: [11025, 12000, 8000],   # MPEG2.5
+}
+
+
+def _parse_frame_header(data: bytes, pos: int) -> Optional[dict]:
+    """Decodifica la cabecera de frame en data[pos:pos+4] (None si no es válida)."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None  # reservado o bitrate libre: no se puede calcular el tamaño
+
+    layer = 4 - layer_bits
+    mpeg1 = version_bits == 3
+    bitrate = _BITRATES[(1 if mpeg1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][rate_index]
+    padding = (b2 >> 1) & 0x01
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        length = (samples // 8) * bitrate // sample_rate + padding
+
+    return {
+        "mpeg1": mpeg1,
+        "mono": (b3 >> 6) == 3,
+        "sample_rate": sample_rate,
+        "samples": samples,
+        "length": length,
+    }
+
+
+def _id3v2_size(data: bytes) -> int:
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _vbr_frame_count(data: bytes, pos: int, header: dict) -> Optional[int]:
+    """Número de frames según la cabecera Xing/Info o VBRI del primer frame."""
+    if header["mpeg1"]:
+        side_info = 17 if header["mono"] else 32
+    else:
+        side_info = 9 if header["mono"] else 17
+    xing = pos + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 0x01:
+            return struct.unpack(">I", data[xing + 8:xing + 12])[0]
+    vbri = pos + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI":
+        return struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+    return None
+
+
+def mp3_duration(path: str) -> float:
+    """Duración en segundos de un MP3 (0.0 si no se reconoce ningún frame)."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    pos = _id3v2_size(data)
+    # Buscar el primer frame válido (con el siguiente frame encadenado, para evitar falsos syncs)
+    header = None
+    while pos < len(data) - 4:
+        header = _parse_frame_header(data, pos)
+        if header:
+            following = pos + header["length"]
+            if following >= len(data) - 4 or _parse_frame_header(data, following):
+                break
+        header = None
+        pos += 1
+    if not header:
+        return 0.0
+
+    frames = _vbr_frame_count(data, pos, header)
+    if frames:
+        return frames * header["samples"] / header["sample_rate"]
+
+    sample_rate = header["sample_rate"]
+    total_samples = 0
+    while header:
+        total_samples += header["samples"]
+        pos += header["length"]
+        header = _parse_frame_header(data, pos)
+    return total_samples / sample_rate
+
+
+def mp4_duration(path: str) -> float:
+    """Duración en segundos de un MP4/MOV según moov/mvhd (0.0 si no se encuentra)."""
+    with open(path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+
+        def boxes(start, end):
+            offset = start
+            while offset + 8 <= end:
+                f.seek(offset)
+                size, kind = struct.unpack(">I4s", f.read(8))
+                header = 8
+                if size == 1:
+                    size = struct.unpack(">Q", f.read(8))[0]
+                    header = 16
+                elif size == 0:
+                    size = end - offset
+                if size < header:
+                    return
+                yield kind, offset + header, offset + size
+                offset += size
+
+        for kind, body, end in boxes(0, file_size):
+            if kind != b"moov":
+                continue
+            for child, child_body, _ in boxes(body, end):
+                if child != b"mvhd":
+                    continue
+                f.seek(child_body)
+                version = f.read(4)[0]
+                if version == 1:
+                    timescale, duration = struct.unpack(">16xIQ", f.read(28))
+                else:
+                    timescale, duration = struct.unpack(">8xII", f.read(16))
+                return duration / timescale if timescale else 0.0
+    return 0.0
+
+
+def media_duration(path: str) -> float:
+    """Duración de un MP3 o MP4 según su firma (0.0 si no se puede leer)."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+        if head[4:8] in (b"ftyp", b"moov", b"mdat", b"free", b"wide"):
+            return mp4_duration(path)
+        return mp3_duration(path)
+    except (OSError, struct.error, IndexError):
+        return 0.0
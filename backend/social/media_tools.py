@@ -0,0 +1,146 @@
+"""
+Utilidades de ffmpeg compartidas por los generadores de video.
+
+mux_audio() añade la pista de voz a un video generado (SVD, Replicate, Wan):
+- sondea cada fichero UNA vez con ffprobe (salida JSON: duración + códecs);
+- si el video ya es H.264/yuv420p y no hace falta hacer loop, copia el stream de
+  video tal cual (-c:v copy) y solo codifica el audio: milisegundos, no decenas de
+  segundos de libx264;
+- solo re-codifica cuando hay que repetir el video para cubrir el audio, cuando
+  el códec no es apto para TikTok, o si la copia falla.
+"""
+import os
+import json
+import time
+import shutil
+import subprocess
+from dataclasses import dataclass
+from typing import Optional
+
+from .media_info import media_duration
+
+# Margen para no hacer loop por diferencias de redondeo entre contenedores
+_LOOP_TOLERANCE = 0.05
+
+
+@dataclass
+class MediaInfo:
+    duration: float = 0.0
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+    pix_fmt: Optional[str] = None
+
+    @property
+    def stream_copyable(self) -> bool:
+        """H.264 yuv420p: se puede meter en el MP4 final sin re-codificar."""
+        return self.video_codec == "h264" and self.pix_fmt in (None, "yuv420p")
+
+
+def probe(path: str) -> MediaInfo:
+    """Duración y códecs con una sola llamada a ffprobe (cabeceras en Python si no hay ffprobe)."""
+    if shutil.which("ffprobe"):
+        try:
+            result = subprocess.run(
+                ["ffprobe", "-v", "error", "-print_format", "json", "-show_format", "-show_streams", path],
+                capture_output=True, text=True, timeout=30,
+            )
+            if result.returncode == 0:
+                data = json.loads(result.stdout or "{}")
+                info = MediaInfo(duration=float(data.get("format", {}).get("duration") or 0.0))
+                for stream in data.get("streams", []):
+                    kind = stream.get("codec_type")
+                    if kind == "video" and not info.video_codec:
+                        info.video_codec = stream.get("codec_name")
+                        info.pix_fmt = stream.get("pix_fmt")
+                        info.duration = info.duration or float(stream.get("duration") or 0.0)
+                    elif kind == "audio" and not info.audio_codec:
+                        info.audio_codec = stream.get("codec_name")
+                return info
+        except (subprocess.SubprocessError, ValueError, OSError):
+            pass
+    # Sin ffprobe: duración desde las cabeceras; códec desconocido => se re-codifica
+    return MediaInfo(duration=media_duration(path))
+
+
+def _run_ffmpeg(cmd: list, timeout: int) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+
+
+def mux_audio(
+    video_path: str,
+    audio_path: str,
+    output_path: str,
+    target_duration: float = None,
+    min_duration: float = 5.0,
+    timeout: int = 120,
+) -> bool:
+    """
+    Combina video y audio en output_path. La duración final es target_duration o
+    max(audio, min_duration); si el video es más corto se repite en bucle.
+    """
+    try:
+        video = probe(video_path)
+        audio = probe(audio_path)
+        print(f"   📹 Video: {video.duration:.1f}s, Audio: {audio.duration:.1f}s")
+
+        final_duration = target_duration or max(audio.duration, min_duration)
+        needs_loop = bool(video.duration) and video.duration + _LOOP_TOLERANCE < final_duration
+        audio_args = ["-c:a", "copy"] if audio.audio_codec == "aac" else ["-c:a", "aac", "-b:a", "192k"]
+        started = time.time()
+
+        if video.duration and not needs_loop and video.stream_copyable:
+            # Camino rápido: el video se copia, solo se codifica el audio
+            cmd = [
+                "ffmpeg", "-y",
+                "-i", video_path,
+                "-i", audio_path,
+                "-map", "0:v:0", "-map", "1:a:0",
+                "-c:v", "copy",
+                *audio_args,
+                "-shortest",
+                "-movflags", "+faststart",
+                output_path,
+            ]
+            if target_duration:
+                cmd[-1:-1] = ["-t", str(final_duration)]
+            print(f"   🔧 Combinando video + audio (copia de stream)...")
+            result = _run_ffmpeg(cmd, timeout)
+            if result.returncode == 0:
+                return _report(output_path, started)
+            print(f"   ⚠️ Copia de stream falló, re-codificando: {result.stderr[-200:]}")
+
+        cmd = ["ffmpeg", "-y"]
+        if needs_loop:
+            # Loop del video para alcanzar duración del audio
+            cmd += ["-stream_loop", str(int(final_duration / video.duration) + 1)]
+        cmd += [
+            "-i", video_path,
+            "-i", audio_path,
+            "-map", "0:v:0", "-map", "1:a:0",
+            "-c:v", "libx264",
+            *audio_args,
+            "-shortest",
+            "-t", str(final_duration),
+            "-pix_fmt", "yuv420p",
+            "-preset", "fast",
+            "-movflags", "+faststart",
+            output_path,
+        ]
+        print(f"   🔧 Combinando video + audio (re-codificando{' con loop' if needs_loop else ''})...")
+        result = _run_ffmpeg(cmd, timeout)
+        if result.returncode != 0:
+            print(f"   ❌ FFmpeg error: {result.stderr[-500:]}")
+            return False
+        return _report(output_path, started)
+
+    except Exception as e:
+        print(f"   ❌ Error combinando video/audio: {e}")
+        return False
+
+
+def _report(output_path: str, started: float) -> bool:
+    if not os.path.exists(output_path):
+        return False
+    size = os.path.getsize(output_path)
+    print(f"   ✅ Video final: {output_path} ({size // 1024}KB, {time.time() - started:.1f}s)")
+    return True
@@ -0,0 +1,141 @@
+"""
+Marcador de salud de los generadores de video (SadTalker, Wan, Replicate, SVD, Runway, Remotion).
+
+Registra éxito/fallo y latencia de cada intento, persiste en disco entre ejecuciones
+y expone un circuit breaker: tras varios fallos seguidos el proveedor entra en
+cooldown y no se intenta hasta que expire, así no se pagan timeouts de Spaces caídos.
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class ProviderHealth:
+    """
+    Por proveedor guarda las últimas `window` muestras (ok, latencia), el último
+    error y el estado del circuito (fallos consecutivos, cooldown_until, aperturas).
+    """
+
+    def __init__(self, path: str = None, window: int = 50, failure_threshold: int = None,
+                 cooldown_minutes: float = None):
+        self.path = path or os.getenv("PROVIDER_HEALTH_PATH", "data/provider_health.json")
+        self.window = window
+        self.failure_threshold = failure_threshold or int(os.getenv("PROVIDER_FAILURE_THRESHOLD", "3"))
+        self.cooldown_seconds = float(cooldown_minutes if cooldown_minutes is not None
+                                      else os.getenv("PROVIDER_COOLDOWN_MINUTES", "30")) * 60
+        self.max_cooldown_seconds = 6 * 3600
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _entry(self, name: str) -> Dict:
+        return self._data.setdefault(name, {
+            "samples": [],              # [[ok, latencia_s | null], ...]
+            "consecutive_failures": 0,
+            "trips": 0,                 # aperturas seguidas del circuito (cooldown exponencial)
+            "cooldown_until": 0,
+            "last_error": None,
+            "last_error_at": None,
+        })
+
+    def record(self, name: str, ok: bool, latency: Optional[float] = None, error: str = None):
+        """Registra un intento. latency=None para fallos sin duración significativa (p.ej. conexión)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entry(name)
+            entry["samples"] = (entry["samples"] + [[bool(ok), latency]])[-self.window:]
+
+            if ok:
+                entry["consecutive_failures"] = 0
+                entry["trips"] = 0
+                entry["cooldown_until"] = 0
+            else:
+                entry["consecutive_failures"] += 1
+                entry["last_error"] = (error or "desconocido")[:300]
+                entry["last_error_at"] = now
+                # Abrir el circuito (o reabrirlo si falla el intento de prueba tras el cooldown)
+                if entry["consecutive_failures"] >= self.failure_threshold:
+                    entry["trips"] += 1
+                    cooldown = min(self.cooldown_seconds * 2 ** (entry["trips"] - 1), self.max_cooldown_seconds)
+                    entry["cooldown_until"] = now + cooldown
+                    print(f"   🔌 {name} en cooldown {cooldown / 60:.0f} min ({entry['consecutive_failures']} fallos seguidos)")
+
+            try:
+                self._save()
+            except OSError as e:
+                print(f"   ⚠️ No se pudo guardar el marcador de proveedores: {e}")
+
+    def is_available(self, name: str) -> bool:
+        with self._lock:
+            entry = self._data.get(name)
+            return not entry or time.time() >= entry.get("cooldown_until", 0)
+
+    def stats(self, name: str) -> Dict:
+        with self._lock:
+            entry = self._data.get(name)
+            samples = list(entry["samples"]) if entry else []
+            last_error = entry.get("last_error") if entry else None
+            cooldown_until = entry.get("cooldown_until", 0) if entry else 0
+
+        successes = sum(1 for ok, _ in samples if ok)
+        latencies = [lat for ok, lat in samples if ok and lat is not None]
+        return {
+            "attempts": len(samples),
+            # Suavizado de Laplace: un proveedor sin historial parte de 0.5
+            "success_rate": (successes + 1) / (len(samples) + 2),
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "latency_samples": len(latencies),
+            "last_error": last_error,
+            "cooldown_remaining": max(0, cooldown_until - time.time()),
+        }
+
+    def order(self, names: List[str]) -> List[str]:
+        """
+        Filtra los proveedores en cooldown y ordena el resto por tasa de éxito
+        (en escalones de 10%); a igualdad se respeta la prioridad configurada.
+        """
+        available = [n for n in names if self.is_available(n)]
+        priority = {name: i for i, name in enumerate(names)}
+        return sorted(available, key=lambda n: (-round(self.stats(n)["success_rate"], 1), priority[n]))
+
+    def deadline_for(self, name: str, default: float, min_samples: int = 5) -> float:
+        """Deadline adaptativo: 3x el p95 observado (mínimo 60s), nunca por encima del global."""
+        stats = self.stats(name)
+        if stats["latency_samples"] < min_samples:
+            return default
+        return min(default, max(60.0, 3 * stats["p95"]))
+
+    def summary(self, names: List[str]) -> str:
+        lines = []
+        for name in names:
+            s = self.stats(name)
+            p50 = f"{s['p50']:.0f}s" if s['p50'] is not None else "-"
+            p95 = f"{s['p95']:.0f}s" if s['p95'] is not None else "-"
+            state = f"cooldown {s['cooldown_remaining'] / 60:.0f} min" if s["cooldown_remaining"] else "ok"
+            lines.append(f"{name}: {s['success_rate']:.0%} éxito, p50 {p50}, p95 {p95}, {state}")
+        return "\n".join(lines)
@@ -0,0 +1,152 @@
+// Worker de render persistente para Remotion.
+//
+// Se lanza una vez por ciclo desde remotion_server.py con cwd = proyecto video/.
+// Empaqueta (bundle) el proyecto React una sola vez, abre el navegador una sola
+// vez y después renderiza tantos juegos de props como lleguen por stdin.
+//
+// Protocolo: una línea JSON por mensaje.
+//   stdin : {"id": "...", "props": {...}, "output": "/ruta/video.mp4", "concurrency": 4,
+//            "assets": {"from": "/ruta/video/public/jobs/x", "to": "jobs/x"}}
+//           {"type": "shutdown"}
+//   stdout: {"type": "ready", "bundleMs": 1234}
+//           {"type": "progress", "id": "...", "progress": 0.42}
+//           {"type": "done", "id": "...", "output": "...", "renderMs": 5678}
+//           {"type": "error", "id": "...", "error": "..."}
+// Los logs de Remotion van a stderr para no romper el protocolo.
+//
+// Un lote es simplemente varios trabajos seguidos por stdin: se renderizan hasta
+// --parallel a la vez compartiendo el mismo bundle y el mismo navegador.
+//
+// bundle() copia public/ UNA vez, al arrancar: la imagen y el audio de cada oferta
+// se escriben después. Por eso cada trabajo trae "assets" y su carpeta se copia al
+// public/ del bundle antes de renderizar (y se borra al terminar).
+
+import { createRequire } from "node:module";
+import { cpSync, existsSync, rmSync } from "node:fs";
+import path from "node:path";
+import readline from "node:readline";
+
+// Las dependencias se resuelven desde el proyecto video/, no desde este script
+const projectRequire = createRequire(path.join(process.cwd(), "package.json"));
+const { bundle } = projectRequire("@remotion/bundler");
+const { ensureBrowser, openBrowser, renderMedia, selectComposition } = projectRequire("@remotion/renderer");
+
+const args = Object.fromEntries(
+  process.argv.slice(2).map((arg) => {
+    const [key, ...value] = arg.replace(/^--/, "").split("=");
+    return [key, value.join("=")];
+  }),
+);
+const compositionId = args.composition || "DealVideo";
+const concurrency = Number(args.concurrency || 2);
+const parallel = Math.max(1, Number(args.parallel || 1));
+const candidates = [args.entry, "src/index.ts", "src/index.tsx", "src/index.js"].filter(Boolean);
+const entryPoint = candidates.map((p) => path.resolve(p)).find((p) => existsSync(p));
+
+const send = (message) => process.stdout.write(JSON.stringify(message) + "\n");
+
+async function main() {
+  if (!entryPoint) {
+    throw new Error(`No se encontró el entry point de Remotion (${candidates.join(", ")})`);
+  }
+
+  const started = Date.now();
+  const serveUrl = await bundle({ entryPoint });
+  if (ensureBrowser) {
+    await ensureBrowser();
+  }
+  const browser = await openBrowser("chrome");
+  send({ type: "ready", bundleMs: Date.now() - started });
+
+  // Cola de trabajos con `parallel` renders simultáneos como máximo
+  const pending = [];
+  const running = new Set();
+  let closing = false;
+  const pump = () => {
+    while (running.size < parallel && pending.length) {
+      const task = render(serveUrl, browser, pending.shift()).finally(() => {
+        running.delete(task);
+        pump();
+      });
+      running.add(task);
+    }
+    if (closing && !pending.length && !running.size) {
+      browser.close({ silent: true }).finally(() => process.exit(0));
+    }
+  };
+  const lines = readline.createInterface({ input: process.stdin });
+
+  lines.on("line", (line) => {
+    let job;
+    try {
+      job = JSON.parse(line);
+    } catch (err) {
+      send({ type: "error", id: null, error: `JSON inválido: ${err.message}` });
+      return;
+    }
+    if (job.type === "shutdown") {
+      lines.close();
+      return;
+    }
+    pending.push(job);
+    pump();
+  });
+
+  lines.on("close", () => {
+    closing = true;
+    pump();
+  });
+}
+
+// Ruta dentro del public/ del bundle; se rechaza cualquier cosa que se salga de él
+function bundleAssetDir(serveUrl, assets) {
+  const root = path.join(serveUrl, "public");
+  const target = path.resolve(root, assets.to);
+  if (!target.startsWith(root + path.sep)) {
+    throw new Error(`Ruta de assets fuera de public/: ${assets.to}`);
+  }
+  return target;
+}
+
+async function render(serveUrl, browser, job) {
+  const started = Date.now();
+  let lastReported = -1;
+  let assetDir = null;
+  try {
+    if (job.assets) {
+      assetDir = bundleAssetDir(serveUrl, job.assets);
+      cpSync(job.assets.from, assetDir, { recursive: true });
+    }
+    const inputProps = job.props || {};
+    const composition = await selectComposition({ serveUrl, id: compositionId, inputProps, puppeteerInstance: browser });
+    await renderMedia({
+      composition,
+      serveUrl,
+      codec: "h264",
+      outputLocation: job.output,
+      inputProps,
+      concurrency: job.concurrency || concurrency,
+      puppeteerInstance: browser,
+      onProgress: ({ progress }) => {
+        // Avisar cada 5% como mucho
+        const step = Math.floor(progress * 20);
+        if (step !== lastReported) {
+          lastReported = step;
+          send({ type: "progress", id: job.id, progress });
+        }
+      },
+    });
+    send({ type: "done", id: job.id, output: job.output, renderMs: Date.now() - started });
+  } catch (err) {
+    send({ type: "error", id: job.id, error: String(err && err.stack ? err.stack : err) });
+  } finally {
+    if (assetDir) {
+      rmSync(assetDir, { recursive: true, force: true });
+    }
+  }
+}
+
+main().catch((err) => {
+  send({ type: "fatal", error: String(err && err.stack ? err.stack : err) });
+  process.exit(1);
+});
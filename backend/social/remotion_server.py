@@ -0,0 +1,163 @@
+"""
+Cliente del worker de render persistente de Remotion (social/remotion/render_worker.mjs).
+
+En lugar de un `npx remotion render` por video (resolver npx + bundle de React +
+arrancar Chrome cada vez), se lanza un proceso Node por ciclo que empaqueta una
+vez y renderiza muchos juegos de props. Se habla con él por stdin/stdout con una
+línea JSON por mensaje; el progreso se devuelve en streaming. render_many envía un
+lote entero de una vez y el worker lo reparte en `parallel` renders simultáneos.
+"""
+import os
+import json
+import queue
+import shutil
+import threading
+import subprocess
+import uuid
+from typing import Callable, Dict, List, Union
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "remotion", "render_worker.mjs")
+
+
+class RemotionServerError(Exception):
+    """El worker no arrancó, murió o devolvió un error de render."""
+
+
+class RemotionRenderServer:
+    def __init__(self, video_dir: str, composition: str = "DealVideo", entry: str = None,
+                 concurrency: int = 2, parallel: int = 1, startup_timeout: float = 300):
+        self.video_dir = video_dir
+        self.composition = composition
+        self.entry = entry
+        self.concurrency = concurrency
+        self.parallel = max(1, parallel)
+        self.startup_timeout = startup_timeout
+        self._process = None
+        self._messages = queue.Queue()
+        # El worker renderiza de uno en uno: serializar las peticiones
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        """Lanza el worker y espera a que termine el bundle (mensaje 'ready')."""
+        if self.running:
+            return
+        node = shutil.which("node")
+        if not node:
+            raise RemotionServerError("node no está instalado")
+
+        cmd = [node, WORKER_SCRIPT, f"--composition={self.composition}",
+               f"--concurrency={self.concurrency}", f"--parallel={self.parallel}"]
+        if self.entry:
+            cmd.append(f"--entry={self.entry}")
+
+        self._messages = queue.Queue()
+        self._process = subprocess.Popen(
+            cmd,
+            cwd=self.video_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        threading.Thread(target=self._read_stdout, args=(self._process, self._messages),
+                         name="remotion-worker-stdout", daemon=True).start()
+
+        message = self._next_message(self.startup_timeout)
+        if message.get("type") != "ready":
+            self.close()
+            raise RemotionServerError(f"El worker no arrancó: {message.get('error', message)}")
+        print(f"   🧩 Remotion worker listo (bundle en {message.get('bundleMs', 0) / 1000:.1f}s)")
+
+    @staticmethod
+    def _read_stdout(process, messages):
+        for line in process.stdout:
+            line = line.strip()
+            if not line.startswith("{"):
+                continue  # salida de Remotion/webpack que no es del protocolo
+            try:
+                messages.put(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        messages.put({"type": "exit", "error": f"worker terminó (exit {process.wait()})"})
+
+    def _next_message(self, timeout: float) -> dict:
+        try:
+            message = self._messages.get(timeout=timeout)
+        except queue.Empty:
+            self.close()
+            raise RemotionServerError(f"Sin respuesta del worker en {timeout:.0f}s")
+        if message.get("type") in ("exit", "fatal"):
+            self._process = None
+            raise RemotionServerError(message.get("error", "worker terminado"))
+        return message
+
+    def render(self, props: dict, output_path: str, timeout: float = 300,
+               on_progress: Callable[[float], None] = None, assets: tuple = None) -> str:
+        """Renderiza un video con las props dadas. Devuelve output_path o lanza RemotionServerError."""
+        progress = (lambda _job_id, value: on_progress(value)) if on_progress else None
+        job = {"props": props, "output": output_path, "assets": assets}
+        result = self.render_many([job], timeout, progress)[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def render_many(self, jobs: List[Dict], timeout: float = 300,
+                    on_progress: Callable[[str, float], None] = None) -> List[Union[str, Exception]]:
+        """
+        Renderiza un lote: jobs = [{"props", "output", "concurrency"?, "id"?, "assets"?}].
+        assets = (carpeta local, ruta relativa a public/): el worker la copia al bundle
+        antes de renderizar, porque el bundle solo tiene el public/ del arranque.
+        Devuelve, en el mismo orden, la ruta de salida o la RemotionServerError de cada
+        trabajo. Si el worker muere a mitad de lote, lanza RemotionServerError.
+        """
+        with self._lock:
+            self.start()
+            ids = []
+            try:
+                for job in jobs:
+                    job_id = job.get("id") or uuid.uuid4().hex[:8]
+                    ids.append(job_id)
+                    message = {"id": job_id, "props": job["props"], "output": job["output"]}
+                    if job.get("concurrency"):
+                        message["concurrency"] = job["concurrency"]
+                    if job.get("assets"):
+                        source, target = job["assets"]
+                        message["assets"] = {"from": os.path.abspath(source), "to": target}
+                    self._process.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+                self._process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self.close()
+                raise RemotionServerError(f"No se pudo enviar el trabajo: {e}")
+
+            results: Dict[str, Union[str, Exception]] = {}
+            outputs = {job_id: job["output"] for job_id, job in zip(ids, jobs)}
+            while len(results) < len(ids):
+                # timeout por mensaje: el progreso llega cada 5%, un silencio largo es un cuelgue
+                message = self._next_message(timeout)
+                job_id = message.get("id")
+                if job_id not in outputs or job_id in results:
+                    continue
+                kind = message.get("type")
+                if kind == "progress" and on_progress:
+                    on_progress(job_id, float(message.get("progress", 0)))
+                elif kind == "done":
+                    results[job_id] = outputs[job_id]
+                elif kind == "error":
+                    results[job_id] = RemotionServerError(message.get("error", "error de render")[-500:])
+            return [results[job_id] for job_id in ids]
+
+    def close(self):
+        process, self._process = self._process, None
+        if not process or process.poll() is not None:
+            return
+        try:
+            process.stdin.write(json.dumps({"type": "shutdown"}) + "\n")
+            process.stdin.flush()
+            process.wait(timeout=15)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
@@ -13,9 +13,9 @@ import sys
 import time
 import base64
 import tempfile
-import subprocess
-import requests
-from typing import Optional, Dict
+import shutil
+from concurrent.futures import Future
+from typing import Optional, Dict, List, Union
 
 # Intentar importar replicate
 try:
@@ -27,6 +27,11 @@ except ImportError:
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from .media_info import media_duration
+from .media_tools import mux_audio
+from .downloader import download_file
+from .job_poller import get_job_poller, PollStatus
+
 
 # Configuración
 REPLICATE_API_TOKEN = os.getenv("REPLICATE_API_TOKEN", "")
@@ -139,12 +144,7 @@ class ReplicateVideoGenerator:
         """Descarga el video generado."""
         try:
             print(f"   📥 Descargando video...")
-            response = requests.get(video_url, timeout=120, stream=True)
-            response.raise_for_status()
-
-            with open(output_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            download_file(video_url, output_path)
 
             file_size = os.path.getsize(output_path)
             print(f"   ✅ Video descargado: {file_size // 1024}KB")
@@ -172,100 +172,35 @@ class ReplicateVideoGenerator:
             return False
 
     def _get_media_duration(self, file_path: str) -> float:
-        """Obtiene la duración de un archivo usando ffprobe."""
-        try:
-            cmd = [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                file_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            return float(result.stdout.strip())
-        except:
-            return 0.0
-
-    def _combine_video_audio(
-        self,
-        video_path: str,
-        audio_path: str,
-        output_path: str
-    ) -> bool:
-        """Combina video y audio con FFmpeg, haciendo loop del video si es necesario."""
-        try:
-            video_duration = self._get_media_duration(video_path)
-            audio_duration = self._get_media_duration(audio_path)
-
-            print(f"   📹 Video: {video_duration:.1f}s, Audio: {audio_duration:.1f}s")
-
-            final_duration = max(audio_duration, 5.0)
-
-            if video_duration < final_duration:
-                loops = int(final_duration / video_duration) + 1
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-stream_loop", str(loops),
-                    "-i", video_path,
-                    "-i", audio_path,
-                    "-c:v", "libx264",
-                    "-c:a", "aac",
-                    "-b:a", "192k",
-                    "-shortest",
-                    "-t", str(final_duration),
-                    "-pix_fmt", "yuv420p",
-                    "-preset", "fast",
-                    output_path
-                ]
-            else:
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-i", video_path,
-                    "-i", audio_path,
-                    "-c:v", "libx264",
-                    "-c:a", "aac",
-                    "-b:a", "192k",
-                    "-shortest",
-                    "-pix_fmt", "yuv420p",
-                    "-preset", "fast",
-                    output_path
-                ]
-
-            print(f"   🔧 Combinando video + audio...")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-
-            if result.returncode != 0:
-                print(f"   ❌ FFmpeg error: {result.stderr[-300:]}")
-                return False
-
-            return True
-
-        except Exception as e:
-            print(f"   ❌ Error combinando: {e}")
-            return False
-
-    def generate_video(
-        self,
-        deal_data: dict,
-        output_path: str,
-        add_audio: bool = True,
-    ) -> Optional[Dict]:
-        """
-        Genera un video animado del producto usando Replicate.
-
-        Args:
-            deal_data: Datos del producto
-            output_path: Ruta de salida
-            add_audio: Si debe añadir audio TTS
-
-        Returns:
-            Dict con información del video si exitoso
-        """
-        if not HAS_REPLICATE:
-            raise Exception("Módulo replicate no instalado")
-
-        if not self.api_token:
-            raise Exception("REPLICATE_API_TOKEN no configurado")
-
+        """Obtiene la duración de un archivo de audio/video leyendo sus cabeceras."""
+        return media_duration(file_path)
+
+    def _build_input(self, image_url: str, prompt: str) -> Dict:
+        """Inputs de la predicción según el modelo."""
+        model_id = self.model_config["id"]
+        if "wan-video" in model_id:
+            # Wan Video models
+            return {
+                "image": image_url,
+                "prompt": prompt,
+                "max_area": "480p",
+                "fast_mode": "Enabled",
+            }
+        if "minimax" in model_id or "video-01" in model_id:
+            # Minimax/Hailuo
+            return {
+                "prompt": prompt,
+                "first_frame_image": image_url,
+            }
+        # Stable Video Diffusion y otros
+        return {
+            "input_image": image_url,
+            "motion_bucket_id": 127,
+            "fps": 7,
+        }
+
+    def _submit(self, deal_data: dict, timeout: int) -> Future:
+        """Crea la predicción (sin esperar) y la registra en el poller compartido."""
         title = deal_data.get("title", "Producto")
         category = deal_data.get("category", "default")
         image_url = deal_data.get("image_url")
@@ -273,61 +208,66 @@ class ReplicateVideoGenerator:
         if not image_url:
             raise Exception("No hay URL de imagen")
 
-        temp_dir = tempfile.mkdtemp(prefix="replicate_")
+        # 1. Generar prompt de animación
+        prompt = self._get_animation_prompt(category, title)
+        print(f"   📝 Prompt: {prompt[:80]}...")
 
+        # 2. Crear la predicción en Replicate (asíncrona: no bloquea hasta el resultado)
+        print(f"   🎬 Generando video con {self.model_config['description']}...")
+        model_id = self.model_config["id"]
+        inputs = self._build_input(image_url, prompt)
+        if ":" in model_id:
+            prediction = replicate.predictions.create(version=model_id.split(":", 1)[1], input=inputs)
+        else:
+            prediction = replicate.models.predictions.create(model=model_id, input=inputs)
+
+        future = get_job_poller().track("Replicate", prediction.id, lambda: self._check_prediction(prediction),
+                                        timeout=timeout, interval=5)
+        future.add_done_callback(lambda done: self._cancel_if_unfinished(prediction, done))
+        return future
+
+    @staticmethod
+    def _cancel_if_unfinished(prediction, future: Future):
+        """Si el seguimiento expira o falla, cancela la predicción: si no, sigue facturando."""
+        if not future.cancelled() and future.exception() is None:
+            return
+        if getattr(prediction, "status", None) in ("succeeded", "failed", "canceled"):
+            return
+        reason = "seguimiento cancelado" if future.cancelled() else future.exception()
         try:
-            # 1. Generar prompt de animación
-            prompt = self._get_animation_prompt(category, title)
-            print(f"   📝 Prompt: {prompt[:80]}...")
-
-            # 2. Llamar a Replicate API
-            print(f"   🎬 Generando video con {self.model_config['description']}...")
-            start_time = time.time()
-
-            # Configurar inputs según el modelo
-            model_id = self.model_config["id"]
-
-            if "wan-video" in model_id:
-                # Wan Video models
-                output = replicate.run(
-                    model_id,
-                    input={
-                        "image": image_url,
-                        "prompt": prompt,
-                        "max_area": "480p",
-                        "fast_mode": "Enabled",
-                    }
-                )
-            elif "minimax" in model_id or "video-01" in model_id:
-                # Minimax/Hailuo
-                output = replicate.run(
-                    model_id,
-                    input={
-                        "prompt": prompt,
-                        "first_frame_image": image_url,
-                    }
-                )
-            else:
-                # Stable Video Diffusion y otros
-                output = replicate.run(
-                    model_id,
-                    input={
-                        "input_image": image_url,
-                        "motion_bucket_id": 127,
-                        "fps": 7,
-                    }
-                )
-
-            elapsed = time.time() - start_time
-            print(f"   ⏱️ Generado en {elapsed:.1f}s")
+            prediction.cancel()
+            print(f"   🛑 Predicción Replicate {prediction.id} cancelada ({reason})")
+        except Exception as e:
+            print(f"   ⚠️ No se pudo cancelar la predicción {prediction.id}: {e}")
+
+    @staticmethod
+    def _check_prediction(prediction) -> PollStatus:
+        """Una consulta del estado de la predicción (la llama el JobPoller)."""
+        try:
+            prediction.reload()
+        except Exception as e:
+            if getattr(e, "status", None) == 429:
+                return PollStatus.throttled()
+            raise
+        if prediction.status == "succeeded":
+            return PollStatus.done(prediction.output)
+        if prediction.status in ("failed", "canceled"):
+            return PollStatus.failed(prediction.error or prediction.status)
+        return PollStatus.pending(prediction.status)
+
+    def _finish(self, deal_data: dict, output, output_path: str, add_audio: bool, audio_path: str) -> Dict:
+        """Pasos 3-5: descargar el video generado y añadirle el audio."""
+        category = deal_data.get("category", "default")
+        temp_dir = tempfile.mkdtemp(prefix="replicate_")
 
+        try:
             # 3. Obtener URL del video
             if isinstance(output, list):
                 video_url = output[0] if output else None
             elif hasattr(output, 'url'):
                 video_url = output.url
             else:
-                video_url = str(output)
+                video_url = str(output) if output else None
 
             if not video_url:
                 raise Exception("No se obtuvo URL de video")
@@ -339,23 +279,23 @@ class ReplicateVideoGenerator:
 
             # 5. Añadir audio TTS si se solicita
             if add_audio:
-                dialogue = self._get_dialogue(category)
-                audio_path = os.path.join(temp_dir, "audio.mp3")
+                if not audio_path:
+                    dialogue = self._get_dialogue(category)
+                    audio_path = os.path.join(temp_dir, "audio.mp3")
+                    if not self._generate_tts_audio(dialogue, audio_path):
+                        audio_path = None
 
-                if self._generate_tts_audio(dialogue, audio_path):
+                if audio_path:
                     # Combinar video + audio
-                    if self._combine_video_audio(raw_video_path, audio_path, output_path):
+                    if mux_audio(raw_video_path, audio_path, output_path):
                         final_size = os.path.getsize(output_path)
                         print(f"   ✅ Video final con audio: {final_size // 1024}KB")
                     else:
                         # Si falla la combinación, usar video sin audio
-                        import shutil
                         shutil.copy(raw_video_path, output_path)
                 else:
-                    import shutil
                     shutil.copy(raw_video_path, output_path)
             else:
-                import shutil
                 shutil.copy(raw_video_path, output_path)
 
             return {
@@ -367,11 +307,68 @@ class ReplicateVideoGenerator:
 
         finally:
             # Limpiar archivos temporales
-            import shutil
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _check_ready(self):
+        if not HAS_REPLICATE:
+            raise Exception("Módulo replicate no instalado")
+
+        if not self.api_token:
+            raise Exception("REPLICATE_API_TOKEN no configurado")
+
+    def generate_video(
+        self,
+        deal_data: dict,
+        output_path: str,
+        add_audio: bool = True,
+        audio_path: str = None,
+        timeout: int = 600,
+    ) -> Optional[Dict]:
+        """
+        Genera un video animado del producto usando Replicate.
+
+        Args:
+            deal_data: Datos del producto
+            output_path: Ruta de salida
+            add_audio: Si debe añadir audio TTS
+            audio_path: Audio TTS ya generado (se reutiliza en vez de sintetizar otro)
+            timeout: Tiempo máximo de espera de la predicción en segundos
+
+        Returns:
+            Dict con información del video si exitoso
+        """
+        self._check_ready()
+        start_time = time.time()
+        output = self._submit(deal_data, timeout).result()
+        print(f"   ⏱️ Generado en {time.time() - start_time:.1f}s")
+        return self._finish(deal_data, output, output_path, add_audio, audio_path)
+
+    def generate_videos(self, jobs: List[Dict], add_audio: bool = True,
+                        timeout: int = 600) -> List[Union[Dict, Exception]]:
+        """
+        Genera un lote: jobs = [{"deal_data", "output_path", "audio_path"?}].
+        Crea todas las predicciones primero y las espera a la vez con el poller
+        compartido, así el lote tarda lo que la más lenta. Devuelve, en el mismo
+        orden, el dict de resultado o la excepción de cada trabajo.
+        """
+        self._check_ready()
+        futures = []
+        for job in jobs:
+            try:
+                futures.append(self._submit(job["deal_data"], timeout))
+            except Exception as e:
+                futures.append(e)
+
+        results = []
+        for job, future in zip(jobs, futures):
             try:
-                shutil.rmtree(temp_dir)
-            except:
-                pass
+                if isinstance(future, Exception):
+                    raise future
+                results.append(self._finish(job["deal_data"], future.result(), job["output_path"],
+                                            add_audio, job.get("audio_path")))
+            except Exception as e:
+                results.append(e)
+        return results
 
     def is_available(self) -> bool:
         """Verifica si el generador está disponible."""
@@ -7,14 +7,17 @@ que hablan directamente al espectador, estilo TikTok viral.
 
 import os
 import sys
-import time
-import base64
 import requests
-from typing import Optional, Dict
+from concurrent.futures import Future
+from typing import Optional, Dict, List, Union
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import get_google_ai_key
 
+from .image_store import get_image_store
+from .downloader import download_file
+from .job_poller import get_job_poller, JobFailed, PollStatus
+
 
 # Configuración de Runway ML
 RUNWAY_API_KEY = os.getenv("RUNWAY_API_KEY", "")
@@ -116,27 +119,9 @@ TONO: Carismático, urgente, convincente. Como un vendedor entusiasta que REALME
         return prompt
 
     def _download_image_as_base64(self, image_url: str) -> Optional[str]:
-        """Descarga una imagen y la convierte a base64 data URI."""
+        """Imagen como base64 data URI (descarga y codificación cacheadas por URL)."""
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-            }
-            response = requests.get(image_url, headers=headers, timeout=30)
-            response.raise_for_status()
-
-            # Detectar tipo de imagen
-            content_type = response.headers.get("Content-Type", "image/jpeg")
-            if "png" in content_type:
-                mime_type = "image/png"
-            elif "webp" in content_type:
-                mime_type = "image/webp"
-            else:
-                mime_type = "image/jpeg"
-
-            # Convertir a base64
-            base64_data = base64.b64encode(response.content).decode("utf-8")
-            return f"data:{mime_type};base64,{base64_data}"
-
+            return get_image_store().data_uri(image_url)
         except Exception as e:
             print(f"   ⚠️ Error descargando imagen: {e}")
             return None
@@ -179,6 +164,29 @@ TONO: Carismático, urgente, convincente. Como un vendedor entusiasta que REALME
             print(f"   ❌ Error creando tarea Runway: {e}")
             return None
 
+    def _check_task(self, task_id: str) -> PollStatus:
+        """Una consulta del estado de la tarea (la llama el JobPoller)."""
+        response = requests.get(f"{RUNWAY_BASE_URL}/tasks/{task_id}", headers=self.headers, timeout=30)
+        if response.status_code == 429:
+            return PollStatus.throttled(float(response.headers.get("Retry-After") or 0) or None)
+        if response.status_code != 200:
+            return PollStatus.pending(f"HTTP {response.status_code}")
+
+        data = response.json()
+        status = data.get("status", "UNKNOWN")
+        if status == "SUCCEEDED":
+            return PollStatus.done(data)
+        if status == "FAILED":
+            return PollStatus.failed(data.get("error", "Unknown error"))
+        if status == "THROTTLED":
+            return PollStatus.throttled()
+        return PollStatus.pending(status)
+
+    def _track_task(self, task_id: str, timeout: int = 300, poll_interval: int = 10) -> Future:
+        """Registra la tarea en el poller compartido; el Future devuelve sus datos finales."""
+        return get_job_poller().track("Runway", task_id, lambda: self._check_task(task_id),
+                                      timeout=timeout, interval=poll_interval)
+
     def _poll_task_status(
         self, task_id: str, timeout: int = 300, poll_interval: int = 10
     ) -> Optional[Dict]:
@@ -188,65 +196,23 @@ TONO: Carismático, urgente, convincente. Como un vendedor entusiasta que REALME
         Args:
             task_id: ID de la tarea
             timeout: Tiempo máximo de espera en segundos
-            poll_interval: Intervalo entre consultas en segundos
+            poll_interval: Intervalo inicial entre consultas en segundos
 
         Returns:
             Diccionario con resultado si completó, None si falló/timeout
         """
-        endpoint = f"{RUNWAY_BASE_URL}/tasks/{task_id}"
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            try:
-                response = requests.get(endpoint, headers=self.headers, timeout=30)
-
-                if response.status_code != 200:
-                    print(f"   ⚠️ Error consultando tarea: {response.status_code}")
-                    time.sleep(poll_interval)
-                    continue
-
-                data = response.json()
-                status = data.get("status", "UNKNOWN")
-
-                if status == "SUCCEEDED":
-                    print(f"   ✅ Video Runway generado exitosamente")
-                    return data
-
-                elif status == "FAILED":
-                    error = data.get("error", "Unknown error")
-                    print(f"   ❌ Tarea Runway falló: {error}")
-                    return None
-
-                elif status == "THROTTLED":
-                    print(f"   ⚠️ Tarea throttled, reintentando...")
-                    time.sleep(poll_interval * 2)
-
-                elif status in ["PENDING", "RUNNING"]:
-                    elapsed = int(time.time() - start_time)
-                    print(f"   ⏳ Runway {status}... ({elapsed}s)")
-                    time.sleep(poll_interval)
-
-                else:
-                    print(f"   ⚠️ Estado desconocido: {status}")
-                    time.sleep(poll_interval)
-
-            except Exception as e:
-                print(f"   ⚠️ Error polling: {e}")
-                time.sleep(poll_interval)
-
-        print(f"   ❌ Timeout esperando video Runway ({timeout}s)")
-        return None
+        try:
+            data = self._track_task(task_id, timeout, poll_interval).result()
+            print(f"   ✅ Video Runway generado exitosamente")
+            return data
+        except JobFailed as e:
+            print(f"   ❌ Tarea Runway no completó: {e}")
+            return None
 
     def _download_video(self, video_url: str, output_path: str) -> bool:
         """Descarga el video generado."""
         try:
-            response = requests.get(video_url, timeout=120)
-            response.raise_for_status()
-
-            with open(output_path, "wb") as f:
-                f.write(response.content)
-
-            file_size = os.path.getsize(output_path)
+            file_size = download_file(video_url, output_path)
             print(f"   📥 Video descargado: {output_path} ({file_size // 1024}KB)")
             return True
 
@@ -280,6 +246,17 @@ TONO: Carismático, urgente, convincente. Como un vendedor entusiasta que REALME
         if not self.api_key:
             raise Exception("RUNWAY_API_KEY no configurada")
 
+        task_id = self._submit_task(deal_data, dialogue, image_url, duration)
+
+        # 4. Esperar resultado
+        result = self._poll_task_status(task_id, timeout)
+        if not result:
+            raise Exception("La tarea de Runway no completó")
+
+        return self._finish_task(task_id, result, output_path, duration)
+
+    def _submit_task(self, deal_data: dict, dialogue: str, image_url: str, duration: int) -> str:
+        """Pasos 1-3: imagen, prompt y creación de la tarea. Devuelve el task_id."""
         # 1. Descargar imagen como base64
         print(f"   📷 Procesando imagen para Runway...")
         image_data = self._download_image_as_base64(image_url)
@@ -294,13 +271,10 @@ TONO: Carismático, urgente, convincente. Como un vendedor entusiasta que REALME
         task_id = self._create_video_task(prompt, image_data, duration)
         if not task_id:
             raise Exception("No se pudo crear la tarea en Runway")
+        return task_id
 
-        # 4. Esperar resultado
-        result = self._poll_task_status(task_id, timeout)
-        if not result:
-            raise Exception("La tarea de Runway no completó")
-
-        # 5. Descargar video
+    def _finish_task(self, task_id: str, result: Dict, output_path: str, duration: int) -> Dict:
+        """Paso 5: descargar el video de una tarea terminada."""
         output_data = result.get("output", [])
         if not output_data:
             raise Exception("No hay video en el resultado")
@@ -316,6 +290,35 @@ TONO: Carismático, urgente, convincente. Como un vendedor entusiasta que REALME
             "status": "success",
         }
 
+    def generate_videos(self, jobs: List[Dict], duration: int = 5, timeout: int = 300) -> List[Union[Dict, Exception]]:
+        """
+        Genera un lote: jobs = [{"deal_data", "dialogue", "image_url", "output_path"}].
+        Crea todas las tareas primero y las espera a la vez con el poller compartido,
+        así el lote tarda lo que la más lenta. Devuelve, en el mismo orden, el dict
+        de resultado o la excepción de cada trabajo.
+        """
+        if not self.api_key:
+            raise Exception("RUNWAY_API_KEY no configurada")
+
+        pending = []
+        for job in jobs:
+            try:
+                task_id = self._submit_task(job["deal_data"], job["dialogue"], job["image_url"], duration)
+                pending.append((task_id, self._track_task(task_id, timeout)))
+            except Exception as e:
+                pending.append((None, e))
+
+        results = []
+        for job, (task_id, future) in zip(jobs, pending):
+            if isinstance(future, Exception):
+                results.append(future)
+                continue
+            try:
+                results.append(self._finish_task(task_id, future.result(), job["output_path"], duration))
+            except Exception as e:
+                results.append(e)
+        return results
+
 
 def generate_product_dialogue_for_runway(deal_data: dict) -> str:
     """
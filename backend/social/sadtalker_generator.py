@@ -8,10 +8,10 @@ Basado en: https://huggingface.co/spaces/vinthony/SadTalker
 """
 import os
 import time
-import tempfile
-import requests
 from pathlib import Path
 
+from .image_store import get_image_store
+
 try:
     from gradio_client import Client, handle_file
     HAS_GRADIO = True
@@ -185,24 +185,9 @@ class SadTalkerGenerator:
             print("   ❌ No hay URL de imagen en deal_data")
             return False
 
-        temp_dir = temp_dir or tempfile.gettempdir()
-        image_path = os.path.join(temp_dir, "sadtalker_input.jpg")
-
-        # Descargar imagen
+        # Descargar imagen (caché compartida: el resto de generadores ya la pudo bajar)
         try:
-            print(f"   📥 Descargando imagen: {image_url[:60]}...")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                              'AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36',
-            }
-            resp = requests.get(image_url, headers=headers, timeout=30)
-            resp.raise_for_status()
-
-            with open(image_path, 'wb') as f:
-                f.write(resp.content)
-
-            print(f"   📷 Imagen descargada: {len(resp.content) // 1024}KB")
-
+            image_path = get_image_store().fetch(image_url)
         except Exception as e:
             print(f"   ❌ Error descargando imagen: {e}")
             return False
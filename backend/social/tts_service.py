@@ -1,9 +1,20 @@
 """
 Servicio de Text-to-Speech para generar audio de voz para videos.
 Soporta múltiples backends: Edge TTS (alta calidad) y gTTS (fallback gratuito).
+
+Edge TTS es asíncrono: todas las síntesis corren en un único event loop persistente
+(hilo daemon), así que un lote de ofertas se sintetiza en paralelo bajo un semáforo
+en vez de crear y destruir un loop por frase.
 """
 import os
 import asyncio
+import threading
+from typing import List, Tuple
+
+from .media_info import media_duration
+
+# edge-tts expresa offset/duración de los eventos en ticks de 100 ns
+_TICKS_PER_SECOND = 10_000_000
 
 
 class TTSService:
@@ -29,13 +40,68 @@ class TTSService:
         self.backend = backend
         self.rate = "+10%"
         self.pitch = "+0Hz"
+        # Peticiones Edge TTS simultáneas como máximo (synthesize_many)
+        self.max_concurrency = max(1, int(os.getenv("TTS_CONCURRENCY", "4")))
+
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        self._semaphore = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop persistente en un hilo daemon (se crea en el primer uso)."""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="tts-loop", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _run(self, coro):
+        """Ejecuta una corrutina en el loop persistente y espera su resultado."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+
+    def close(self):
+        """Detiene el loop persistente (se recrea solo si se vuelve a usar)."""
+        with self._loop_lock:
+            if self._loop and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop_thread.join(timeout=5)
+                self._loop.close()
+            self._loop = None
+            self._semaphore = None
 
-    async def _synthesize_edge(self, text: str, output_path: str) -> dict:
+    async def _synthesize_edge(self, text: str, output_path: str, rate: str = None, pitch: str = None) -> dict:
         """Genera audio usando Edge TTS (alta calidad, voces neurales)."""
         import edge_tts
 
-        communicate = edge_tts.Communicate(text, self.voice, rate=self.rate, pitch=self.pitch)
-        await communicate.save(output_path)
+        # El semáforo pertenece al loop persistente: se crea dentro de él
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        kwargs = {"rate": rate or self.rate, "pitch": pitch or self.pitch}
+        try:
+            # edge-tts >= 7 solo emite SentenceBoundary salvo que se pidan palabras
+            communicate = edge_tts.Communicate(text, self.voice, boundary="WordBoundary", **kwargs)
+        except TypeError:
+            communicate = edge_tts.Communicate(text, self.voice, **kwargs)
+
+        # stream() en vez de save(): además del audio captura los límites de palabra
+        word_boundaries = []
+        async with self._semaphore:
+            with open(output_path, "wb") as f:
+                async for chunk in communicate.stream():
+                    if chunk["type"] == "audio":
+                        f.write(chunk["data"])
+                    elif chunk["type"] == "WordBoundary":
+                        start = chunk["offset"] / _TICKS_PER_SECOND
+                        word_boundaries.append({
+                            "text": chunk["text"],
+                            "start": round(start, 3),
+                            "end": round(start + chunk["duration"] / _TICKS_PER_SECOND, 3),
+                        })
 
         if not os.path.exists(output_path):
             raise Exception("El archivo de audio no se creó")
@@ -47,7 +113,8 @@ class TTSService:
         return {
             "file_path": output_path,
             "file_size": file_size,
-            "duration_seconds": self._estimate_duration(text),
+            "duration_seconds": self._measure_duration(output_path, text, rate),
+            "word_boundaries": word_boundaries,
             "voice": self.voice,
             "backend": "edge-tts",
             "text": text,
@@ -78,7 +145,8 @@ class TTSService:
         return {
             "file_path": output_path,
             "file_size": file_size,
-            "duration_seconds": self._estimate_duration(text),
+            "duration_seconds": self._measure_duration(output_path, text),
+            "word_boundaries": [],
             "voice": f"gtts-{lang}-{tld}",
             "backend": "gtts",
             "text": text,
@@ -110,14 +178,44 @@ class TTSService:
         else:  # auto
             return self._try_auto(text, output_path)
 
+    async def synthesize_async(self, text: str, output_path: str, rate: str = None, pitch: str = None) -> dict:
+        """
+        Versión asíncrona de synthesize, pensada para el loop persistente del servicio
+        (synthesize_batch): el semáforo de concurrencia vive en ese loop. rate/pitch se
+        aplican solo a esta llamada. gTTS, que es bloqueante, va a un hilo aparte.
+        """
+        if self.backend == "gtts":
+            return await asyncio.to_thread(self._try_gtts, text, output_path)
+
+        try:
+            result = await self._synthesize_edge(text, output_path, rate, pitch)
+            print(f"   🔊 Audio TTS generado (Edge): {output_path} ({result['file_size'] // 1024}KB)")
+            return result
+        except Exception as e:
+            if self.backend == "edge":
+                raise
+            print(f"   ⚠️ Edge TTS falló ({e}), usando gTTS como fallback...")
+            return await asyncio.to_thread(self._try_gtts, text, output_path)
+
+    async def synthesize_many(self, items: List[Tuple[str, str]]) -> list:
+        """
+        Sintetiza varios (texto, ruta) a la vez, como máximo max_concurrency en vuelo.
+        Devuelve, en el mismo orden, el dict de cada audio o la excepción si falló.
+        """
+        return await asyncio.gather(
+            *(self.synthesize_async(text, path) for text, path in items),
+            return_exceptions=True,
+        )
+
+    def synthesize_batch(self, items: List[Tuple[str, str]]) -> list:
+        """Envoltorio síncrono de synthesize_many sobre el loop persistente."""
+        if not items:
+            return []
+        return self._run(self.synthesize_many(items))
+
     def _try_edge(self, text: str, output_path: str) -> dict:
         """Intenta usar Edge TTS."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._synthesize_edge(text, output_path))
-        finally:
-            loop.close()
+        return self._run(self._synthesize_edge(text, output_path))
 
     def _try_gtts(self, text: str, output_path: str) -> dict:
         """Intenta usar gTTS."""
@@ -135,22 +233,27 @@ class TTSService:
             print(f"   ⚠️ Edge TTS falló ({e}), usando gTTS como fallback...")
             return self._try_gtts(text, output_path)
 
-    def _estimate_duration(self, text: str) -> float:
+    def _measure_duration(self, output_path: str, text: str, rate: str = None) -> float:
+        """Duración real leída de los frames del MP3; la estimación solo si no se puede leer."""
+        return media_duration(output_path) or self._estimate_duration(text, rate)
+
+    def _estimate_duration(self, text: str, rate: str = None) -> float:
         """
-        Estima la duración del audio basándose en el texto.
+        Estima la duración del audio basándose en el texto (último recurso).
         Aproximación: ~150 palabras por minuto en español.
         """
+        rate = rate or self.rate
         words = len(text.split())
         rate_modifier = 1.0
-        if self.rate and self.rate.startswith("+"):
+        if rate and rate.startswith("+"):
             try:
-                percent = int(self.rate.replace("+", "").replace("%", ""))
+                percent = int(rate.replace("+", "").replace("%", ""))
                 rate_modifier = 1 - (percent / 100)
             except ValueError:
                 pass
-        elif self.rate and self.rate.startswith("-"):
+        elif rate and rate.startswith("-"):
             try:
-                percent = int(self.rate.replace("-", "").replace("%", ""))
+                percent = int(rate.replace("-", "").replace("%", ""))
                 rate_modifier = 1 + (percent / 100)
             except ValueError:
                 pass
@@ -3,10 +3,14 @@ Generador de videos AI usando Google Veo 3.1.
 Crea animaciones 3D donde el producto cobra vida y habla al espectador.
 """
 import os
-import time
 import base64
 import requests
-from typing import Optional, Dict
+from concurrent.futures import Future
+from typing import Optional, Dict, List
+
+from .downloader import download_file
+from .image_store import get_image_store
+from .job_poller import get_job_poller, JobTimeout, PollStatus
 
 # Plantillas de escenas por categoría de producto
 SCENE_TEMPLATES = {
@@ -100,48 +104,16 @@ IMPORTANTE:
         with open(image_path, "rb") as f:
             return base64.b64encode(f.read()).decode("utf-8")
 
-    def _download_image(self, url: str, dest_path: str) -> str:
-        """Descarga una imagen de URL."""
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        resp = requests.get(url, headers=headers, timeout=30)
-        resp.raise_for_status()
-        with open(dest_path, 'wb') as f:
-            f.write(resp.content)
-        return dest_path
-
-    def generate_video(
-        self,
-        deal_data: dict,
-        dialogue: str,
-        image_path: str,
-        output_path: str,
-        timeout: int = 300,
-    ) -> Optional[Dict]:
-        """
-        Genera un video animado donde el producto habla.
-
-        Args:
-            deal_data: Datos del producto (title, category, price, etc.)
-            dialogue: El texto que el producto "dice"
-            image_path: Ruta a la imagen del producto (local o URL)
-            output_path: Donde guardar el video generado
-            timeout: Tiempo máximo de espera en segundos
-
-        Returns:
-            dict con información del video generado o None si falla
-        """
-        if not self.api_key:
-            print("   ⚠️ GOOGLE_AI_API_KEY no configurada para Veo")
-            return None
+    def _download_image(self, url: str) -> str:
+        """Ruta local de la imagen (caché compartida de imágenes de producto)."""
+        return get_image_store().fetch(url)
 
+    def _start_operation(self, deal_data: dict, dialogue: str, image_path: str) -> Optional[str]:
+        """Prepara la imagen y lanza la operación de larga duración. Devuelve su nombre."""
         # Preparar imagen
         if image_path.startswith("http"):
-            temp_image = "/tmp/veo_product_image.jpg"
             try:
-                self._download_image(image_path, temp_image)
-                image_path = temp_image
+                image_path = self._download_image(image_path)
             except Exception as e:
                 print(f"   ⚠️ Error descargando imagen: {e}")
                 return None
@@ -158,121 +130,156 @@ IMPORTANTE:
         print(f"   🎬 Generando video con Veo 3.1...")
         print(f"   📝 Prompt: {prompt[:100]}...")
 
-        # Llamar a la API
-        try:
-            # Iniciar generación (operación de larga duración)
-            response = requests.post(
-                f"{self.base_url}/models/{self.model}:predictLongRunning",
-                params={"key": self.api_key},
-                json={
-                    "instances": [{
-                        "prompt": prompt,
-                        "image": {
-                            "bytesBase64Encoded": image_b64,
-                        },
-                    }],
-                    "parameters": {
-                        "aspectRatio": "9:16",
-                        "sampleCount": 1,
+        # Iniciar generación (operación de larga duración)
+        response = requests.post(
+            f"{self.base_url}/models/{self.model}:predictLongRunning",
+            params={"key": self.api_key},
+            json={
+                "instances": [{
+                    "prompt": prompt,
+                    "image": {
+                        "bytesBase64Encoded": image_b64,
                     },
+                }],
+                "parameters": {
+                    "aspectRatio": "9:16",
+                    "sampleCount": 1,
                 },
-                timeout=60,
-            )
+            },
+            timeout=60,
+        )
 
-            if response.status_code != 200:
-                print(f"   ⚠️ Error Veo API ({response.status_code}): {response.text[:200]}")
-                return None
+        if response.status_code != 200:
+            print(f"   ⚠️ Error Veo API ({response.status_code}): {response.text[:200]}")
+            return None
 
-            operation = response.json()
-            operation_name = operation.get("name")
+        operation = response.json()
+        operation_name = operation.get("name")
 
-            if not operation_name:
-                print(f"   ⚠️ No se obtuvo operation name: {operation}")
-                return None
+        if not operation_name:
+            print(f"   ⚠️ No se obtuvo operation name: {operation}")
+            return None
 
-            print(f"   ⏳ Operación iniciada: {operation_name}")
-
-            # Polling hasta que termine
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                # Verificar estado
-                status_resp = requests.get(
-                    f"{self.base_url}/{operation_name}",
-                    params={"key": self.api_key},
-                    timeout=30,
-                )
-
-                if status_resp.status_code != 200:
-                    print(f"   ⚠️ Error verificando estado: {status_resp.text[:100]}")
-                    time.sleep(10)
-                    continue
-
-                status = status_resp.json()
-
-                if status.get("done"):
-                    # Operación completada
-                    if "error" in status:
-                        print(f"   ❌ Error en generación: {status['error']}")
-                        return None
-
-                    # Extraer video
-                    result = status.get("response", {})
-                    videos = result.get("generatedVideos", [])
-
-                    if not videos:
-                        print("   ⚠️ No se generaron videos")
-                        return None
-
-                    video_data = videos[0]
-                    video_uri = video_data.get("video", {}).get("uri")
-
-                    if video_uri:
-                        # Descargar video
-                        video_resp = requests.get(video_uri, timeout=60)
-                        with open(output_path, "wb") as f:
-                            f.write(video_resp.content)
-
-                        file_size = os.path.getsize(output_path)
-                        print(f"   ✅ Video Veo generado: {output_path} ({file_size // 1024}KB)")
-
-                        return {
-                            "path": output_path,
-                            "size": file_size,
-                            "duration_seconds": 8,
-                            "source": "veo-3.1",
-                        }
-
-                    # Si hay bytes directos
-                    video_bytes = video_data.get("video", {}).get("bytesBase64Encoded")
-                    if video_bytes:
-                        with open(output_path, "wb") as f:
-                            f.write(base64.b64decode(video_bytes))
-
-                        file_size = os.path.getsize(output_path)
-                        print(f"   ✅ Video Veo generado: {output_path} ({file_size // 1024}KB)")
-
-                        return {
-                            "path": output_path,
-                            "size": file_size,
-                            "duration_seconds": 8,
-                            "source": "veo-3.1",
-                        }
-
-                    print("   ⚠️ No se encontró video en la respuesta")
-                    return None
-
-                # Aún procesando
-                elapsed = int(time.time() - start_time)
-                print(f"   ⏳ Generando video... ({elapsed}s)")
-                time.sleep(10)
-
-            print(f"   ⚠️ Timeout después de {timeout}s")
+        print(f"   ⏳ Operación iniciada: {operation_name}")
+        return operation_name
+
+    def _check_operation(self, operation_name: str) -> PollStatus:
+        """Una consulta del estado de la operación (la llama el JobPoller)."""
+        status_resp = requests.get(
+            f"{self.base_url}/{operation_name}",
+            params={"key": self.api_key},
+            timeout=30,
+        )
+        if status_resp.status_code == 429:
+            return PollStatus.throttled(float(status_resp.headers.get("Retry-After") or 0) or None)
+        if status_resp.status_code != 200:
+            print(f"   ⚠️ Error verificando estado: {status_resp.text[:100]}")
+            return PollStatus.pending(f"HTTP {status_resp.status_code}")
+
+        status = status_resp.json()
+        if not status.get("done"):
+            return PollStatus.pending("generando video")
+        if "error" in status:
+            return PollStatus.failed(status["error"])
+        return PollStatus.done(status)
+
+    def _track_operation(self, operation_name: str, timeout: int = 300) -> Future:
+        """Registra la operación en el poller compartido (un solo loop para todos los videos)."""
+        return get_job_poller().track("Veo", operation_name, lambda: self._check_operation(operation_name),
+                                      timeout=timeout, interval=10)
+
+    def _save_video(self, status: dict, output_path: str) -> Optional[Dict]:
+        """Guarda el video de una operación terminada."""
+        # Extraer video
+        result = status.get("response", {})
+        videos = result.get("generatedVideos", [])
+
+        if not videos:
+            print("   ⚠️ No se generaron videos")
             return None
 
-        except Exception as e:
-            print(f"   ⚠️ Error generando video Veo: {e}")
+        video = videos[0].get("video", {})
+        if video.get("uri"):
+            # Descargar video (en streaming, reanudable)
+            download_file(video["uri"], output_path, timeout=60)
+        elif video.get("bytesBase64Encoded"):
+            # Si hay bytes directos
+            with open(output_path, "wb") as f:
+                f.write(base64.b64decode(video["bytesBase64Encoded"]))
+        else:
+            print("   ⚠️ No se encontró video en la respuesta")
             return None
 
+        file_size = os.path.getsize(output_path)
+        print(f"   ✅ Video Veo generado: {output_path} ({file_size // 1024}KB)")
+
+        return {
+            "path": output_path,
+            "size": file_size,
+            "duration_seconds": 8,
+            "source": "veo-3.1",
+        }
+
+    def generate_video(
+        self,
+        deal_data: dict,
+        dialogue: str,
+        image_path: str,
+        output_path: str,
+        timeout: int = 300,
+    ) -> Optional[Dict]:
+        """
+        Genera un video animado donde el producto habla.
+
+        Args:
+            deal_data: Datos del producto (title, category, price, etc.)
+            dialogue: El texto que el producto "dice"
+            image_path: Ruta a la imagen del producto (local o URL)
+            output_path: Donde guardar el video generado
+            timeout: Tiempo máximo de espera en segundos
+
+        Returns:
+            dict con información del video generado o None si falla
+        """
+        return self.generate_videos([{
+            "deal_data": deal_data,
+            "dialogue": dialogue,
+            "image_path": image_path,
+            "output_path": output_path,
+        }], timeout)[0]
+
+    def generate_videos(self, jobs: List[Dict], timeout: int = 300) -> List[Optional[Dict]]:
+        """
+        Genera un lote: jobs = [{"deal_data", "dialogue", "image_path", "output_path"}].
+        Lanza todas las operaciones y las espera a la vez con el poller compartido,
+        así el lote tarda lo que la más lenta. Devuelve, en el mismo orden, el dict
+        del video o None si ese trabajo falló.
+        """
+        if not self.api_key:
+            print("   ⚠️ GOOGLE_AI_API_KEY no configurada para Veo")
+            return [None] * len(jobs)
+
+        futures = []
+        for job in jobs:
+            try:
+                name = self._start_operation(job["deal_data"], job["dialogue"], job["image_path"])
+                futures.append(self._track_operation(name, timeout) if name else None)
+            except Exception as e:
+                print(f"   ⚠️ Error generando video Veo: {e}")
+                futures.append(None)
+
+        results = []
+        for job, future in zip(jobs, futures):
+            try:
+                results.append(self._save_video(future.result(), job["output_path"]) if future else None)
+            except JobTimeout:
+                print(f"   ⚠️ Timeout después de {timeout}s")
+                results.append(None)
+            except Exception as e:
+                print(f"   ⚠️ Error generando video Veo: {e}")
+                results.append(None)
+        return results
+
 
 def generate_product_dialogue_for_veo(deal_data: dict) -> str:
     """
@@ -0,0 +1,129 @@
+"""
+Caché de videos ya renderizados, direccionada por el contenido de la oferta.
+
+Las mismas ofertas vuelven ciclo tras ciclo. Si el título, el precio, el descuento,
+la imagen y el diálogo no han cambiado, el video sería idéntico: se guarda una copia
+del MP4 final con clave sha256(campos de la oferta usados al renderizar + guion +
+voz + generador + versión de plantilla) y el siguiente ciclo pasa directo a subir.
+
+Cada entrada es <clave>.mp4 más <clave>.json con los metadatos (generador, título,
+tamaño, fecha). El tamaño total se limita con expulsión LRU (mtime del MP4).
+Cambiar la plantilla de Remotion o los prompts de los generadores => subir
+VIDEO_CACHE_VERSION para invalidar todo.
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from typing import Iterable, Optional, Tuple
+
+VIDEO_CACHE_VERSION = "1"
+
+# backend/temp_assets/video_cache, sea cual sea el directorio de trabajo
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "temp_assets", "video_cache")
+
+# Campos de la oferta que cambian el video (texto en pantalla, imagen, enlace)
+_RENDER_FIELDS = ("title", "marketing_title", "price", "original_price", "discount",
+                  "image_url", "affiliate_url", "category")
+
+
+class VideoCache:
+    def __init__(self, cache_dir: str = None, max_mb: float = None):
+        self.cache_dir = cache_dir or os.getenv("VIDEO_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = int(float(max_mb if max_mb is not None else os.getenv("VIDEO_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+        self.enabled = os.getenv("VIDEO_CACHE_ENABLED", "true").lower() == "true" and self.max_bytes > 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(deal_data: dict, generator: str, script: str = "", voice: str = "") -> str:
+        """Clave direccionada por contenido: hash de todo lo que influye en el video."""
+        fields = {name: deal_data.get(name) for name in _RENDER_FIELDS}
+        if not fields["affiliate_url"]:
+            fields["affiliate_url"] = deal_data.get("url")
+        payload = json.dumps([VIDEO_CACHE_VERSION, generator, fields, script or "", voice or ""],
+                             sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.mp4", f"{base}.json"
+
+    def lookup(self, deal_data: dict, generators: Iterable[str], script: str = "",
+               voice: str = "") -> Optional[Tuple[str, str]]:
+        """(generador, ruta) del primer video en caché según el orden dado, o None."""
+        if not self.enabled:
+            return None
+        for generator in generators:
+            path, _ = self._paths(self.key(deal_data, generator, script, voice))
+            if os.path.exists(path):
+                try:
+                    os.utime(path)  # el mtime marca el último uso para la expulsión LRU
+                except OSError:
+                    continue
+                self.hits += 1
+                return generator, path
+        self.misses += 1
+        return None
+
+    def put(self, deal_data: dict, generator: str, video_path: str, script: str = "",
+            voice: str = "") -> Optional[str]:
+        """Guarda una copia del video renderizado. Devuelve la ruta en caché o None."""
+        if not self.enabled or not video_path or not os.path.exists(video_path):
+            return None
+        key = self.key(deal_data, generator, script, voice)
+        path, meta_path = self._paths(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            shutil.copyfile(video_path, tmp_path)
+            os.replace(tmp_path, path)
+            meta = {
+                "generator": generator,
+                "title": (deal_data.get("marketing_title") or deal_data.get("title") or "")[:120],
+                "deal_id": deal_data.get("id") or deal_data.get("asin"),
+                "size": os.path.getsize(path),
+                "created_at": time.time(),
+                "version": VIDEO_CACHE_VERSION,
+            }
+            meta_tmp = f"{meta_path}.{threading.get_ident()}.tmp"
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(meta_tmp, meta_path)
+        except OSError as e:
+            print(f"   ⚠️ No se pudo guardar el video en caché: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        self._prune()
+        return path
+
+    def _prune(self):
+        """Expulsa los videos usados hace más tiempo hasta quedar bajo max_bytes."""
+        with self._lock:
+            try:
+                entries = []
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith(".mp4"):
+                        stat = os.stat(os.path.join(self.cache_dir, name))
+                        entries.append((stat.st_mtime, stat.st_size, name))
+            except OSError:
+                return
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                for path in self._paths(name[:-len(".mp4")]):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -9,9 +9,12 @@ Basado en: https://huggingface.co/spaces/Wan-AI/Wan2.2-Animate
 import os
 import time
 import tempfile
-import requests
 from pathlib import Path
 
+from .media_tools import mux_audio
+from .downloader import download_file
+from .image_store import get_image_store
+
 try:
     from gradio_client import Client, handle_file
     HAS_GRADIO = True
@@ -96,13 +99,10 @@ class WanAnimateGenerator:
 
         try:
             print(f"   📥 Descargando gesto '{gesture_type}'...")
-            resp = requests.get(url, timeout=60)
-            resp.raise_for_status()
-
-            with open(output_path, 'wb') as f:
-                f.write(resp.content)
+            # Caché compartida entre renders: download_file escribe en .part y renombra al final
+            size = download_file(url, output_path, timeout=60)
 
-            print(f"   📹 Gesto descargado: {len(resp.content) // 1024}KB")
+            print(f"   📹 Gesto descargado: {size // 1024}KB")
             return output_path
 
         except Exception as e:
@@ -213,23 +213,9 @@ class WanAnimateGenerator:
             return False
 
         temp_dir = temp_dir or self.temp_dir
-        image_path = os.path.join(temp_dir, "wan_input.jpg")
-
-        # Descargar imagen
+        # Descargar imagen (caché compartida: el resto de generadores ya la pudo bajar)
         try:
-            print(f"   📥 Descargando imagen: {image_url[:60]}...")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                              'AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36',
-            }
-            resp = requests.get(image_url, headers=headers, timeout=30)
-            resp.raise_for_status()
-
-            with open(image_path, 'wb') as f:
-                f.write(resp.content)
-
-            print(f"   📷 Imagen descargada: {len(resp.content) // 1024}KB")
-
+            image_path = get_image_store().fetch(image_url)
         except Exception as e:
             print(f"   ❌ Error descargando imagen: {e}")
             return False
@@ -252,72 +238,12 @@ class WanAnimateGenerator:
 
         # Si hay audio, combinar con FFmpeg
         if audio_path and os.path.exists(audio_path):
-            return self._combine_with_audio(video_no_audio, audio_path, output_path)
+            return mux_audio(video_no_audio, audio_path, output_path)
         else:
             import shutil
             shutil.copy(video_no_audio, output_path)
             return True
 
-    def _combine_with_audio(
-        self,
-        video_path: str,
-        audio_path: str,
-        output_path: str,
-    ) -> bool:
-        """Combina video con audio TTS usando FFmpeg."""
-        import subprocess
-
-        try:
-            print(f"   🔊 Combinando video + audio...")
-
-            # Obtener duración del audio
-            probe_cmd = [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                audio_path
-            ]
-            result = subprocess.run(probe_cmd, capture_output=True, text=True)
-            audio_duration = float(result.stdout.strip()) if result.stdout.strip() else 5.0
-
-            # Obtener duración del video
-            probe_cmd[5] = video_path
-            result = subprocess.run(probe_cmd, capture_output=True, text=True)
-            video_duration = float(result.stdout.strip()) if result.stdout.strip() else 5.0
-
-            # Calcular loops necesarios
-            final_duration = max(audio_duration, 5.0)
-            loops = int(final_duration / video_duration) + 1
-
-            # Combinar con FFmpeg
-            cmd = [
-                "ffmpeg", "-y",
-                "-stream_loop", str(loops),
-                "-i", video_path,
-                "-i", audio_path,
-                "-c:v", "libx264",
-                "-c:a", "aac", "-b:a", "192k",
-                "-shortest",
-                "-t", str(final_duration),
-                "-pix_fmt", "yuv420p",
-                "-preset", "fast",
-                output_path
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-
-            if result.returncode == 0 and os.path.exists(output_path):
-                file_size = os.path.getsize(output_path)
-                print(f"   ✅ Video final: {output_path} ({file_size // 1024}KB)")
-                return True
-            else:
-                print(f"   ❌ FFmpeg error: {result.stderr[:500]}")
-                return False
-
-        except Exception as e:
-            print(f"   ❌ Error combinando: {e}")
-            return False
-
 
 # Test
 if __name__ == "__main__":
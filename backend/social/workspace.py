@@ -0,0 +1,64 @@
+"""
+Espacio de trabajo aislado por render.
+
+Cada oferta en curso tiene su propio directorio temporal y su propia subcarpeta en
+video/public/ (Remotion solo sirve ficheros desde public/). Los ficheros se nombran
+por contenido, así que dos renders simultáneos nunca escriben en la misma ruta y al
+terminar se borra todo con cleanup() (o al salir del bloque with).
+"""
+import os
+import shutil
+import hashlib
+import uuid
+from typing import Optional
+
+
+class JobWorkspace:
+    def __init__(self, temp_root: str, public_root: Optional[str] = None, job_id: str = None):
+        job_id = str(job_id or "job").replace(os.sep, "_")
+        self.name = f"{job_id}-{uuid.uuid4().hex[:8]}"
+        self.dir = os.path.join(temp_root, "jobs", self.name)
+        os.makedirs(self.dir, exist_ok=True)
+        self.public_dir = None
+        if public_root:
+            self.public_dir = os.path.join(public_root, "jobs", self.name)
+            os.makedirs(self.public_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+        return False
+
+    @property
+    def public_path(self) -> str:
+        """Carpeta del trabajo relativa a public/ (jobs/<name>)."""
+        return f"jobs/{self.name}"
+
+    def path(self, filename: str) -> str:
+        """Ruta dentro del directorio temporal del trabajo."""
+        return os.path.join(self.dir, filename)
+
+    @staticmethod
+    def content_name(data: bytes, prefix: str, ext: str) -> str:
+        """Nombre direccionado por contenido: <prefix>_<sha256[:16]><ext>."""
+        return f"{prefix}_{hashlib.sha256(data).hexdigest()[:16]}{ext}"
+
+    def add_public_bytes(self, data: bytes, prefix: str, ext: str) -> str:
+        """Guarda bytes en public/ y devuelve la ruta relativa a public/ (para las props)."""
+        filename = self.content_name(data, prefix, ext)
+        with open(os.path.join(self.public_dir, filename), "wb") as f:
+            f.write(data)
+        return f"{self.public_path}/{filename}"
+
+    def add_public_file(self, source: str, prefix: str) -> str:
+        """Copia un fichero a public/ con nombre por contenido; devuelve la ruta relativa a public/."""
+        with open(source, "rb") as f:
+            data = f.read()
+        return self.add_public_bytes(data, prefix, os.path.splitext(source)[1])
+
+    def cleanup(self):
+        for directory in (self.dir, self.public_dir):
+            if directory:
+                shutil.rmtree(directory, ignore_errors=True)
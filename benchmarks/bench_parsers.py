@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Camping Deals - Suite offline de benchmarks de parseo
+Ejecuta los extractores de cada fuente sobre los fixtures HTML grabados y reporta:
+  - throughput (tarjetas/s o casos/s)
+  - memoria asignada por tarjeta (pico de tracemalloc en una pasada; solo ve
+    asignaciones de Python, lo que lxml reserva en C no aparece)
+  - precisión de extracción frente al JSON golden
+  - paridad de backends: bs4 y lxml deben extraer exactamente los mismos campos
+
+Uso:
+    python benchmarks/bench_parsers.py                       # ejecutar y validar
+    python benchmarks/bench_parsers.py --update-golden       # regenerar golden tras un cambio intencionado
+    python benchmarks/bench_parsers.py --save base.json      # guardar resultados como baseline
+    python benchmarks/bench_parsers.py --compare base.json   # fallar si el throughput cae más de --tolerance
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scraper'))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from parsers import PARSER_BACKENDS, HAS_LXML  # noqa: E402
+from enhanced_scraper import AmazonScraper, DecathlonScraper  # noqa: E402
+from amazon_scraper import FreeAmazonScraper  # noqa: E402
+
+FIXTURES_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+
+# Campos que dependen del reloj y no forman parte del golden
+VOLATILE_FIELDS = ('scraped_at',)
+
+
+def _clean(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in record.items() if k not in VOLATILE_FIELDS}
+
+
+# ========== EXTRACTORES ==========
+
+def _amazon_extractor(backend: str) -> Callable[[bytes], List[Dict]]:
+    scraper = AmazonScraper(parser_backend=backend)
+
+    def extract(content: bytes) -> List[Dict]:
+        return [_clean(deal.to_dict()) for deal in scraper._parse_results(content, 'fixture')]
+    return extract
+
+
+def _legacy_amazon_extractor() -> Callable[[bytes], List[Dict]]:
+    scraper = FreeAmazonScraper()
+
+    def extract(content: bytes) -> List[Dict]:
+        soup = BeautifulSoup(content, 'html.parser')
+        deals = []
+        for product in soup.find_all('div', {'data-component-type': 's-search-result'}):
+            deal = scraper._extract_deal_data(product, 'fixture')
+            if deal:
+                deals.append(_clean(deal))
+        return deals
+    return extract
+
+
+def _decathlon_extractor() -> Callable[[bytes], List[Dict]]:
+    scraper = DecathlonScraper()
+
+    def extract(content: bytes) -> List[Dict]:
+        return [_clean(deal.to_dict()) for deal in scraper._parse_results(content, 'fixture')]
+    return extract
+
+
+def _count_cards(content: bytes, source: str) -> int:
+    """Tarjetas presentes en la página (aceptadas o descartadas), base del throughput"""
+    soup = BeautifulSoup(content, 'html.parser')
+    if source == 'amazon':
+        return len(soup.find_all('div', {'data-component-type': 's-search-result'}))
+    return len(soup.find_all('div', {'class': 'product-card'}) or soup.find_all('article'))
+
+
+# Objetivo -> (fuente de fixtures, sufijo del golden, factoría del extractor)
+PAGE_TARGETS = {
+    'amazon-bs4': ('amazon', '', lambda: _amazon_extractor('bs4')),
+    'amazon-lxml': ('amazon', '', lambda: _amazon_extractor('lxml')),
+    'amazon-legacy': ('amazon', '.legacy', _legacy_amazon_extractor),
+    'decathlon': ('decathlon', '', _decathlon_extractor),
+}
+
+# Implementaciones de _extract_price; strict=False solo informa (fallos conocidos)
+PRICE_TARGETS = {
+    'price-base': (lambda: AmazonScraper()._extract_price, True),
+    'price-legacy': (lambda: FreeAmazonScraper()._extract_price, False),
+}
+
+
+# ========== PRECISIÓN ==========
+
+def _field_accuracy(expected: List[Dict], actual: List[Dict]) -> Dict[str, Any]:
+    """Compara registro a registro y campo a campo contra el golden"""
+    total = matched = 0
+    mismatches = []
+    for i in range(max(len(expected), len(actual))):
+        exp = expected[i] if i < len(expected) else {}
+        act = actual[i] if i < len(actual) else {}
+        for field in sorted(set(exp) | set(act)):
+            total += 1
+            if exp.get(field) == act.get(field):
+                matched += 1
+            elif len(mismatches) < 10:
+                mismatches.append(f"#{i}.{field}: esperado {exp.get(field)!r}, obtenido {act.get(field)!r}")
+    return {'total': total, 'matched': matched, 'mismatches': mismatches}
+
+
+def check_backend_parity(backends: List[str]) -> List[str]:
+    """Compara las tarjetas crudas de cada backend con las del primero, página a página"""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'amazon', '*.html'))):
+        with open(path, 'rb') as f:
+            pages[os.path.basename(path)] = f.read()
+
+    reference = {page: PARSER_BACKENDS[backends[0]]().parse_cards(c) for page, c in pages.items()}
+    differences = []
+    for name in backends[1:]:
+        parser = PARSER_BACKENDS[name]()
+        for page, content in pages.items():
+            if parser.parse_cards(content) != reference[page]:
+                differences.append(f"{name} difiere de {backends[0]} en {page}")
+    return differences
+
+
+# ========== MEDICIÓN ==========
+
+def _measure(func: Callable[[], int], rounds: int) -> Dict[str, float]:
+    """Ejecuta func (devuelve unidades procesadas) y mide throughput y pico de memoria"""
+    func()  # calentamiento (selectores, cachés de bs4/re)
+
+    tracemalloc.start()
+    units = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    processed = 0
+    for _ in range(rounds):
+        processed += func()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'units': processed,
+        'seconds': elapsed,
+        'rate': processed / elapsed if elapsed else 0.0,
+        'bytes_per_unit': peak / units if units else 0.0,
+    }
+
+
+def _golden_path(source: str, name: str, suffix: str) -> str:
+    return os.path.join(FIXTURES_DIR, source, f"{name}{suffix}.json")
+
+
+def run_page_target(target: str, rounds: int, update_golden: bool) -> Dict[str, Any]:
+    source, suffix, factory = PAGE_TARGETS[target]
+    extract = factory()
+
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, source, '*.html'))):
+        with open(path, 'rb') as f:
+            pages[os.path.splitext(os.path.basename(path))[0]] = f.read()
+
+    cards = sum(_count_cards(content, source) for content in pages.values())
+    accuracy = {'total': 0, 'matched': 0, 'mismatches': []}
+
+    for name, content in pages.items():
+        actual = extract(content)
+        golden_file = _golden_path(source, name, suffix)
+
+        if update_golden:
+            with open(golden_file, 'w', encoding='utf-8') as f:
+                json.dump(actual, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+
+        if not os.path.exists(golden_file):
+            accuracy['mismatches'].append(f"{name}: falta {os.path.relpath(golden_file, ROOT)}")
+            continue
+
+        with open(golden_file, encoding='utf-8') as f:
+            expected = json.load(f)
+        result = _field_accuracy(expected, actual)
+        accuracy['total'] += result['total']
+        accuracy['matched'] += result['matched']
+        accuracy['mismatches'] += [f"{name} {m}" for m in result['mismatches']]
+
+    def one_pass() -> int:
+        for content in pages.values():
+            extract(content)
+        return cards
+
+    return {'strict': True, 'accuracy': accuracy, **_measure(one_pass, rounds)}
+
+
+def run_price_target(target: str, rounds: int) -> Dict[str, Any]:
+    factory, strict = PRICE_TARGETS[target]
+    extract_price = factory()
+
+    with open(os.path.join(FIXTURES_DIR, 'prices.json'), encoding='utf-8') as f:
+        cases = json.load(f)
+
+    accuracy = {'total': len(cases), 'matched': 0, 'mismatches': []}
+    for case in cases:
+        value = extract_price(case['input'])
+        if value == case['expected']:
+            accuracy['matched'] += 1
+        else:
+            accuracy['mismatches'].append(f"{case['input']!r}: esperado {case['expected']!r}, obtenido {value!r}")
+
+    def one_pass() -> int:
+        for case in cases:
+            extract_price(case['input'])
+        return len(cases)
+
+    # Los casos son baratos: más pasadas para que el tiempo sea medible
+    return {'strict': strict, 'accuracy': accuracy, **_measure(one_pass, rounds * 50)}
+
+
+# ========== INFORME ==========
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmarks offline de parseo de ofertas')
+    all_targets = list(PAGE_TARGETS) + list(PRICE_TARGETS)
+    arg_parser.add_argument('--rounds', type=int, default=50, help='Pasadas de medición por objetivo')
+    arg_parser.add_argument('--target', action='append', choices=all_targets, help='Objetivos a ejecutar')
+    arg_parser.add_argument('--update-golden', action='store_true', help='Reescribir los JSON golden')
+    arg_parser.add_argument('--save', metavar='FILE', help='Guardar resultados como baseline')
+    arg_parser.add_argument('--compare', metavar='FILE', help='Comparar throughput con un baseline')
+    arg_parser.add_argument('--tolerance', type=float, default=0.25, help='Caída de throughput tolerada (0.25 = 25%%)')
+    args = arg_parser.parse_args()
+
+    targets = args.target or [t for t in all_targets if t != 'amazon-lxml' or HAS_LXML]
+    results = {}
+
+    print(f"📊 Benchmarks de parseo ({args.rounds} pasadas)\n")
+    print(f"  {'objetivo':15s} {'unid/s':>10s} {'B/unid':>9s} {'precisión':>10s}")
+
+    for target in targets:
+        if target in PAGE_TARGETS:
+            result = run_page_target(target, args.rounds, args.update_golden)
+        else:
+            result = run_price_target(target, args.rounds)
+        results[target] = result
+
+        acc = result['accuracy']
+        pct = 100.0 * acc['matched'] / acc['total'] if acc['total'] else 0.0
+        print(f"  {target:15s} {result['rate']:10.0f} {result['bytes_per_unit']:9.0f} {pct:9.1f}%")
+
+    failed = False
+    print()
+
+    backends = [t.split('-', 1)[1] for t in ('amazon-bs4', 'amazon-lxml') if t in results]
+    if len(backends) > 1:
+        differences = check_backend_parity(backends)
+        for difference in differences:
+            print(f"❌ [paridad] {difference}")
+        if not differences:
+            speedup = results['amazon-lxml']['rate'] / results['amazon-bs4']['rate'] if results['amazon-bs4']['rate'] else 0.0
+            print(f"✅ [paridad] bs4 y lxml extraen los mismos campos (⚡ lxml {speedup:.1f}x más rápido)")
+        failed = failed or bool(differences)
+    for target, result in results.items():
+        for mismatch in result['accuracy']['mismatches']:
+            icon = '❌' if result['strict'] else 'ℹ️'
+            print(f"{icon} [{target}] {mismatch}")
+            failed = failed or result['strict']
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for target, result in results.items():
+            base_rate = baseline.get(target, {}).get('rate')
+            if not base_rate:
+                continue
+            change = result['rate'] / base_rate - 1
+            regressed = change < -args.tolerance
+            print(f"{'❌' if regressed else '✅'} [{target}] throughput {change:+.0%} vs baseline")
+            failed = failed or regressed
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({t: {k: v for k, v in r.items() if k != 'accuracy'} for t, r in results.items()}, f, indent=2)
+        print(f"💾 Baseline guardado en {args.save}")
+
+    if args.update_golden:
+        print("📝 Golden regenerado: revisa el diff antes de commitear")
+
+    print("\n" + ("❌ Regresiones detectadas" if failed else "✅ Sin regresiones"))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
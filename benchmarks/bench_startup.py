@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Camping Deals - Benchmark de arranque (tiempo de import por punto de entrada)
+Lanza cada punto de entrada en un intérprete nuevo con `python -X importtime` y reporta:
+  - total de import (suma de los módulos de primer nivel, mediana de varias pasadas)
+  - tiempo de pared del proceso completo
+  - los módulos de primer nivel que más pesan
+
+Uso:
+    python benchmarks/bench_startup.py                       # medir todos los puntos de entrada
+    python benchmarks/bench_startup.py --target cli-health   # solo uno
+    python benchmarks/bench_startup.py --save base.json      # guardar resultados como baseline
+    python benchmarks/bench_startup.py --compare base.json   # fallar si el import crece más de --tolerance
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND = os.path.join(ROOT, 'backend')
+
+# nombre -> (directorio de trabajo, código a ejecutar)
+TARGETS = {
+    # Modos CLI de main_automation: parsear argumentos y construir el bot sin trabajo de red
+    'cli-health': (ROOT, "import sys; sys.argv = ['main_automation.py', '--health']; "
+                         "import main_automation; main_automation.CampingDealsBot()"),
+    'main_automation': (ROOT, "import main_automation"),
+    'enhanced_scraper': (ROOT, "import scraper.enhanced_scraper"),
+    'analytics': (ROOT, "import analytics.dashboard"),
+    # Pipeline del backend (python backend/main.py importa desde backend/)
+    'backend-main': (BACKEND, "import sys; sys.path.insert(0, '.'); import main"),
+    'social-manager': (BACKEND, "import sys; sys.path.insert(0, '.'); import social.manager"),
+}
+
+
+def parse_importtime(stderr: str) -> Tuple[int, List[Tuple[str, int]]]:
+    """Total en µs (suma de los imports de primer nivel) y lista (módulo, acumulado)."""
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        try:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            cumulative = int(cumulative)
+        except ValueError:
+            continue
+        # Los imports anidados van indentados con dos espacios por nivel
+        if not name[1:].startswith(' '):
+            top_level.append((name.strip(), cumulative))
+    return sum(us for _, us in top_level), top_level
+
+
+def measure(target: str, rounds: int) -> Dict:
+    cwd, code = TARGETS[target]
+    totals, walls, modules = [], [], {}
+    for _ in range(rounds):
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                              cwd=cwd, capture_output=True, text=True)
+        walls.append(time.perf_counter() - started)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f'exit {proc.returncode}'
+            return {'error': error}
+        total, top_level = parse_importtime(proc.stderr)
+        totals.append(total)
+        for name, us in top_level:
+            modules.setdefault(name, []).append(us)
+
+    heaviest = sorted(((statistics.median(v), k) for k, v in modules.items()), reverse=True)[:5]
+    return {
+        'import_ms': statistics.median(totals) / 1000,
+        'wall_ms': statistics.median(walls) * 1000,
+        'heaviest': [(name, us / 1000) for us, name in heaviest],
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark de arranque por punto de entrada')
+    arg_parser.add_argument('--rounds', type=int, default=5, help='Procesos lanzados por objetivo (se toma la mediana)')
+    arg_parser.add_argument('--target', action='append', choices=list(TARGETS), help='Objetivos a ejecutar')
+    arg_parser.add_argument('--save', metavar='FILE', help='Guardar resultados como baseline')
+    arg_parser.add_argument('--compare', metavar='FILE', help='Comparar el tiempo de import con un baseline')
+    arg_parser.add_argument('--tolerance', type=float, default=0.25, help='Aumento de import tolerado (0.25 = 25%%)')
+    args = arg_parser.parse_args()
+
+    targets = args.target or list(TARGETS)
+    results = {}
+
+    print(f"⏱️  Benchmark de arranque ({args.rounds} pasadas, python -X importtime)\n")
+    print(f"  {'objetivo':17s} {'import ms':>10s} {'pared ms':>9s}  módulos más pesados")
+
+    failed = False
+    for target in targets:
+        result = measure(target, args.rounds)
+        results[target] = result
+        if 'error' in result:
+            print(f"  {target:17s} {'—':>10s} {'—':>9s}  ❌ {result['error'][:80]}")
+            failed = True
+            continue
+        heaviest = ', '.join(f"{name} {ms:.0f}" for name, ms in result['heaviest'][:3])
+        print(f"  {target:17s} {result['import_ms']:10.1f} {result['wall_ms']:9.1f}  {heaviest}")
+
+    if args.compare:
+        print()
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for target, result in results.items():
+            base = baseline.get(target, {}).get('import_ms')
+            if not base or 'error' in result:
+                continue
+            change = result['import_ms'] / base - 1
+            regressed = change > args.tolerance
+            print(f"{'❌' if regressed else '✅'} [{target}] import {change:+.0%} vs baseline")
+            failed = failed or regressed
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Baseline guardado en {args.save}")
+
+    print("\n" + ("❌ Regresiones o errores detectados" if failed else "✅ Sin regresiones"))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
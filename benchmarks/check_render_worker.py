@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Camping Deals - Comprobación del worker de render Remotion
+Arranca UN worker y renderiza dos ofertas seguidas, cada una con su imagen escrita en
+video/public/jobs/<trabajo>/ DESPUÉS de que el worker haya hecho el bundle (igual que
+en un ciclo real). Falla si alguno de los dos renders no sale del worker: antes, todo
+render posterior al primero caía a npx porque el bundle no tenía esos ficheros.
+
+Uso:
+    python benchmarks/check_render_worker.py
+    python benchmarks/check_render_worker.py --keep    # no borrar los MP4 generados
+"""
+
+import os
+import sys
+import time
+import zlib
+import shutil
+import struct
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from social.remotion_server import RemotionRenderServer, RemotionServerError  # noqa: E402
+from social.workspace import JobWorkspace  # noqa: E402
+
+VIDEO_DIR = os.path.join(ROOT, 'video')
+
+
+def solid_png(width: int, height: int, rgb: tuple) -> bytes:
+    """PNG de un solo color (sin PIL)."""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+    row = b'\x00' + bytes(rgb) * width
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(row * height))
+            + chunk(b'IEND', b''))
+
+
+def is_mp4(path: str) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            return f.read(12)[4:8] == b'ftyp'
+    except OSError:
+        return False
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Dos renders seguidos en un mismo worker Remotion')
+    arg_parser.add_argument('--keep', action='store_true', help='Conservar los MP4 generados')
+    args = arg_parser.parse_args()
+
+    if not shutil.which('node') or not os.path.isdir(VIDEO_DIR):
+        print("⏭️  Sin node o sin proyecto video/: comprobación omitida")
+        return 0
+
+    out_dir = tempfile.mkdtemp(prefix='render_worker_')
+    server = RemotionRenderServer(VIDEO_DIR, concurrency=2)
+    failed = False
+    try:
+        server.start()  # el bundle se hace aquí, antes de que existan los assets
+        deals = [("Tienda de campaña 4 plazas", 89.99, (34, 139, 34)),
+                 ("Saco de dormir -10ºC", 49.99, (30, 60, 160))]
+        for index, (title, price, color) in enumerate(deals, 1):
+            workspace = JobWorkspace(out_dir, os.path.join(VIDEO_DIR, 'public'), job_id=f"check{index}")
+            try:
+                image = workspace.add_public_bytes(solid_png(576, 1024, color), 'product', '.png')
+                props = {"title": title, "imageUrl": image, "price": price, "category": "camping"}
+                output = os.path.join(out_dir, f"check_{index}.mp4")
+                started = time.perf_counter()
+                server.render(props, output, timeout=300,
+                              assets=(workspace.public_dir, workspace.public_path))
+                ok = is_mp4(output)
+                print(f"{'✅' if ok else '❌'} Render {index} en el worker: {time.perf_counter() - started:.1f}s")
+                failed = failed or not ok
+            except RemotionServerError as e:
+                print(f"❌ Render {index} falló en el worker: {str(e)[-300:]}")
+                failed = True
+            finally:
+                workspace.cleanup()
+    except RemotionServerError as e:
+        print(f"❌ El worker no arrancó: {e}")
+        failed = True
+    finally:
+        server.close()
+        if not args.keep:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        else:
+            print(f"💾 Videos en {out_dir}")
+
+    print("\n" + ("❌ El worker no renderizó los dos videos" if failed else "✅ Dos renders seguidos en un mismo worker"))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
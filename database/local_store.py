@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Camping Deals - Almacén local de ofertas en SQLite
+Sustituye al JSON plano en modo local: upsert por ASIN (clave primaria)
+e índices por categoría, descuento y fecha de actualización.
+
+El binario no se versiona: deals_db.json sigue siendo la copia legible que se
+sube al repo (export_json) y la que siembra el almacén en un checkout limpio.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Dict, Optional
+
+
+class LocalDealStore:
+    """
+    Ofertas guardadas como JSON por fila con columnas indexadas para filtrar/ordenar.
+    El registro completo vive en 'data'; category/discount/updated_at se duplican
+    en columnas para que las consultas no tengan que deserializar nada.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.environ.get('LOCAL_DB_PATH', 'data/deals_db.sqlite3')
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS deals (
+                asin TEXT PRIMARY KEY,
+                category TEXT,
+                discount INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT,
+                updated_at TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_deals_category ON deals(category);
+            CREATE INDEX IF NOT EXISTS idx_deals_discount ON deals(discount DESC);
+            CREATE INDEX IF NOT EXISTS idx_deals_updated_at ON deals(updated_at);
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _row_values(deal: Dict) -> tuple:
+        # updated_at indexado = última modificación (o creación si nunca se actualizó)
+        return (
+            deal['asin'],
+            deal.get('category'),
+            deal.get('discount') or 0,
+            deal.get('created_at'),
+            deal.get('updated_at') or deal.get('created_at') or '',
+            json.dumps(deal, ensure_ascii=False),
+        )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM deals").fetchone()[0]
+
+    def upsert(self, deals: List[Dict]) -> int:
+        """
+        Inserta o reemplaza por ASIN. Las nuevas reciben created_at; las existentes
+        conservan su created_at y reciben updated_at. Devuelve cuántas eran nuevas.
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            asins = list({deal['asin'] for deal in deals})
+            created = {}
+            for i in range(0, len(asins), 500):  # límite de variables de SQLite
+                chunk = asins[i:i + 500]
+                created.update(self._conn.execute(
+                    f"SELECT asin, created_at FROM deals WHERE asin IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall())
+
+            rows = []
+            new_count = 0
+            for deal in deals:
+                deal = dict(deal)
+                if deal['asin'] in created:
+                    deal['created_at'] = created[deal['asin']] or now
+                    deal['updated_at'] = now
+                else:
+                    deal['created_at'] = now
+                    created[deal['asin']] = now
+                    new_count += 1
+                rows.append(self._row_values(deal))
+
+            self._conn.executemany(
+                """INSERT INTO deals (asin, category, discount, created_at, updated_at, data)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(asin) DO UPDATE SET
+                       category = excluded.category, discount = excluded.discount,
+                       created_at = excluded.created_at, updated_at = excluded.updated_at,
+                       data = excluded.data""",
+                rows
+            )
+            self._conn.commit()
+        return new_count
+
+    def query(self, category: Optional[str] = None, min_discount: int = 0, limit: int = 50) -> List[Dict]:
+        """Ofertas con descuento >= min_discount, ordenadas por descuento desc"""
+        sql = "SELECT data FROM deals WHERE discount >= ?"
+        params: list = [min_discount]
+        if category:
+            sql += " AND category = ?"
+            params.append(category)
+        sql += " ORDER BY discount DESC, rowid LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total, avg, top = self._conn.execute(
+                "SELECT COUNT(*), AVG(discount), MAX(discount) FROM deals"
+            ).fetchone()
+        if not total:
+            return {'total': 0, 'avg_discount': 0, 'max_discount': 0}
+        return {'total': total, 'avg_discount': round(avg), 'max_discount': top}
+
+    def delete_older_than(self, cutoff: str) -> int:
+        """Elimina ofertas cuya última modificación es anterior a cutoff (ISO)"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM deals WHERE updated_at < ?", (cutoff,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """
+        Importa deals_db.json si el almacén está vacío (checkout limpio o primera vez).
+        El JSON no se toca; las fechas existentes se respetan tal cual.
+        """
+        if not os.path.exists(json_path) or self.count():
+            return 0
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                deals = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ No se pudo migrar {json_path}: {e}")
+            return 0
+
+        rows = [self._row_values(d) for d in deals if isinstance(d, dict) and d.get('asin')]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO deals (asin, category, discount, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+        print(f"📦 Migradas {len(rows)} ofertas de {json_path} a {self.path}")
+        return len(rows)
+
+    def export_json(self, json_path: str) -> int:
+        """
+        Vuelca todas las ofertas a json_path (mismo formato que el antiguo deals_db.json,
+        por orden de creación) con escritura atómica. Devuelve cuántas se escribieron.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM deals ORDER BY created_at, rowid").fetchall()
+        deals = [json.loads(row[0]) for row in rows]
+
+        os.makedirs(os.path.dirname(json_path) or '.', exist_ok=True)
+        tmp_path = f"{json_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(deals, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, json_path)
+        return len(deals)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -5,7 +5,7 @@ Base de datos gratuita en la nube (500MB gratis)
 """
 
 import os
-import json
+import time
 from datetime import datetime
 from typing import List, Dict, Optional
 
@@ -15,11 +15,16 @@ try:
     HAS_SUPABASE = True
 except ImportError:
     HAS_SUPABASE = False
-    print("⚠️ supabase no instalado. Usando almacenamiento JSON local.")
+    print("⚠️ supabase no instalado. Usando almacenamiento SQLite local.")
+
+try:
+    from .local_store import LocalDealStore
+except ImportError:
+    from local_store import LocalDealStore
 
 
 class FreeDatabase:
-    """Cliente de base de datos gratuito (Supabase o JSON fallback)"""
+    """Cliente de base de datos gratuito (Supabase o SQLite local como fallback)"""
 
     def __init__(self):
         # Soportar ambos nombres de variables de entorno
@@ -35,21 +40,24 @@ class FreeDatabase:
                 print(f"⚠️ Error conectando a Supabase: {e}")
                 self.client = None
         
+        # JSON local: siembra el almacén SQLite en un checkout limpio y se reexporta
+        # tras cada cambio (es el fichero que se versiona, el .sqlite3 no)
         self.local_db_path = 'data/deals_db.json'
+        self._local_store: Optional[LocalDealStore] = None
+
+        # Upsert por lotes: una consulta in_ + un upsert por chunk en vez de 2 peticiones por oferta
+        self.bulk_upsert = os.environ.get('SUPABASE_BULK_UPSERT', 'true').lower() != 'false'
+        self.batch_size = max(1, int(os.environ.get('SUPABASE_BATCH_SIZE', '100')))
+        self.batch_retries = max(0, int(os.environ.get('SUPABASE_BATCH_RETRIES', '2')))
+        self.last_failed_chunks: List[Dict] = []
     
-    def _load_local_db(self) -> List[Dict]:
-        """Carga base de datos local JSON"""
-        try:
-            with open(self.local_db_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def _save_local_db(self, deals: List[Dict]):
-        """Guarda base de datos local JSON"""
-        os.makedirs(os.path.dirname(self.local_db_path), exist_ok=True)
-        with open(self.local_db_path, 'w', encoding='utf-8') as f:
-            json.dump(deals, f, ensure_ascii=False, indent=2)
+    @property
+    def local_store(self) -> LocalDealStore:
+        """Almacén SQLite local (se abre, y migra el JSON antiguo, en el primer uso)"""
+        if self._local_store is None:
+            self._local_store = LocalDealStore()
+            self._local_store.migrate_from_json(self.local_db_path)
+        return self._local_store
     
     def insert_deals(self, deals: List[Dict]) -> int:
         """Inserta ofertas en la base de datos (upsert)"""
@@ -58,8 +66,30 @@ class FreeDatabase:
         else:
             return self._insert_local(deals)
     
+    def _map_supabase_row(self, deal: Dict) -> Dict:
+        """Mapea una oferta al esquema de la tabla 'deals' existente"""
+        return {
+            'asin': deal['asin'],
+            'title': deal['title'][:200],  # Limitar longitud
+            'description': f"Descuento del {deal['discount']}% - Precio original: {deal.get('original_price', 0)}€",
+            'price': deal['current_price'] if 'current_price' in deal else deal['price'],
+            'image_url': deal.get('image_url'),
+            'url': f"https://www.amazon.es/dp/{deal['asin']}",
+            'affiliate_url': deal['affiliate_url'],
+            'category': deal['category'],
+            'rating': deal.get('rating'),
+            'review_count': deal.get('review_count'),
+            'is_active': True,
+        }
+
     def _insert_supabase(self, deals: List[Dict]) -> int:
         """Inserta en Supabase - Esquema adaptado a tabla 'deals' existente"""
+        if self.bulk_upsert:
+            return self._insert_supabase_bulk(deals)
+        return self._insert_supabase_per_row(deals)
+
+    def _insert_supabase_per_row(self, deals: List[Dict]) -> int:
+        """Modo clásico: select + update/insert por oferta (2 peticiones por oferta)"""
         inserted = 0
 
         for deal in deals:
@@ -67,20 +97,7 @@ class FreeDatabase:
                 # Verificar si existe por ASIN
                 existing = self.client.table('deals').select('id,asin').eq('asin', deal['asin']).execute()
 
-                # Mapear datos al esquema de la tabla existente
-                deal_data = {
-                    'asin': deal['asin'],
-                    'title': deal['title'][:200],  # Limitar longitud
-                    'description': f"Descuento del {deal['discount']}% - Precio original: {deal.get('original_price', 0)}€",
-                    'price': deal['current_price'],
-                    'image_url': deal.get('image_url'),
-                    'url': f"https://www.amazon.es/dp/{deal['asin']}",
-                    'affiliate_url': deal['affiliate_url'],
-                    'category': deal['category'],
-                    'rating': deal.get('rating'),
-                    'review_count': deal.get('review_count'),
-                    'is_active': True,
-                }
+                deal_data = self._map_supabase_row(deal)
 
                 if existing.data:
                     # Update existente
@@ -97,31 +114,65 @@ class FreeDatabase:
 
         print(f"💾 Supabase: {inserted} nuevas ofertas insertadas")
         return inserted
-    
-    def _insert_local(self, deals: List[Dict]) -> int:
-        """Inserta en JSON local"""
-        existing = self._load_local_db()
-        existing_asins = {d['asin'] for d in existing}
-        
-        new_deals = []
+
+    def _insert_supabase_bulk(self, deals: List[Dict]) -> int:
+        """
+        Upsert por lotes con on_conflict='asin'.
+        Por cada chunk: una consulta in_ para saber qué ASINs ya existían
+        (y así contar inserciones vs actualizaciones) y un único upsert.
+        Los chunks que fallan se reintentan con backoff y se reportan al final.
+        """
+        # Deduplicar por ASIN (la última aparición gana): Postgres rechaza un
+        # upsert que toque la misma fila dos veces en la misma sentencia
+        rows: Dict[str, Dict] = {}
         for deal in deals:
-            if deal['asin'] not in existing_asins:
-                deal['created_at'] = datetime.now().isoformat()
-                new_deals.append(deal)
-            else:
-                # Actualizar existente
-                for i, ex in enumerate(existing):
-                    if ex['asin'] == deal['asin']:
-                        deal['created_at'] = ex.get('created_at', datetime.now().isoformat())
-                        deal['updated_at'] = datetime.now().isoformat()
-                        existing[i] = deal
-                        break
-        
-        existing.extend(new_deals)
-        self._save_local_db(existing)
-        
-        print(f"💾 Local: {len(new_deals)} nuevas ofertas insertadas")
-        return len(new_deals)
+            try:
+                rows[deal['asin']] = self._map_supabase_row(deal)
+            except (KeyError, TypeError) as e:
+                print(f"⚠️ Oferta inválida {deal.get('asin', '?')}: falta {e}")
+
+        asins = list(rows)
+        chunks = [asins[i:i + self.batch_size] for i in range(0, len(asins), self.batch_size)]
+        inserted = updated = 0
+        failed_chunks = []
+
+        for index, chunk in enumerate(chunks, 1):
+            for attempt in range(self.batch_retries + 1):
+                try:
+                    existing = self.client.table('deals').select('asin').in_('asin', chunk).execute()
+                    existing_asins = {row['asin'] for row in (existing.data or [])}
+
+                    self.client.table('deals').upsert(
+                        [rows[asin] for asin in chunk], on_conflict='asin'
+                    ).execute()
+
+                    inserted += len(chunk) - len(existing_asins)
+                    updated += len(existing_asins)
+                    print(f"  ✅ Lote {index}/{len(chunks)}: {len(chunk) - len(existing_asins)} nuevas, {len(existing_asins)} actualizadas")
+                    break
+                except Exception as e:
+                    if attempt < self.batch_retries:
+                        wait = 2 ** attempt
+                        print(f"  ⚠️ Lote {index}/{len(chunks)} falló ({e}), reintentando en {wait}s...")
+                        time.sleep(wait)
+                    else:
+                        print(f"  ❌ Lote {index}/{len(chunks)} falló tras {attempt + 1} intentos: {e}")
+                        failed_chunks.append({'chunk': index, 'asins': chunk, 'error': str(e)})
+
+        if failed_chunks:
+            failed_count = sum(len(f['asins']) for f in failed_chunks)
+            print(f"⚠️ Supabase: {len(failed_chunks)} lotes fallidos ({failed_count} ofertas sin guardar)")
+        self.last_failed_chunks = failed_chunks
+
+        print(f"💾 Supabase: {inserted} nuevas ofertas insertadas, {updated} actualizadas ({len(chunks)} lotes)")
+        return inserted
+
+    def _insert_local(self, deals: List[Dict]) -> int:
+        """Inserta en el almacén SQLite local (upsert por ASIN)"""
+        inserted = self.local_store.upsert(deals)
+        self.local_store.export_json(self.local_db_path)
+        print(f"💾 Local: {inserted} nuevas ofertas insertadas")
+        return inserted
     
     def get_deals(self, category: Optional[str] = None, min_discount: int = 30, limit: int = 50) -> List[Dict]:
         """Obtiene ofertas filtradas"""
@@ -143,30 +194,19 @@ class FreeDatabase:
         return result.data if result.data else []
     
     def _get_local(self, category: Optional[str], min_discount: int, limit: int) -> List[Dict]:
-        """Obtiene de JSON local"""
-        deals = self._load_local_db()
-        
-        # Filtrar
-        filtered = [d for d in deals if d.get('discount', 0) >= min_discount]
-        
-        if category:
-            filtered = [d for d in filtered if d.get('category') == category]
-        
-        # Ordenar por descuento
-        filtered.sort(key=lambda x: x.get('discount', 0), reverse=True)
-        
-        return filtered[:limit]
+        """Obtiene del almacén SQLite local (filtrado y ordenado por índices)"""
+        return self.local_store.query(category, min_discount, limit)
     
     def get_stats(self) -> Dict:
         """Obtiene estadísticas de la base de datos"""
-        if self.client:
-            try:
-                result = self.client.table('deals').select('discount').execute()
-                deals = result.data if result.data else []
-            except:
-                deals = []
-        else:
-            deals = self._load_local_db()
+        if not self.client:
+            return self.local_store.stats()
+
+        try:
+            result = self.client.table('deals').select('discount').execute()
+            deals = result.data if result.data else []
+        except:
+            deals = []
         
         if not deals:
             return {'total': 0, 'avg_discount': 0, 'max_discount': 0}
@@ -191,11 +231,9 @@ class FreeDatabase:
             except:
                 deleted = 0
         else:
-            deals = self._load_local_db()
-            original_count = len(deals)
-            deals = [d for d in deals if d.get('updated_at', d.get('created_at', '')) >= cutoff]
-            self._save_local_db(deals)
-            deleted = original_count - len(deals)
+            deleted = self.local_store.delete_older_than(cutoff)
+            if deleted:
+                self.local_store.export_json(self.local_db_path)
         
         print(f"🗑️ Eliminadas {deleted} ofertas antiguas")
         return deleted
@@ -9,22 +9,13 @@ import sys
 import json
 import argparse
 from datetime import datetime
+from functools import cached_property
 
 # Añadir el directorio raíz al path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Importar scraper mejorado si está disponible
-try:
-    from scraper.enhanced_scraper import MultiSourceScraper, AmazonScraper
-    HAS_ENHANCED_SCRAPER = True
-except ImportError:
-    HAS_ENHANCED_SCRAPER = False
-
-from scraper.amazon_scraper import FreeAmazonScraper
-from database.supabase_client import FreeDatabase
-from marketing.email_sender import FreeEmailMarketing
-from social.social_poster import FreeSocialPoster
-from analytics.dashboard import FreeDashboard, MonitoringSystem
+# Los componentes (scrapers, DB, email, redes, analytics) se importan y construyen en
+# su primer uso: `--health` no paga el import de scrapy/playwright/gspread.
 
 
 class CampingDealsBot:
@@ -35,21 +26,51 @@ class CampingDealsBot:
         print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}")
         print("-" * 50)
 
-        # Usar scraper mejorado si está disponible
-        if use_enhanced and HAS_ENHANCED_SCRAPER:
-            print("✅ Usando Enhanced Multi-Source Scraper")
-            self.multi_scraper = MultiSourceScraper(sources=['amazon'])
-            self.scraper = None
-        else:
-            print("📌 Usando scraper básico")
-            self.scraper = FreeAmazonScraper()
-            self.multi_scraper = None
-
-        self.db = FreeDatabase()
-        self.email = FreeEmailMarketing()
-        self.social = FreeSocialPoster()
-        self.dashboard = FreeDashboard()
-        self.monitor = MonitoringSystem()
+        self.use_enhanced = use_enhanced
+
+    @cached_property
+    def multi_scraper(self):
+        """Enhanced Multi-Source Scraper si está disponible; None para usar el básico."""
+        if self.use_enhanced:
+            try:
+                from scraper.enhanced_scraper import MultiSourceScraper
+            except ImportError:
+                MultiSourceScraper = None
+            if MultiSourceScraper:
+                print("✅ Usando Enhanced Multi-Source Scraper")
+                return MultiSourceScraper(sources=['amazon'])
+        print("📌 Usando scraper básico")
+        return None
+
+    @cached_property
+    def scraper(self):
+        from scraper.amazon_scraper import FreeAmazonScraper
+        return FreeAmazonScraper()
+
+    @cached_property
+    def db(self):
+        from database.supabase_client import FreeDatabase
+        return FreeDatabase()
+
+    @cached_property
+    def email(self):
+        from marketing.email_sender import FreeEmailMarketing
+        return FreeEmailMarketing()
+
+    @cached_property
+    def social(self):
+        from social.social_poster import FreeSocialPoster
+        return FreeSocialPoster()
+
+    @cached_property
+    def dashboard(self):
+        from analytics.dashboard import FreeDashboard
+        return FreeDashboard()
+
+    @cached_property
+    def monitor(self):
+        from analytics.dashboard import MonitoringSystem
+        return MonitoringSystem()
     
     def run_complete_cycle(self, dry_run: bool = False) -> dict:
         """Ejecuta el ciclo completo de automatización"""
@@ -16,10 +16,13 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 
 try:
-    from fake_useragent import UserAgent
-    HAS_FAKE_UA = True
+    from .optional_deps import module_available
 except ImportError:
-    HAS_FAKE_UA = False
+    from optional_deps import module_available
+
+# fake_useragent se importa en la primera petición (ver ua): aquí solo se comprueba
+HAS_FAKE_UA = module_available('fake_useragent')
+if not HAS_FAKE_UA:
     print("⚠️ fake_useragent no instalado. Usando User-Agent estático.")
 
 
@@ -28,7 +31,7 @@ class FreeAmazonScraper:
     
     def __init__(self):
         self.session = requests.Session()
-        self.ua = UserAgent() if HAS_FAKE_UA else None
+        self._ua = None
         self.base_url = 'https://www.amazon.es'
         self.partner_tag = os.environ.get('AMAZON_PARTNER_TAG', 'camperdeals-21')
         
@@ -50,7 +53,15 @@ class FreeAmazonScraper:
             'herramientas': ['navaja suiza', 'multiherramienta', 'kit supervivencia'],
             'accesorios': ['brújula', 'cantimplora', 'botiquín camping'],
         }
-    
+
+    @property
+    def ua(self):
+        """UserAgent de fake_useragent, creado en la primera petición."""
+        if self._ua is None and HAS_FAKE_UA:
+            from fake_useragent import UserAgent
+            self._ua = UserAgent()
+        return self._ua
+
     def _get_headers(self) -> Dict[str, str]:
         """Genera headers aleatorios para evitar detección"""
         user_agent = self.ua.random if self.ua else random.choice(self.backup_agents)
@@ -12,8 +12,10 @@ import random
 import time
 import re
 import hashlib
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Any, Iterator, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from urllib.parse import urljoin, urlparse, quote_plus
@@ -21,28 +23,27 @@ from urllib.parse import urljoin, urlparse, quote_plus
 import requests
 from bs4 import BeautifulSoup
 
-# Opcional: Scrapy para scraping a gran escala
 try:
-    import scrapy
-    from scrapy.crawler import CrawlerProcess
-    from scrapy.settings import Settings
-    HAS_SCRAPY = True
+    from .http_cache import HttpCache
+    from .parsers import AmazonCardParser, SoupAmazonParser, get_amazon_parser
+    from .optional_deps import module_available
 except ImportError:
-    HAS_SCRAPY = False
+    from http_cache import HttpCache
+    from parsers import AmazonCardParser, SoupAmazonParser, get_amazon_parser
+    from optional_deps import module_available
+
+# Backends opcionales: solo se comprueba que estén instalados. scrapy, playwright y
+# fake_useragent tardan en importarse y la mayoría de ejecuciones no los usa; se
+# importan en el primer uso (AmazonSpider, la propiedad ua).
+
+# Opcional: Scrapy para scraping a gran escala
+HAS_SCRAPY = module_available('scrapy')
 
 # Opcional: Playwright para sitios con JavaScript pesado
-try:
-    from playwright.sync_api import sync_playwright
-    HAS_PLAYWRIGHT = True
-except ImportError:
-    HAS_PLAYWRIGHT = False
+HAS_PLAYWRIGHT = module_available('playwright')
 
 # Fake user agent
-try:
-    from fake_useragent import UserAgent
-    HAS_FAKE_UA = True
-except ImportError:
-    HAS_FAKE_UA = False
+HAS_FAKE_UA = module_available('fake_useragent')
 
 
 @dataclass
@@ -92,13 +93,91 @@ class ProductDeal:
         }
 
 
+class HostThrottle:
+    """
+    Presupuesto de cortesía por dominio: token bucket + límite de peticiones en vuelo.
+
+    El bucket se rellena a razón de un token cada `interval` segundos de media
+    (el mismo rango que usaba `_random_delay`); cada petición consume una
+    cantidad aleatoria de token para no generar un patrón regular.
+    """
+
+    def __init__(self, interval: Tuple[float, float] = (2, 6), burst: int = 1, max_in_flight: int = 1):
+        self.interval = interval
+        self.capacity = max(1, burst)
+        self.rate = 2.0 / max(0.001, interval[0] + interval[1])  # tokens por segundo
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, max_in_flight))
+
+    def _take_token(self) -> float:
+        """Consume un token si hay; si no, devuelve los segundos a esperar"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                # Coste aleatorio por petición: el hueco hasta la siguiente cae dentro de `interval`
+                low, high = self.interval
+                spread = (high - low) / max(0.001, high + low)
+                self.tokens -= random.uniform(1 - spread, 1 + spread)
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Bloquea hasta tener hueco en vuelo y token disponible"""
+        self._slots.acquire()
+        try:
+            while True:
+                wait = self._take_token()
+                if wait <= 0:
+                    return
+                time.sleep(wait)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self):
+        self._slots.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+# Un throttle por dominio, compartido por todos los scrapers del proceso
+_HOST_THROTTLES: Dict[str, HostThrottle] = {}
+_HOST_THROTTLES_LOCK = threading.Lock()
+
+
+def get_host_throttle(url: str, interval: Tuple[float, float] = (2, 6), max_in_flight: int = 1) -> HostThrottle:
+    """Obtiene (o crea) el throttle del dominio de la URL"""
+    host = urlparse(url).netloc.lower()
+    with _HOST_THROTTLES_LOCK:
+        throttle = _HOST_THROTTLES.get(host)
+        if throttle is None:
+            throttle = HostThrottle(interval=interval, max_in_flight=max_in_flight)
+            _HOST_THROTTLES[host] = throttle
+        return throttle
+
+
 class BaseScraper(ABC):
     """Clase base para todos los scrapers"""
 
-    def __init__(self):
+    # Presupuesto de cortesía por dominio (segundos entre peticiones y peticiones simultáneas)
+    request_interval: Tuple[float, float] = (2, 6)
+    max_in_flight: int = int(os.environ.get('SCRAPER_MAX_IN_FLIGHT', '2'))
+
+    def __init__(self, http_cache: Optional[HttpCache] = None):
         self.session = requests.Session()
-        self.ua = UserAgent() if HAS_FAKE_UA else None
+        self._ua = None
         self.results: List[ProductDeal] = []
+        self.http_cache = http_cache
 
         # User agents de respaldo
         self.backup_agents = [
@@ -109,6 +188,14 @@ class BaseScraper(ABC):
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
         ]
 
+    @property
+    def ua(self):
+        """UserAgent de fake_useragent, creado en la primera petición (None si no está instalado)."""
+        if self._ua is None and HAS_FAKE_UA:
+            from fake_useragent import UserAgent
+            self._ua = UserAgent()
+        return self._ua
+
     def _get_random_ua(self) -> str:
         """Obtiene un User-Agent aleatorio"""
         if self.ua:
@@ -143,6 +230,65 @@ class BaseScraper(ABC):
         delay = random.uniform(min_sec, max_sec)
         time.sleep(delay)
 
+    def _throttle_for(self, url: str) -> HostThrottle:
+        """Throttle del dominio con el presupuesto de este scraper"""
+        return get_host_throttle(url, self.request_interval, self.max_in_flight)
+
+    def _fetch(self, url: str, timeout: int = 20):
+        """
+        GET respetando el presupuesto de cortesía del dominio.
+        Con caché HTTP envía petición condicional y devuelve un CachedPage.
+        """
+        headers = self._get_headers()
+        if self.http_cache:
+            headers.update(self.http_cache.conditional_headers(url))
+            headers.pop('Cache-Control', None)
+
+        with self._throttle_for(url):
+            response = self.session.get(url, headers=headers, timeout=timeout)
+
+        if self.http_cache:
+            return self.http_cache.resolve(url, response)
+        return response
+
+    def _parse_page(self, url: str, response, parse, fallback=None) -> List[ProductDeal]:
+        """
+        Devuelve las ofertas de una página: si la caché indica que el contenido
+        no cambió desde el último ciclo, reutiliza el parseo anterior sin construir el árbol HTML.
+        Si parse falla (HTML malformado para el backend rápido) y hay fallback, se reintenta con él.
+        """
+        if getattr(response, 'unchanged', False) and response.parsed is not None:
+            print(f"    ♻️ Sin cambios desde el último ciclo ({len(response.parsed)} ofertas)")
+            return [ProductDeal(**{**d, 'scraped_at': ''}) for d in response.parsed]
+
+        try:
+            deals = parse(response.content)
+        except Exception as e:
+            if fallback is None:
+                raise
+            print(f"    ⚠️ Error parseando ({e}), reintentando con BeautifulSoup")
+            deals = fallback(response.content)
+        if self.http_cache:
+            self.http_cache.store_parsed(url, [d.to_dict() for d in deals])
+        return deals
+
+    def _fetch_many(self, urls: List[str], timeout: int = 20) -> Iterator[Tuple[str, Any]]:
+        """
+        Descarga varias URLs del mismo dominio en paralelo (acotado por max_in_flight)
+        y las devuelve según terminan, para parsear mientras siguen otras en vuelo.
+        Si una descarga falla se devuelve la excepción en lugar de la respuesta.
+        """
+        if not urls:
+            return
+        with ThreadPoolExecutor(max_workers=max(1, self.max_in_flight)) as pool:
+            futures = {pool.submit(self._fetch, url, timeout): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    yield url, future.result()
+                except requests.RequestException as e:
+                    yield url, e
+
     def _extract_price(self, price_str: str) -> Optional[float]:
         """Extrae precio numérico de string"""
         if not price_str:
@@ -184,11 +330,16 @@ class BaseScraper(ABC):
 class AmazonScraper(BaseScraper):
     """Scraper mejorado para Amazon España"""
 
-    def __init__(self):
-        super().__init__()
+    request_interval = (3, 7)
+
+    def __init__(self, http_cache: Optional[HttpCache] = None, parser_backend: str = None):
+        super().__init__(http_cache)
         self.base_url = 'https://www.amazon.es'
         self.partner_tag = os.environ.get('AMAZON_PARTNER_TAG', 'camperdeals07-21')
 
+        # Backend de parseo: lxml con XPath precompilado si está disponible, si no BeautifulSoup
+        self.parser = get_amazon_parser(parser_backend)
+
         # Categorías de camping expandidas
         self.categories = {
             'tiendas-campana': [
@@ -240,46 +391,47 @@ class AmazonScraper(BaseScraper):
         return f"{self.base_url}/s?k={keyword_encoded}&rh=p_n_pct-off-with-tax%3A30-&page={page}"
 
     def _extract_product(self, element, category: str) -> Optional[ProductDeal]:
-        """Extrae datos de un elemento de producto"""
+        """Extrae datos de un elemento de producto (BeautifulSoup)"""
+        try:
+            fields = SoupAmazonParser.extract_fields(element)
+        except Exception as e:
+            print(f"  ⚠️ Error extrayendo producto: {e}")
+            return None
+        return self._build_deal(fields, category)
+
+    def _build_deal(self, fields: Dict[str, Any], category: str) -> Optional[ProductDeal]:
+        """Convierte los campos crudos de una tarjeta (cualquier backend) en ProductDeal"""
         try:
             # ASIN
-            asin = element.get('data-asin')
+            asin = fields.get('asin')
             if not asin or len(asin) != 10:
                 return None
 
             # Título
-            title_elem = element.find('h2')
-            if not title_elem:
+            title = fields.get('title')
+            if title is None:
                 return None
-            title = title_elem.get_text(strip=True)
 
             # Imagen
-            img_elem = element.find('img', {'class': 's-image'})
-            image_url = img_elem.get('src') if img_elem else ''
+            image_url = fields.get('image_url') or ''
 
             # Precio actual
-            price_whole = element.find('span', {'class': 'a-price-whole'})
-            price_fraction = element.find('span', {'class': 'a-price-fraction'})
-
-            if not price_whole:
+            if fields.get('price_whole') is None:
                 return None
 
-            current_price_str = price_whole.get_text(strip=True)
-            if price_fraction:
-                current_price_str += '.' + price_fraction.get_text(strip=True)
+            current_price_str = fields['price_whole']
+            if fields.get('price_fraction') is not None:
+                current_price_str += '.' + fields['price_fraction']
             current_price = self._extract_price(current_price_str)
 
             if not current_price or current_price <= 0:
                 return None
 
             # Precio original
-            original_elem = element.find('span', {'class': 'a-price', 'data-a-strike': 'true'})
-            if original_elem:
-                offscreen = original_elem.find('span', {'class': 'a-offscreen'})
-                original_price = self._extract_price(offscreen.get_text()) if offscreen else None
+            if fields.get('has_strike'):
+                original_price = self._extract_price(fields['strike_price']) if fields.get('strike_price') is not None else None
             else:
-                list_price = element.find('span', {'class': 'a-text-price'})
-                original_price = self._extract_price(list_price.get_text()) if list_price else None
+                original_price = self._extract_price(fields['list_price']) if fields.get('list_price') is not None else None
 
             if not original_price or original_price <= current_price:
                 return None
@@ -290,29 +442,18 @@ class AmazonScraper(BaseScraper):
 
             # Rating
             rating = None
-            rating_elem = element.find('span', {'class': 'a-icon-alt'})
-            if rating_elem:
-                match = re.search(r'(\d[,.]?\d?)', rating_elem.get_text())
+            if fields.get('rating_text') is not None:
+                match = re.search(r'(\d[,.]?\d?)', fields['rating_text'])
                 if match:
                     rating = float(match.group(1).replace(',', '.'))
 
             # Reviews
             review_count = None
-            reviews_elem = element.find('span', {'class': 'a-size-base', 'dir': 'auto'})
-            if reviews_elem:
-                match = re.search(r'([\d.]+)', reviews_elem.get_text().replace('.', ''))
+            if fields.get('reviews_text') is not None:
+                match = re.search(r'([\d.]+)', fields['reviews_text'].replace('.', ''))
                 if match:
                     review_count = int(match.group(1))
 
-            # Prime
-            is_prime = bool(element.find('i', {'class': 'a-icon-prime'}))
-
-            # Brand
-            brand = None
-            brand_elem = element.find('span', {'class': 'a-size-base-plus'})
-            if brand_elem:
-                brand = brand_elem.get_text(strip=True)
-
             return ProductDeal(
                 source=self.get_source_name(),
                 external_id=asin,
@@ -327,8 +468,8 @@ class AmazonScraper(BaseScraper):
                 category=category,
                 rating=rating,
                 review_count=review_count,
-                is_prime=is_prime,
-                brand=brand,
+                is_prime=bool(fields.get('is_prime')),
+                brand=fields.get('brand'),
             )
 
         except Exception as e:
@@ -343,38 +484,44 @@ class AmazonScraper(BaseScraper):
 
         print(f"\n📂 [{self.get_source_name().upper()}] Scrapeando: {category}")
 
-        for keyword in keywords:
-            for page in range(1, max_pages + 1):
-                url = self._build_search_url(keyword, page)
-                print(f"  🔍 '{keyword}' (pág {page})")
+        urls = [
+            self._build_search_url(keyword, page)
+            for keyword in keywords
+            for page in range(1, max_pages + 1)
+        ]
 
-                self._random_delay(3, 7)
+        # Las descargas respetan el throttle de amazon.es; el parseo se hace aquí
+        # mientras las siguientes páginas siguen en vuelo
+        for url, response in self._fetch_many(urls, timeout=20):
+            print(f"  🔍 {url}")
 
-                try:
-                    response = self.session.get(
-                        url,
-                        headers=self._get_headers(),
-                        timeout=20
-                    )
-
-                    if response.status_code != 200:
-                        print(f"    ⚠️ HTTP {response.status_code}")
-                        continue
-
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    products = soup.find_all('div', {'data-component-type': 's-search-result'})
-
-                    for product in products:
-                        deal = self._extract_product(product, category)
-                        if deal and deal.external_id not in seen_asins:
-                            seen_asins.add(deal.external_id)
-                            deals.append(deal)
-                            print(f"    ✅ {deal.title[:45]}... (-{deal.discount}%)")
+            if isinstance(response, Exception):
+                print(f"    ❌ Error: {response}")
+                continue
 
-                except requests.RequestException as e:
-                    print(f"    ❌ Error: {e}")
-                    continue
+            if response.status_code != 200:
+                print(f"    ⚠️ HTTP {response.status_code}")
+                continue
+
+            fallback = None
+            if self.parser.name != SoupAmazonParser.name:
+                fallback = lambda content: self._parse_results(content, category, SoupAmazonParser())
+            for deal in self._parse_page(url, response, lambda content: self._parse_results(content, category),
+                                         fallback):
+                if deal.external_id not in seen_asins:
+                    seen_asins.add(deal.external_id)
+                    deals.append(deal)
+                    print(f"    ✅ {deal.title[:45]}... (-{deal.discount}%)")
+
+        return deals
 
+    def _parse_results(self, content: bytes, category: str, parser: AmazonCardParser = None) -> List[ProductDeal]:
+        """Parsea una página de resultados de búsqueda con el backend configurado (o el indicado)"""
+        deals = []
+        for fields in (parser or self.parser).parse_cards(content):
+            deal = self._build_deal(fields, category)
+            if deal:
+                deals.append(deal)
         return deals
 
     def scrape_all(self, max_pages: int = 2) -> List[ProductDeal]:
@@ -396,8 +543,10 @@ class AmazonScraper(BaseScraper):
 class DecathlonScraper(BaseScraper):
     """Scraper para Decathlon España - Tienda de deportes y camping"""
 
-    def __init__(self):
-        super().__init__()
+    request_interval = (2, 5)
+
+    def __init__(self, http_cache: Optional[HttpCache] = None):
+        super().__init__(http_cache)
         self.base_url = 'https://www.decathlon.es'
         self.affiliate_id = os.environ.get('DECATHLON_AFFILIATE_ID', '')
 
@@ -500,46 +649,59 @@ class DecathlonScraper(BaseScraper):
 
         print(f"\n📂 [{self.get_source_name().upper()}] Scrapeando: {category}")
 
-        for page in range(1, max_pages + 1):
-            url = f"{self.base_url}{path}?page={page}"
-            print(f"  🔍 Página {page}")
+        urls = [f"{self.base_url}{path}?page={page}" for page in range(1, max_pages + 1)]
 
-            self._random_delay(2, 5)
+        for url, response in self._fetch_many(urls, timeout=15):
+            print(f"  🔍 {url}")
 
-            try:
-                response = self.session.get(url, headers=self._get_headers(), timeout=15)
-
-                if response.status_code != 200:
-                    print(f"    ⚠️ HTTP {response.status_code}")
-                    continue
+            if isinstance(response, Exception):
+                print(f"    ❌ Error: {response}")
+                continue
 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                products = soup.find_all('div', {'class': 'product-card'}) or soup.find_all('article')
+            if response.status_code != 200:
+                print(f"    ⚠️ HTTP {response.status_code}")
+                continue
 
-                for product in products[:20]:
-                    deal = self._extract_product(product, category)
-                    if deal:
-                        deals.append(deal)
-                        print(f"    ✅ {deal.title[:45]}... (-{deal.discount}%)")
+            for deal in self._parse_page(url, response, lambda content: self._parse_results(content, category)):
+                deals.append(deal)
+                print(f"    ✅ {deal.title[:45]}... (-{deal.discount}%)")
 
-            except requests.RequestException as e:
-                print(f"    ❌ Error: {e}")
-                continue
+        return deals
 
+    def _parse_results(self, content: bytes, category: str) -> List[ProductDeal]:
+        """Parsea una página de listado de Decathlon"""
+        soup = BeautifulSoup(content, 'html.parser')
+        products = soup.find_all('div', {'class': 'product-card'}) or soup.find_all('article')
+        deals = []
+        for product in products[:20]:
+            deal = self._extract_product(product, category)
+            if deal:
+                deals.append(deal)
         return deals
 
 
 class MultiSourceScraper:
     """Orquestador que combina múltiples fuentes de scraping"""
 
-    def __init__(self, sources: List[str] = None):
+    def __init__(self, sources: List[str] = None, use_cache: bool = None):
         """
         Args:
             sources: Lista de fuentes a usar ['amazon', 'decathlon']
                     Si es None, usa todas las disponibles
+            use_cache: Usar la caché HTTP en disco (data/http_cache.sqlite3).
+                    Si es None, se activa salvo que HTTP_CACHE_DISABLED=true
         """
         self.scrapers: Dict[str, BaseScraper] = {}
 
+        if use_cache is None:
+            use_cache = os.environ.get('HTTP_CACHE_DISABLED', 'false').lower() != 'true'
+        self.http_cache = None
+        if use_cache:
+            try:
+                self.http_cache = HttpCache()
+            except Exception as e:
+                print(f"⚠️ Caché HTTP no disponible: {e}")
+
         available = {
             'amazon': AmazonScraper,
             'decathlon': DecathlonScraper,
@@ -550,11 +712,33 @@ class MultiSourceScraper:
 
         for source in sources:
             if source in available:
-                self.scrapers[source] = available[source]()
+                self.scrapers[source] = available[source](http_cache=self.http_cache)
                 print(f"✅ Scraper {source} inicializado")
 
-    def scrape_all(self, categories: List[str] = None, max_pages: int = 2) -> List[ProductDeal]:
-        """Scrapea todas las fuentes y categorías"""
+    def _scrape_source(self, scraper: BaseScraper, categories: Optional[List[str]], max_pages: int) -> List[ProductDeal]:
+        """Scrapea todas las categorías pedidas de una sola fuente"""
+        if categories:
+            deals = []
+            for cat in categories:
+                deals.extend(scraper.scrape_category(cat, max_pages))
+            return deals
+
+        if hasattr(scraper, 'scrape_all'):
+            return scraper.scrape_all(max_pages)
+
+        deals = []
+        for cat in scraper.categories.keys():
+            deals.extend(scraper.scrape_category(cat, max_pages))
+        return deals
+
+    def scrape_all(self, categories: List[str] = None, max_pages: int = 2, parallel: bool = True) -> List[ProductDeal]:
+        """
+        Scrapea todas las fuentes y categorías.
+
+        Con parallel=True cada fuente corre en su propio hilo; la cortesía se
+        mantiene por dominio (HostThrottle), así que el tiempo total se acerca
+        al de la fuente más lenta en lugar de a la suma de todas.
+        """
         all_deals = []
 
         print("\n" + "=" * 60)
@@ -563,26 +747,28 @@ class MultiSourceScraper:
         print(f"📡 Fuentes: {', '.join(self.scrapers.keys())}")
         print("=" * 60)
 
-        for name, scraper in self.scrapers.items():
-            try:
-                if categories:
-                    for cat in categories:
-                        deals = scraper.scrape_category(cat, max_pages)
+        if parallel and len(self.scrapers) > 1:
+            with ThreadPoolExecutor(max_workers=len(self.scrapers)) as pool:
+                futures = {
+                    pool.submit(self._scrape_source, scraper, categories, max_pages): name
+                    for name, scraper in self.scrapers.items()
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        deals = future.result()
                         all_deals.extend(deals)
-                else:
-                    if hasattr(scraper, 'scrape_all'):
-                        deals = scraper.scrape_all(max_pages)
-                    else:
-                        deals = []
-                        for cat in scraper.categories.keys():
-                            cat_deals = scraper.scrape_category(cat, max_pages)
-                            deals.extend(cat_deals)
+                        print(f"\n📊 [{name}] Total: {len(deals)} ofertas")
+                    except Exception as e:
+                        print(f"❌ Error en {name}: {e}")
+        else:
+            for name, scraper in self.scrapers.items():
+                try:
+                    deals = self._scrape_source(scraper, categories, max_pages)
                     all_deals.extend(deals)
-
-                print(f"\n📊 [{name}] Total: {len([d for d in all_deals if d.source == name])} ofertas")
-
-            except Exception as e:
-                print(f"❌ Error en {name}: {e}")
+                    print(f"\n📊 [{name}] Total: {len(deals)} ofertas")
+                except Exception as e:
+                    print(f"❌ Error en {name}: {e}")
 
         # Ordenar por descuento
         all_deals.sort(key=lambda x: x.discount, reverse=True)
@@ -624,7 +810,9 @@ class MultiSourceScraper:
 # SCRAPY SPIDER (Opcional - para scraping a gran escala)
 # =============================================================================
 
-if HAS_SCRAPY:
+def _build_amazon_spider():
+    import scrapy
+
     class AmazonSpider(scrapy.Spider):
         """Spider de Scrapy para Amazon - Más eficiente para grandes volúmenes"""
         name = 'amazon_camping'
@@ -664,6 +852,17 @@ if HAS_SCRAPY:
                     'keyword': response.meta['keyword'],
                 }
 
+    return AmazonSpider
+
+
+def __getattr__(name):
+    # AmazonSpider hereda de scrapy.Spider: se define (e importa scrapy) al pedirlo
+    if name == 'AmazonSpider' and HAS_SCRAPY:
+        spider = _build_amazon_spider()
+        globals()['AmazonSpider'] = spider
+        return spider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # =============================================================================
 # CLI
@@ -713,6 +912,16 @@ Ejemplos:
         action='store_true',
         help='Modo test (1 página, menos categorías)'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='No usar la caché HTTP en disco'
+    )
+    parser.add_argument(
+        '--sequential',
+        action='store_true',
+        help='Scrapear las fuentes una tras otra (sin concurrencia entre tiendas)'
+    )
 
     args = parser.parse_args()
 
@@ -720,13 +929,13 @@ Ejemplos:
     max_pages = 1 if args.test else args.pages
 
     # Crear scraper multi-fuente
-    scraper = MultiSourceScraper(sources=args.sources)
+    scraper = MultiSourceScraper(sources=args.sources, use_cache=False if args.no_cache else None)
 
     # Ejecutar
     if args.category:
-        deals = scraper.scrape_all(categories=[args.category], max_pages=max_pages)
+        deals = scraper.scrape_all(categories=[args.category], max_pages=max_pages, parallel=not args.sequential)
     else:
-        deals = scraper.scrape_all(max_pages=max_pages)
+        deals = scraper.scrape_all(max_pages=max_pages, parallel=not args.sequential)
 
     # Guardar
     if deals:
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Camping Deals - Caché HTTP en disco para páginas de búsqueda
+Guarda ETag/Last-Modified y el cuerpo comprimido por URL normalizada,
+permite peticiones condicionales y evita re-parsear páginas sin cambios.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, List, Optional, Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+def normalize_url(url: str) -> str:
+    """Normaliza una URL para usarla como clave (esquema/host en minúsculas, query ordenada, sin fragmento)"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    path = parts.path or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+class CachedPage:
+    """Resultado de una descarga pasada por la caché"""
+
+    def __init__(self, url: str, status_code: int, content: bytes = b'',
+                 unchanged: bool = False, parsed: Optional[List[Dict]] = None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.unchanged = unchanged    # mismo hash que la última vez (304 o cuerpo idéntico)
+        self.parsed = parsed          # resultado parseado guardado la última vez, si lo hay
+
+
+class HttpCache:
+    """
+    Caché HTTP en SQLite con expiración por TTL y desalojo LRU por tamaño.
+
+    Cada entrada guarda validadores (ETag/Last-Modified), el cuerpo comprimido
+    con zlib, su hash y opcionalmente el resultado ya parseado de la página.
+    """
+
+    def __init__(self, path: str = None, ttl_hours: float = None, max_mb: float = None):
+        self.path = path or os.environ.get('HTTP_CACHE_PATH', 'data/http_cache.sqlite3')
+        self.ttl_seconds = float(ttl_hours if ttl_hours is not None else os.environ.get('HTTP_CACHE_TTL_HOURS', '48')) * 3600
+        self.max_bytes = int(float(max_mb if max_mb is not None else os.environ.get('HTTP_CACHE_MAX_MB', '50')) * 1024 * 1024)
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                parsed TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache(accessed_at)")
+        self._conn.commit()
+        self.purge_expired()
+
+    def _row(self, key: str) -> Optional[tuple]:
+        return self._conn.execute(
+            "SELECT etag, last_modified, content_hash, body, parsed, fetched_at FROM http_cache WHERE key = ?",
+            (key,)
+        ).fetchone()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Cabeceras If-None-Match / If-Modified-Since para la URL, si hay entrada vigente"""
+        key = normalize_url(url)
+        with self._lock:
+            row = self._row(key)
+        if not row or time.time() - row[5] > self.ttl_seconds:
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def resolve(self, url: str, response: Any) -> CachedPage:
+        """
+        Combina la respuesta HTTP con la caché:
+        - 304: devuelve el cuerpo guardado marcado como sin cambios
+        - 200: guarda el cuerpo; si su hash coincide con el anterior, conserva el parseo previo
+        - otros: se devuelven tal cual sin tocar la caché
+        """
+        key = normalize_url(url)
+        now = time.time()
+
+        with self._lock:
+            row = self._row(key)
+
+            if response.status_code == 304 and row:
+                self._conn.execute("UPDATE http_cache SET accessed_at = ?, fetched_at = ? WHERE key = ?", (now, now, key))
+                self._conn.commit()
+                parsed = json.loads(row[4]) if row[4] else None
+                return CachedPage(url, 200, zlib.decompress(row[3]), unchanged=True, parsed=parsed)
+
+            if response.status_code != 200:
+                return CachedPage(url, response.status_code, response.content)
+
+            content = response.content
+            content_hash = hashlib.sha256(content).hexdigest()
+            unchanged = bool(row) and row[2] == content_hash
+            parsed_json = row[4] if unchanged else None
+            body = zlib.compress(content, 6)
+
+            self._conn.execute(
+                """INSERT OR REPLACE INTO http_cache
+                   (key, etag, last_modified, content_hash, body, size, parsed, fetched_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (key, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                 content_hash, body, len(body), parsed_json, now, now)
+            )
+            self._conn.commit()
+
+        self._evict_to_size()
+        parsed = json.loads(parsed_json) if parsed_json else None
+        return CachedPage(url, 200, content, unchanged=unchanged, parsed=parsed)
+
+    def store_parsed(self, url: str, parsed: List[Dict]):
+        """Guarda el resultado parseado de la página para reutilizarlo si no cambia"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET parsed = ? WHERE key = ?",
+                (json.dumps(parsed, ensure_ascii=False), normalize_url(url))
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Elimina entradas más antiguas que el TTL"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM http_cache WHERE fetched_at < ?", (cutoff,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def _evict_to_size(self):
+        """Desaloja las entradas menos usadas hasta quedar bajo max_bytes"""
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for key, size in self._conn.execute(
+                "SELECT key, size FROM http_cache ORDER BY accessed_at ASC"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM http_cache WHERE key = ?", (key,))
+                total -= size
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache"
+            ).fetchone()
+        return {'entries': count, 'bytes': size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,16 @@
+"""
+Comprobación de dependencias opcionales sin importarlas.
+
+scrapy, playwright, fake_useragent o gspread tardan en importarse y la mayoría de
+ejecuciones no los usa: al cargar el módulo solo se mira si están instalados y el
+import real se hace en el primer uso.
+"""
+import importlib.util
+
+
+def module_available(name: str) -> bool:
+    """¿Está instalado el paquete? Sin importarlo (solo busca el spec)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
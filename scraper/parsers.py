@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Camping Deals - Backends de parseo para resultados de búsqueda de Amazon
+BeautifulSoup (siempre disponible) y lxml con selectores XPath precompilados (fast path)
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional, Any
+
+from bs4 import BeautifulSoup
+
+# Opcional: lxml para el fast path (XPath compilado en C)
+try:
+    from lxml import etree, html as lxml_html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+# Campos crudos que devuelve cualquier backend por cada tarjeta de resultado.
+# La conversión a ProductDeal (precios, descuento, filtros) es común a todos.
+CARD_FIELDS = (
+    'asin', 'title', 'image_url',
+    'price_whole', 'price_fraction',
+    'has_strike', 'strike_price', 'list_price',
+    'rating_text', 'reviews_text', 'is_prime', 'brand',
+)
+
+
+class AmazonCardParser(ABC):
+    """Interfaz común: HTML de una página de búsqueda -> lista de dicts con CARD_FIELDS"""
+
+    name = 'base'
+
+    @abstractmethod
+    def parse_cards(self, content: bytes) -> List[Dict[str, Any]]:
+        """Extrae los campos crudos de cada tarjeta de resultado"""
+        pass
+
+
+class SoupAmazonParser(AmazonCardParser):
+    """Backend BeautifulSoup (html.parser) - lento pero sin dependencias nativas"""
+
+    name = 'bs4'
+
+    def parse_cards(self, content: bytes) -> List[Dict[str, Any]]:
+        soup = BeautifulSoup(content, 'html.parser')
+        products = soup.find_all('div', {'data-component-type': 's-search-result'})
+        return [self.extract_fields(product) for product in products]
+
+    @staticmethod
+    def extract_fields(element) -> Dict[str, Any]:
+        """Extrae los campos crudos de una tarjeta (elemento de BeautifulSoup)"""
+        title_elem = element.find('h2')
+        img_elem = element.find('img', {'class': 's-image'})
+        price_whole = element.find('span', {'class': 'a-price-whole'})
+        price_fraction = element.find('span', {'class': 'a-price-fraction'})
+
+        strike_elem = element.find('span', {'class': 'a-price', 'data-a-strike': 'true'})
+        strike_price = None
+        list_price = None
+        if strike_elem:
+            offscreen = strike_elem.find('span', {'class': 'a-offscreen'})
+            strike_price = offscreen.get_text() if offscreen else None
+        else:
+            list_elem = element.find('span', {'class': 'a-text-price'})
+            list_price = list_elem.get_text() if list_elem else None
+
+        rating_elem = element.find('span', {'class': 'a-icon-alt'})
+        reviews_elem = element.find('span', {'class': 'a-size-base', 'dir': 'auto'})
+        brand_elem = element.find('span', {'class': 'a-size-base-plus'})
+
+        return {
+            'asin': element.get('data-asin'),
+            'title': title_elem.get_text(strip=True) if title_elem else None,
+            'image_url': img_elem.get('src') if img_elem else None,
+            'price_whole': price_whole.get_text(strip=True) if price_whole else None,
+            'price_fraction': price_fraction.get_text(strip=True) if price_fraction else None,
+            'has_strike': strike_elem is not None,
+            'strike_price': strike_price,
+            'list_price': list_price,
+            'rating_text': rating_elem.get_text() if rating_elem else None,
+            'reviews_text': reviews_elem.get_text() if reviews_elem else None,
+            'is_prime': bool(element.find('i', {'class': 'a-icon-prime'})),
+            'brand': brand_elem.get_text(strip=True) if brand_elem else None,
+        }
+
+
+def _has_class(cls: str) -> str:
+    """Predicado XPath equivalente a find(..., {'class': cls}) de BeautifulSoup"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+class LxmlAmazonParser(AmazonCardParser):
+    """
+    Backend lxml: todos los selectores se compilan una vez por instancia
+    y se evalúan en C sobre cada tarjeta.
+    """
+
+    name = 'lxml'
+
+    def __init__(self):
+        if not HAS_LXML:
+            raise ImportError("lxml no instalado")
+
+        xp = etree.XPath
+        self._cards = xp('//div[@data-component-type="s-search-result"]')
+        self._title = xp('(.//h2)[1]')
+        self._image = xp(f'(.//img[{_has_class("s-image")}])[1]/@src')
+        self._price_whole = xp(f'(.//span[{_has_class("a-price-whole")}])[1]')
+        self._price_fraction = xp(f'(.//span[{_has_class("a-price-fraction")}])[1]')
+        self._strike = xp(f'(.//span[{_has_class("a-price")} and @data-a-strike="true"])[1]')
+        self._offscreen = xp(f'(.//span[{_has_class("a-offscreen")}])[1]')
+        self._list_price = xp(f'(.//span[{_has_class("a-text-price")}])[1]')
+        self._rating = xp(f'(.//span[{_has_class("a-icon-alt")}])[1]')
+        self._reviews = xp(f'(.//span[{_has_class("a-size-base")} and @dir="auto"])[1]')
+        self._prime = xp(f'boolean(.//i[{_has_class("a-icon-prime")}])')
+        self._brand = xp(f'(.//span[{_has_class("a-size-base-plus")}])[1]')
+
+    @staticmethod
+    def _text(nodes, strip: bool = False) -> Optional[str]:
+        """Texto del primer nodo; strip=True imita get_text(strip=True)"""
+        if not nodes:
+            return None
+        if strip:
+            return ''.join(part.strip() for part in nodes[0].itertext())
+        return ''.join(nodes[0].itertext())
+
+    def parse_cards(self, content: bytes) -> List[Dict[str, Any]]:
+        if not content:
+            return []
+        root = lxml_html.fromstring(content)
+        text = self._text
+        cards = []
+
+        for card in self._cards(root):
+            strike = self._strike(card)
+            if strike:
+                strike_price = text(self._offscreen(strike[0]))
+                list_price = None
+            else:
+                strike_price = None
+                list_price = text(self._list_price(card))
+
+            image = self._image(card)
+            cards.append({
+                'asin': card.get('data-asin'),
+                'title': text(self._title(card), strip=True),
+                'image_url': str(image[0]) if image else None,
+                'price_whole': text(self._price_whole(card), strip=True),
+                'price_fraction': text(self._price_fraction(card), strip=True),
+                'has_strike': bool(strike),
+                'strike_price': strike_price,
+                'list_price': list_price,
+                'rating_text': text(self._rating(card)),
+                'reviews_text': text(self._reviews(card)),
+                'is_prime': bool(self._prime(card)),
+                'brand': text(self._brand(card), strip=True),
+            })
+
+        return cards
+
+
+PARSER_BACKENDS = {
+    'bs4': SoupAmazonParser,
+    'lxml': LxmlAmazonParser,
+}
+
+
+def get_amazon_parser(backend: str = None) -> AmazonCardParser:
+    """
+    Devuelve el backend pedido ('bs4', 'lxml' o 'auto').
+    'auto' (por defecto, o SCRAPER_PARSER) usa lxml si está instalado y si no BeautifulSoup.
+    """
+    backend = (backend or os.environ.get('SCRAPER_PARSER', 'auto')).lower()
+    if backend == 'auto':
+        backend = 'lxml' if HAS_LXML else 'bs4'
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Backend de parseo desconocido: {backend}")
+    return PARSER_BACKENDS[backend]()